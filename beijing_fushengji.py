@@ -8,6 +8,7 @@ This is a remake of the classic Chinese game where players try to make money
 by trading goods in Beijing over a 40-day period.
 """
 
+import argparse
 import random
 import os
 import sys
@@ -25,35 +26,58 @@ from game.hospital import Hospital
 from game.house_agency import HouseAgency
 from game.internet_cafe import InternetCafe
 from game.post_office import PostOffice
-from game.high_scores import HighScores
-from game.logger import GameLogger
+from game.high_scores import HighScores, open_high_scores
+from game.logger import GameLogger, LogRotation
+from game.engine import GameEngine
 
-def main():
-    """Main game function that initializes and runs the game."""
-    ui = UI()
+def main(ui: Optional[UI] = None, seed: Optional[int] = None, log_format: str = "text",
+         log_max_files: int = 0, scores_file: str = "scores.json", checkpoint_file: Optional[str] = None):
+    """
+    Main game function that initializes and runs the game.
+    
+    Args:
+        ui: UI object to play with (defaults to the interactive UI)
+        seed: Seed of the game (random if not given)
+        log_format: Format of the game log file, "text", "jsonl" or "binary"
+        log_max_files: Number of finished game logs to keep in logs/ (0: no limit)
+        scores_file: High score file, an SQLite database if it ends with .db
+        checkpoint_file: File the game is saved to after each day and on quitting,
+            and resumed from if it exists (optional)
+    """
+    ui = ui or UI()
     ui.show_welcome()
     
-    # Show story if player wants
-    if ui.ask_yes_no("查看游戏背景故事?"):
-        ui.show_story()
+    # Resume a saved game if the player wants
+    engine = None
+    if checkpoint_file and os.path.exists(checkpoint_file) and ui.ask_yes_no("发现存档，继续上次的游戏?"):
+        engine = GameEngine.load(checkpoint_file, checkpoint_file=checkpoint_file)
+        player_name = engine.player.name
+    else:
+        # Show story if player wants
+        if ui.ask_yes_no("查看游戏背景故事?"):
+            ui.show_story()
+        
+        # Get player name
+        player_name = ui.get_input("请输入你的名字: ", default="小浮生")
     
-    # Get player name
-    player_name = ui.get_input("请输入你的名字: ", default="小浮生")
+    # Initialize logger
+    logger = GameLogger(player_name, log_format=log_format, rotation=LogRotation(max_files=log_max_files))
     
     # Initialize game components
-    player = Player(name=player_name)
-    goods_manager = GoodsManager()
-    location_manager = LocationManager()
-    event_manager = EventManager()
-    bank = Bank()
-    hospital = Hospital()
-    house_agency = HouseAgency()
-    internet_cafe = InternetCafe()
+    if engine is None:
+        engine = GameEngine(player_name, logger=logger, seed=seed, checkpoint_file=checkpoint_file)
+    else:
+        engine.logger = logger
+    player = engine.player
+    goods_manager = engine.goods_manager
+    location_manager = engine.location_manager
+    bank = engine.bank
+    hospital = engine.hospital
+    house_agency = engine.house_agency
+    internet_cafe = engine.internet_cafe
     post_office = PostOffice()
-    high_scores = HighScores()
+    high_scores = open_high_scores(scores_file)
     
-    # Initialize logger
-    logger = GameLogger(player_name)
     logger.log_player_status(player)
     
     # Show available goods in the initial city
@@ -74,35 +98,12 @@ def main():
         if choice == "travel":
             location = ui.show_location_menu(location_manager, player.city, player.current_location)
             if location is not None and hasattr(location, 'id'):
-                # Get previous location name for logging
-                prev_location = None
-                if player.current_location:
-                    prev_loc = location_manager.get_location(player.current_location, player.city)
-                    prev_location = prev_loc.name if prev_loc else None
-                
-                # Handle travel event
-                player.current_location = location.id
-                player.days_left -= 1
-                
-                # Log travel event
-                logger.log_travel(player, prev_location, location.name)
-                
-                # Update goods prices
-                goods_manager.update_prices()
-                
-                # Handle random events and show news reports
-                news_reports = event_manager.handle_events(player, goods_manager)
+                # Travel, update prices, handle random events and interest
+                news_reports = engine.travel(location.id)
                 if news_reports:
                     ui.clear_screen()
                     ui.show_status(player, goods_manager, location_manager)
                     ui.show_news_reports(news_reports)
-                    
-                    # Log random events
-                    for report in news_reports:
-                        logger.log_random_event("Random Event", report, {})
-                
-                # Update bank interest and debt
-                bank.update_interest(player)
                 
                 # Update game status
                 ui.show_message(f"你来到了{location.name}")
@@ -110,9 +111,6 @@ def main():
                 # Show available goods at this location
                 ui.show_available_goods(goods_manager)
                 
-                # Log player status after travel
-                logger.log_player_status(player)
-                
         elif choice == "buy":
             while True:
                 result = goods_manager.buy_goods(player, ui, logger)
@@ -144,22 +142,30 @@ def main():
             high_scores.show(ui)
             
         elif choice == "switch_city":
-            location_manager.switch_city(player, ui)
+            city = location_manager.choose_city(player, ui)
+            if city is not None:
+                # Move through the engine, which checkpoints the new day
+                engine.switch_city(city)
+                ui.show_message(f"你来到了{'北京' if city == 'BEIJING' else '上海'}。")
             
         elif choice == "help":
             ui.show_help()
             
         elif choice == "quit":
             if ui.ask_yes_no("确定要退出游戏吗?"):
+                if checkpoint_file:
+                    engine.save()
+                    ui.show_message("游戏已存档，下次可以继续。")
                 game_running = False
         
         # Check if game should end
-        if player.days_left <= 0:
+        end_reason = engine.get_end_reason()
+        if end_reason == "DAYS_OVER":
             ui.show_message("你在北京已经待了40天，该回家了。")
             # Sell all remaining goods
             goods_manager.sell_all_goods(player, ui, logger)
             # Calculate final score
-            final_score = player.cash + player.bank_savings - player.debt
+            final_score = engine.get_score()
             ui.show_message(f"你的最终得分是: {final_score}")
             # Check if it's a high score
             high_scores.add_score(player.name, final_score, player.health, player.fame)
@@ -169,15 +175,200 @@ def main():
             game_running = False
         
         # Check if player is dead
-        if player.health <= 0:
+        elif end_reason == "HEALTH_ZERO":
             ui.show_message("你的健康值降到了0，游戏结束!")
             # Calculate final score
-            final_score = player.cash + player.bank_savings - player.debt
+            final_score = engine.get_score()
             # Log game end
             logger.log_game_end(player, "HEALTH_ZERO", final_score)
             game_running = False
+        
+        # A finished game can't be resumed
+        if end_reason and checkpoint_file and os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
     
     ui.show_message("谢谢游玩北京浮生记!")
+    logger.close()
+
+def simulate(args) -> None:
+    """
+    Run many complete games with a bot and stream one record per game to stdout.
+    
+    Args:
+        args: Parsed command line arguments of the simulate subcommand
+    """
+    from game.simulation import run_tournament
+    
+    start_time = time.time()
+    games = 0
+    total_score = 0
+    
+    print("seed\tscore\treason\tdays_played\thealth\tfame")
+    for record in run_tournament(range(args.seed_start, args.seed_end), strategy=args.strategy,
+                                 workers=args.workers, chunk_size=args.chunk_size):
+        print(record.to_line())
+        games += 1
+        total_score += record.score
+    
+    elapsed = time.time() - start_time
+    if games:
+        print(f"{games} games in {elapsed:.2f}s ({games / elapsed:.0f} games/s), "
+              f"average score {total_score / games:.0f}", file=sys.stderr)
+
+def solve(args) -> None:
+    """
+    Search for the best score of each seed and compare it with a bot.
+    
+    Args:
+        args: Parsed command line arguments of the solve subcommand
+    """
+    from game.simulation import play_game
+    from game.solver import Solver
+    
+    solver = Solver(beam_width=args.beam_width, time_budget=args.time_budget)
+    
+    print("seed\tbest_score\tbot_score\tgap\tnodes\ttimed_out")
+    for seed in range(args.seed_start, args.seed_end):
+        result = solver.solve(seed)
+        bot_score = play_game(seed, args.strategy).score
+        print(f"{seed}\t{result.score}\t{bot_score}\t{result.score - bot_score}\t{result.nodes}\t{result.timed_out}")
+
+def stats(args) -> None:
+    """
+    Aggregate the game logs of a directory and print a report.
+    
+    Args:
+        args: Parsed command line arguments of the stats subcommand
+    """
+    from game.stats import analyze_logs, find_logs
+    
+    start_time = time.time()
+    log_stats = analyze_logs(find_logs(args.log_dir), workers=args.workers, chunk_size=args.chunk_size)
+    for line in log_stats.report(top_events=args.top_events):
+        print(line)
+    
+    elapsed = time.time() - start_time
+    print(f"{log_stats.files} log files in {elapsed:.2f}s", file=sys.stderr)
+    if log_stats.skipped:
+        print(f"{log_stats.skipped} corrupt log files skipped", file=sys.stderr)
+
+def serve(args) -> None:
+    """
+    Host games for many players over TCP, one game per connection.
+    
+    Args:
+        args: Parsed command line arguments of the serve subcommand
+    """
+    import asyncio
+    from game.server import GameServer
+    
+    server = GameServer(high_scores=open_high_scores(args.scores_file), idle_timeout=args.idle_timeout or None,
+                        max_sessions=args.max_sessions, shared_market=args.shared_market,
+                        market_tick=args.market_tick)
+    print(f"Serving on {args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+        
+    Returns:
+        Parsed arguments
+    """
+    from game.logformat import LOG_FORMATS
+    from game.strategies import STRATEGIES
+    
+    parser = argparse.ArgumentParser(description="北京浮生记 (Beijing Life Story)")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    play_parser = subparsers.add_parser("play", help="play the game (default)")
+    play_parser.add_argument("--script", default=None,
+                             help="answer prompts from a script file, one answer per line")
+    play_parser.add_argument("--seed", type=int, default=None,
+                             help="game seed (default: random)")
+    play_parser.add_argument("--log-format", choices=sorted(LOG_FORMATS), default="text",
+                             help="format of the game log file")
+    play_parser.add_argument("--log-max-files", type=int, default=0,
+                             help="number of finished game logs kept in logs/, oldest deleted first (default: no limit)")
+    play_parser.add_argument("--scores-file", default="scores.json",
+                             help="high score file, kept in SQLite if it ends with .db (default: scores.json)")
+    play_parser.add_argument("--checkpoint", default=None,
+                             help="save the game to this file after each day and on quitting, and resume from it")
+    
+    simulate_parser = subparsers.add_parser("simulate", help="run many games with a bot")
+    simulate_parser.add_argument("--workers", type=int, default=None,
+                                 help="number of worker processes (default: number of CPUs)")
+    simulate_parser.add_argument("--chunk-size", type=int, default=200,
+                                 help="number of games sent to a worker at a time")
+    simulate_parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy",
+                                 help="bot strategy")
+    simulate_parser.add_argument("--seed-start", type=int, default=0,
+                                 help="first game seed")
+    simulate_parser.add_argument("--seed-end", type=int, default=1000,
+                                 help="last game seed (exclusive)")
+    
+    solve_parser = subparsers.add_parser("solve", help="search for the best score of game seeds")
+    solve_parser.add_argument("--beam-width", type=int, default=64,
+                              help="number of game states kept per day")
+    solve_parser.add_argument("--time-budget", type=float, default=5.0,
+                              help="seconds allowed per seed")
+    solve_parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy",
+                              help="bot strategy to compare with")
+    solve_parser.add_argument("--seed-start", type=int, default=0,
+                              help="first game seed")
+    solve_parser.add_argument("--seed-end", type=int, default=1,
+                              help="last game seed (exclusive)")
+    
+    stats_parser = subparsers.add_parser("stats", help="aggregate statistics over game logs")
+    stats_parser.add_argument("--log-dir", default="logs",
+                              help="directory of the game logs")
+    stats_parser.add_argument("--workers", type=int, default=None,
+                              help="number of worker processes (default: number of CPUs)")
+    stats_parser.add_argument("--chunk-size", type=int, default=64,
+                              help="number of log files sent to a worker at a time")
+    stats_parser.add_argument("--top-events", type=int, default=20,
+                              help="number of most frequent random events listed")
+    
+    serve_parser = subparsers.add_parser("serve", help="host games over TCP, one game per connection")
+    serve_parser.add_argument("--host", default="127.0.0.1",
+                              help="address to listen on")
+    serve_parser.add_argument("--port", type=int, default=8023,
+                              help="port to listen on")
+    serve_parser.add_argument("--idle-timeout", type=float, default=600,
+                              help="seconds a player may take to answer before being disconnected (0: no limit)")
+    serve_parser.add_argument("--max-sessions", type=int, default=1000,
+                              help="maximum number of simultaneous games")
+    serve_parser.add_argument("--shared-market", action="store_true",
+                              help="trade in one market per city shared by all players, where trades move prices")
+    serve_parser.add_argument("--market-tick", type=float, default=0.05,
+                              help="seconds between matches of the shared market orders")
+    serve_parser.add_argument("--scores-file", default="scores.json",
+                              help="high score file, kept in SQLite if it ends with .db (default: scores.json)")
+    
+    parser.set_defaults(script=None, seed=None, log_format="text", log_max_files=0, scores_file="scores.json",
+                        checkpoint=None)
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.command == "simulate":
+        simulate(args)
+    elif args.command == "solve":
+        solve(args)
+    elif args.command == "stats":
+        stats(args)
+    elif args.command == "serve":
+        serve(args)
+    elif args.script:
+        from game.scripted_ui import ScriptedUI
+        main(ScriptedUI.from_file(args.script), seed=args.seed, log_format=args.log_format,
+             log_max_files=args.log_max_files, scores_file=args.scores_file, checkpoint_file=args.checkpoint)
+    else:
+        main(seed=args.seed, log_format=args.log_format, log_max_files=args.log_max_files,
+             scores_file=args.scores_file, checkpoint_file=args.checkpoint)
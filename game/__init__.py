@@ -4,15 +4,27 @@
 Game package for Beijing Life Story game.
 """
 
-# Import all modules to make them available from the game package
-from . import player
-from . import goods
-from . import locations
-from . import events
-from . import ui
-from . import bank
-from . import hospital
-from . import house_agency
-from . import internet_cafe
-from . import post_office
-from . import high_scores
+import importlib
+
+# Modules available from the game package. They are imported on first access,
+# so headless users of the engine never load the interactive UI stack
+__all__ = [
+    "player",
+    "goods",
+    "locations",
+    "events",
+    "ui",
+    "bank",
+    "hospital",
+    "house_agency",
+    "internet_cafe",
+    "post_office",
+    "high_scores"
+]
+
+
+def __getattr__(name):
+    """Import a game module on first access as an attribute of the package."""
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
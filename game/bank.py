@@ -24,11 +24,89 @@ class Bank:
         Args:
             player: Player object
         """
-        # Update bank savings interest
-        player.bank_savings += int(player.bank_savings * self.deposit_interest_rate)
+        self.fast_forward(player, 1)
+    
+    def fast_forward(self, player, days: int) -> None:
+        """
+        Update interest on player's bank savings and debt for several days at once,
+        with exactly the same result as calling update_interest once per day.
+        
+        Interest is truncated to whole yuan every day, so the amounts can't be
+        compounded with a closed formula; the days are applied one by one.
+        Once both interests truncate to 0 (savings under 100, debt under 10)
+        nothing changes any more, so the remaining days are skipped.
+        
+        Args:
+            player: Player object
+            days: Number of days
+        """
+        savings = player.bank_savings
+        debt = player.debt
+        for _ in range(days):
+            savings_interest = int(savings * self.deposit_interest_rate)
+            debt_interest = int(debt * self.debt_interest_rate)
+            if not savings_interest and not debt_interest:
+                break
+            
+            savings += savings_interest
+            debt += debt_interest
+        
+        player.bank_savings = savings
+        player.debt = debt
+    
+    def deposit(self, player, amount: int) -> bool:
+        """
+        Move cash into the player's bank savings.
+        
+        Args:
+            player: Player object
+            amount: Amount to deposit
+            
+        Returns:
+            bool: True if the deposit was made, False otherwise
+        """
+        if amount <= 0 or amount > player.cash:
+            return False
+        
+        player.cash -= amount
+        player.bank_savings += amount
+        return True
+    
+    def withdraw(self, player, amount: int) -> bool:
+        """
+        Move bank savings into the player's cash.
+        
+        Args:
+            player: Player object
+            amount: Amount to withdraw
+            
+        Returns:
+            bool: True if the withdrawal was made, False otherwise
+        """
+        if amount <= 0 or amount > player.bank_savings:
+            return False
+        
+        player.bank_savings -= amount
+        player.cash += amount
+        return True
+    
+    def repay(self, player, amount: int) -> bool:
+        """
+        Repay part of the player's debt with cash.
+        
+        Args:
+            player: Player object
+            amount: Amount to repay
+            
+        Returns:
+            bool: True if the repayment was made, False otherwise
+        """
+        if amount <= 0 or amount > min(player.cash, player.debt):
+            return False
         
-        # Update debt interest
-        player.debt += int(player.debt * self.debt_interest_rate)
+        player.cash -= amount
+        player.debt -= amount
+        return True
     
     def visit(self, player, ui, logger=None) -> None:
         """
@@ -44,14 +122,14 @@ class Bank:
         
         while True:
             ui.clear_screen()
-            print(f"现金: {player.cash}元")
-            print(f"银行存款: {player.bank_savings}元")
-            print(f"债务: {player.debt}元")
-            print("\n银行菜单:")
-            print("  1. 存款")
-            print("  2. 取款")
-            print("  3. 还债")
-            print("  0. 离开")
+            ui.write(f"现金: {player.cash}元")
+            ui.write(f"银行存款: {player.bank_savings}元")
+            ui.write(f"债务: {player.debt}元")
+            ui.write("\n银行菜单:")
+            ui.write("  1. 存款")
+            ui.write("  2. 取款")
+            ui.write("  3. 还债")
+            ui.write("  0. 离开")
             
             choice = ui.get_input("请选择: ", input_type=int, default=0, min_value=0, max_value=3)
             
@@ -80,12 +158,9 @@ class Bank:
         amount = ui.get_input(f"你想存入多少钱? (最多 {player.cash}): ", 
                              input_type=int, default=0, min_value=0, max_value=player.cash)
         
-        if amount <= 0:
+        if not self.deposit(player, amount):
             return
         
-        player.cash -= amount
-        player.bank_savings += amount
-        
         # Log the transaction if logger is provided
         if logger:
             logger.log_bank_transaction(player, "DEPOSIT", amount)
@@ -108,12 +183,9 @@ class Bank:
         amount = ui.get_input(f"你想取出多少钱? (最多 {player.bank_savings}): ", 
                              input_type=int, default=0, min_value=0, max_value=player.bank_savings)
         
-        if amount <= 0:
+        if not self.withdraw(player, amount):
             return
         
-        player.bank_savings -= amount
-        player.cash += amount
-        
         # Log the transaction if logger is provided
         if logger:
             logger.log_bank_transaction(player, "WITHDRAW", amount)
@@ -141,12 +213,9 @@ class Bank:
         amount = ui.get_input(f"你想偿还多少债务? (最多 {max_repay}): ", 
                              input_type=int, default=0, min_value=0, max_value=max_repay)
         
-        if amount <= 0:
+        if not self.repay(player, amount):
             return
         
-        player.cash -= amount
-        player.debt -= amount
-        
         # Log the transaction if logger is provided
         if logger:
             logger.log_bank_transaction(player, "REPAY", amount)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch module for Beijing Life Story game.
+Holds the state of many games at once in NumPy arrays for bulk simulations.
+NumPy is optional for the game and only needed by this module.
+"""
+
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("game.batch needs NumPy, install it with: pip install numpy") from e
+
+from .bank import Bank
+from .goods import Goods, GoodsManager
+
+# City codes used in PlayerBatch.city
+CITY_CODES: Dict[str, int] = {"BEIJING": 0, "SHANGHAI": 1}
+
+class BatchMarket:
+    """
+    BatchMarket class holding the black market of N parallel games.
+    Prices and availability are (N, goods) arrays indexed by goods ID.
+    """
+    
+    def __init__(self, num_games: int, goods_types: Optional[Dict[int, Goods]] = None,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Initialize the markets of all games with every goods available.
+        
+        Args:
+            num_games: Number of parallel games
+            goods_types: Goods catalog by goods ID, defaults to GoodsManager's catalog
+            rng: NumPy random generator (optional)
+        """
+        if goods_types is None:
+            goods_types = GoodsManager().goods_types
+        
+        self.num_games = num_games
+        self.num_goods = len(goods_types)
+        self.names: List[str] = [goods_types[goods_id].name for goods_id in range(self.num_goods)]
+        self.base_prices = np.array([goods_types[goods_id].base_price for goods_id in range(self.num_goods)], dtype=np.int64)
+        self.price_ranges = np.array([goods_types[goods_id].price_range for goods_id in range(self.num_goods)], dtype=np.int64)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
+        self.prices = np.zeros((num_games, self.num_goods), dtype=np.int64)
+        self.available = np.ones((num_games, self.num_goods), dtype=bool)
+        self.update_prices(leave_out=0)
+    
+    def update_prices(self, leave_out: int = 3) -> None:
+        """
+        Update prices of all goods in all games and randomly make some unavailable.
+        Uses the same rule as GoodsManager.update_prices, with a single draw for all games.
+        
+        Args:
+            leave_out: Number of goods types to leave out of each market
+        """
+        # Prices are base_price + randint(0, price_range), then leave_out
+        # goods picks with replacement, all drawn in one call
+        highs = np.concatenate((self.price_ranges + 1, np.full(leave_out, self.num_goods, dtype=np.int64)))
+        draws = self.rng.integers(0, highs, size=(self.num_games, self.num_goods + leave_out))
+        
+        np.add(self.base_prices, draws[:, :self.num_goods], out=self.prices)
+        
+        self.available.fill(True)
+        if leave_out > 0:
+            rows = np.arange(self.num_games)[:, None]
+            self.available[rows, draws[:, self.num_goods:]] = False
+    
+    def multiply_price(self, games: np.ndarray, goods_id: int, factor: int) -> None:
+        """
+        Multiply the price of a goods in some games.
+        Used for events that affect goods prices.
+        
+        Args:
+            games: Boolean mask or indices of the affected games
+            goods_id: ID of the goods
+            factor: Multiplication factor
+        """
+        self.prices[games, goods_id] *= factor
+    
+    def divide_price(self, games: np.ndarray, goods_id: int, factor: int) -> None:
+        """
+        Divide the price of a goods in some games.
+        Used for events that affect goods prices.
+        
+        Args:
+            games: Boolean mask or indices of the affected games
+            goods_id: ID of the goods
+            factor: Division factor
+        """
+        self.prices[games, goods_id] //= factor
+    
+    def get_market_prices(self) -> np.ndarray:
+        """
+        Get the market prices of all games.
+        
+        Returns:
+            (N, goods) array of prices, with -1 where goods are not available
+        """
+        return np.where(self.available, self.prices, -1)
+
+
+class PlayerBatch:
+    """
+    PlayerBatch class holding N players as a struct of arrays.
+    Each stat is one contiguous typed array, and the inventory is a pair of
+    (N, goods) arrays of quantities and average buy prices.
+    """
+    
+    def __init__(self, num_players: int, num_goods: int = 8):
+        """
+        Initialize N players with the same starting stats as Player.
+        
+        Args:
+            num_players: Number of players
+            num_goods: Number of goods types
+        """
+        self.num_players = num_players
+        self.num_goods = num_goods
+        
+        # Player stats
+        self.cash = np.full(num_players, 2000, dtype=np.int64)
+        self.debt = np.full(num_players, 5000, dtype=np.int64)
+        self.bank_savings = np.zeros(num_players, dtype=np.int64)
+        self.health = np.full(num_players, 100, dtype=np.int32)
+        self.fame = np.full(num_players, 100, dtype=np.int32)
+        self.days_left = np.full(num_players, 40, dtype=np.int32)
+        
+        # Location (city codes from CITY_CODES, -1 means not at any location)
+        self.city = np.full(num_players, CITY_CODES["BEIJING"], dtype=np.int8)
+        self.current_location = np.full(num_players, -1, dtype=np.int8)
+        
+        # Inventory
+        self.quantities = np.zeros((num_players, num_goods), dtype=np.int32)
+        self.prices = np.zeros((num_players, num_goods), dtype=np.int64)
+        self.inventory_capacity = np.full(num_players, 100, dtype=np.int32)
+        self.inventory_used = np.zeros(num_players, dtype=np.int32)
+    
+    def get_net_worth(self) -> np.ndarray:
+        """
+        Calculate the net worth of all players.
+        
+        Returns:
+            Array of net worths (cash + bank_savings - debt)
+        """
+        return self.cash + self.bank_savings - self.debt
+    
+    def fast_forward(self, days, bank: Optional[Bank] = None) -> None:
+        """
+        Update interest on the bank savings and debt of all players for several days,
+        with the same daily truncation to whole yuan as Bank.fast_forward.
+        
+        Args:
+            days: Number of days, a scalar or one value per player
+            bank: Bank with the interest rates (defaults to Bank())
+        """
+        bank = bank or Bank()
+        days = np.broadcast_to(np.asarray(days), self.cash.shape)
+        for day in range(int(days.max(initial=0))):
+            # Players still moving forward whose interest doesn't truncate to 0
+            savings_interest = (self.bank_savings * bank.deposit_interest_rate).astype(np.int64)
+            debt_interest = (self.debt * bank.debt_interest_rate).astype(np.int64)
+            active = (days > day) & ((savings_interest != 0) | (debt_interest != 0))
+            if not active.any():
+                break
+            
+            self.bank_savings += np.where(active, savings_interest, 0)
+            self.debt += np.where(active, debt_interest, 0)
+    
+    def has_inventory_space(self, amount) -> np.ndarray:
+        """
+        Check which players have enough inventory space.
+        
+        Args:
+            amount: Amount of space needed, a scalar or one value per player
+            
+        Returns:
+            Boolean array, True where the player has enough space
+        """
+        return self.inventory_used + amount <= self.inventory_capacity
+    
+    def add_to_inventory(self, players: np.ndarray, goods_id, quantity, price) -> np.ndarray:
+        """
+        Add goods to the inventory of some players, with the same average price
+        rule as Player.add_to_inventory. Players without enough space, or with
+        a quantity that isn't positive, are skipped.
+        
+        Args:
+            players: Indices of the players, each at most once
+            goods_id: ID of the goods, a scalar or one value per player
+            quantity: Quantity to add, a scalar or one value per player
+            price: Price per unit, a scalar or one value per player
+            
+        Returns:
+            Boolean array, True where the goods were added
+        """
+        players = np.asarray(players)
+        goods_id, quantity, price = np.broadcast_arrays(goods_id, quantity, price, players)[:3]
+        
+        added = (quantity > 0) & (self.inventory_used[players] + quantity <= self.inventory_capacity[players])
+        players, goods_id, quantity, price = players[added], goods_id[added], quantity[added], price[added]
+        
+        # Weighted average of the old and new buy prices, rounded down
+        old_quantity = self.quantities[players, goods_id].astype(np.int64)
+        total_quantity = old_quantity + quantity
+        self.prices[players, goods_id] = (self.prices[players, goods_id] * old_quantity + price * quantity) // total_quantity
+        self.quantities[players, goods_id] = total_quantity
+        self.inventory_used[players] += quantity.astype(np.int32)
+        return added
+    
+    def remove_from_inventory(self, players: np.ndarray, goods_id, quantity) -> np.ndarray:
+        """
+        Remove goods from the inventory of some players, with the same rules as
+        Player.remove_from_inventory. Players without enough goods are skipped.
+        
+        Args:
+            players: Indices of the players, each at most once
+            goods_id: ID of the goods, a scalar or one value per player
+            quantity: Quantity to remove, a scalar or one value per player
+            
+        Returns:
+            Boolean array, True where the goods were removed
+        """
+        players = np.asarray(players)
+        goods_id, quantity = np.broadcast_arrays(goods_id, quantity, players)[:2]
+        
+        old_quantity = self.quantities[players, goods_id]
+        removed = (old_quantity > 0) & (old_quantity >= quantity)
+        players, goods_id, quantity = players[removed], goods_id[removed], quantity[removed]
+        
+        self.quantities[players, goods_id] -= quantity.astype(np.int32)
+        self.inventory_used[players] -= quantity.astype(np.int32)
+        
+        # Like Player, an emptied slot forgets its buy price
+        emptied = self.quantities[players, goods_id] == 0
+        self.prices[players[emptied], goods_id[emptied]] = 0
+        return removed
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Engine module for Beijing Life Story game.
+Runs the game as pure state transitions, without any user interaction.
+"""
+
+from typing import Dict, List, Optional, Tuple, Any
+
+from .player import Player
+from .goods import GoodsManager
+from .locations import LocationManager
+from .events import EventManager
+from .bank import Bank
+from .hospital import Hospital
+from .house_agency import HouseAgency
+from .internet_cafe import InternetCafe
+from .rng import SeedSequence
+from . import snapshot
+
+
+class ActionError(ValueError):
+    """
+    Raised when a game action is not allowed in the current state.
+    """
+
+
+# Managers with state that changes only on travel, shared by forks until then
+FORK_SHARED = ("goods_manager", "event_manager", "internet_cafe")
+
+class GameEngine:
+    """
+    GameEngine class holding the state of one game.
+    Every action is a plain method call, so games can run without a terminal.
+    """
+    
+    def __init__(self, player_name: str = "小浮生", logger=None, seed: Optional[int] = None,
+                 checkpoint_file: Optional[str] = None):
+        """
+        Initialize a new game.
+        
+        Args:
+            player_name: Name of the player
+            logger: GameLogger object for logging (optional)
+            seed: Seed of the game; games with the same seed and actions play out the same
+            checkpoint_file: File the game is saved to after each day of travel (optional)
+        """
+        self.seed_sequence = SeedSequence(seed)
+        goods_seed, events_seed, cafe_seed = self.seed_sequence.spawn(3)
+        
+        self.goods_manager = GoodsManager(rng=goods_seed.stream())
+        self.player = Player(name=player_name, num_goods=len(self.goods_manager.goods_types))
+        self.location_manager = LocationManager()
+        self.event_manager = EventManager(rng=events_seed.stream())
+        self.bank = Bank()
+        self.hospital = Hospital()
+        self.house_agency = HouseAgency()
+        self.internet_cafe = InternetCafe(rng=cafe_seed.stream())
+        self.logger = logger
+        self.checkpoint_file = checkpoint_file
+        
+        # Managers shared with forks of this game, copied before they change
+        self.shared: Tuple[str, ...] = ()
+    
+    def fork(self) -> "GameEngine":
+        """
+        Copy the game state, so actions on the copy don't affect this game.
+        
+        Only the player is copied right away. Stateless managers are shared,
+        and the goods, events and internet cafe managers (with their random
+        streams, the costly part) are shared copy-on-write: each game copies
+        them when it travels next, so forks that never travel never copy them.
+        Code changing these managers outside of the engine actions must call
+        unshare() first. The copy doesn't log or save checkpoints.
+        
+        Returns:
+            GameEngine: Independent copy of the game
+        """
+        clone = GameEngine.__new__(GameEngine)
+        clone.__dict__.update(self.__dict__)
+        clone.player = self.player.copy()
+        clone.logger = None
+        clone.checkpoint_file = None
+        self.shared = clone.shared = FORK_SHARED
+        return clone
+    
+    def unshare(self, names: Tuple[str, ...] = FORK_SHARED) -> None:
+        """
+        Copy the managers this game still shares with its forks, so they can change.
+        
+        Args:
+            names: Attribute names of the managers to copy
+        """
+        for name in names:
+            if name in self.shared:
+                setattr(self, name, getattr(self, name).copy())
+        self.shared = tuple(name for name in self.shared if name not in names)
+    
+    def save(self, snapshot_file: Optional[str] = None) -> None:
+        """
+        Save the game to a snapshot file.
+        
+        Args:
+            snapshot_file: Path to the snapshot file (defaults to the checkpoint file)
+        """
+        snapshot.save(self, snapshot_file or self.checkpoint_file)
+    
+    @classmethod
+    def load(cls, snapshot_file: str, logger=None, checkpoint_file: Optional[str] = None) -> "GameEngine":
+        """
+        Restore a game from a snapshot file.
+        
+        Args:
+            snapshot_file: Path to the snapshot file
+            logger: GameLogger object for logging (optional)
+            checkpoint_file: File the game is saved to after each day of travel (optional)
+            
+        Returns:
+            GameEngine: The restored game
+        """
+        engine = snapshot.load(snapshot_file, logger)
+        engine.checkpoint_file = checkpoint_file
+        return engine
+    
+    def travel(self, location_id: int) -> List[str]:
+        """
+        Travel to a location in the current city, which takes one day.
+        Prices are updated, random events happen and interest is charged.
+        
+        Args:
+            location_id: ID of the location to travel to
+            
+        Returns:
+            List[str]: News reports of the random events that happened
+        """
+        player = self.player
+        location = self.location_manager.get_location(location_id, player.city)
+        if location is None or location_id == player.current_location:
+            raise ActionError("无法前往该位置。")
+        
+        prev_location = self.location_manager.get_location(player.current_location, player.city)
+        
+        # Move the player
+        player.current_location = location_id
+        player.days_left -= 1
+        
+        if self.logger:
+            self.logger.log_travel(player, prev_location.name if prev_location else None, location.name)
+        
+        # Prices and events change the goods and events managers
+        if self.shared:
+            self.unshare(("goods_manager", "event_manager"))
+        
+        # Update goods prices
+        self.goods_manager.update_prices()
+        
+        # Handle random events
+        days_left = player.days_left
+        news_reports = self.event_manager.handle_events(player, self.goods_manager)
+        if self.logger:
+            for report in news_reports:
+                self.logger.log_random_event("Random Event", report, {})
+        
+        # Update bank interest and debt, also for the days spent in hospital
+        self.bank.fast_forward(player, 1 + days_left - player.days_left)
+        
+        if self.logger:
+            self.logger.log_player_status(player)
+        
+        if self.checkpoint_file:
+            self.save()
+        
+        return news_reports
+    
+    def switch_city(self, city: str) -> None:
+        """
+        Move to another city, which takes one day.
+        
+        Args:
+            city: City to move to (BEIJING or SHANGHAI)
+        """
+        if not self.location_manager.move_to_city(self.player, city):
+            raise ActionError("无法前往该城市。")
+        
+        if self.checkpoint_file:
+            self.save()
+    
+    def max_buy(self, goods_id: int, price: Optional[int] = None) -> int:
+        """
+        Get the maximum quantity of a goods the player can buy.
+        
+        Args:
+            goods_id: ID of the goods
+            price: Price to pay instead of the market price (optional)
+            
+        Returns:
+            int: Maximum quantity, 0 if the goods can't be bought
+        """
+        market_price = self.goods_manager.get_market_price(goods_id)
+        if not market_price:
+            return 0
+        price = price or market_price
+        player = self.player
+        return max(0, min(player.cash // price, player.inventory_capacity - player.inventory_used))
+    
+    def buy(self, goods_id: int, quantity: int, price: Optional[int] = None) -> None:
+        """
+        Buy goods at the current market price.
+        
+        Args:
+            goods_id: ID of the goods
+            quantity: Quantity to buy
+            price: Price to pay instead of the market price, e.g. from a shared market (optional)
+        """
+        if not self.goods_manager.buy(self.player, goods_id, quantity, price):
+            raise ActionError("无法购买该商品。")
+        
+        if self.logger:
+            goods = self.goods_manager.goods_types[goods_id]
+            self.logger.log_buy(self.player, goods_id, goods.name, quantity, price or goods.current_price)
+    
+    def sell(self, goods_id: int, quantity: int, price: Optional[int] = None) -> None:
+        """
+        Sell goods at the current market price.
+        
+        Args:
+            goods_id: ID of the goods
+            quantity: Quantity to sell
+            price: Price to get instead of the market price, e.g. from a shared market (optional)
+        """
+        buy_price = self.player.get_buy_price(goods_id)
+        if not self.goods_manager.sell(self.player, goods_id, quantity, price):
+            raise ActionError("无法出售该商品。")
+        
+        if self.logger:
+            goods = self.goods_manager.goods_types[goods_id]
+            self.logger.log_sell(self.player, goods_id, goods.name, quantity, price or goods.current_price, buy_price)
+    
+    def deposit(self, amount: int) -> None:
+        """
+        Deposit cash in the bank.
+        
+        Args:
+            amount: Amount to deposit
+        """
+        if not self.bank.deposit(self.player, amount):
+            raise ActionError("无法存入这么多钱。")
+        
+        if self.logger:
+            self.logger.log_bank_transaction(self.player, "DEPOSIT", amount)
+    
+    def withdraw(self, amount: int) -> None:
+        """
+        Withdraw cash from the bank.
+        
+        Args:
+            amount: Amount to withdraw
+        """
+        if not self.bank.withdraw(self.player, amount):
+            raise ActionError("无法取出这么多钱。")
+        
+        if self.logger:
+            self.logger.log_bank_transaction(self.player, "WITHDRAW", amount)
+    
+    def repay(self, amount: int) -> None:
+        """
+        Repay debt with cash.
+        
+        Args:
+            amount: Amount to repay
+        """
+        if not self.bank.repay(self.player, amount):
+            raise ActionError("无法偿还这么多债务。")
+        
+        if self.logger:
+            self.logger.log_bank_transaction(self.player, "REPAY", amount)
+    
+    def heal(self, points: int) -> None:
+        """
+        Restore health at the hospital.
+        
+        Args:
+            points: Health points to restore
+        """
+        if not self.hospital.heal(self.player, points):
+            raise ActionError("无法进行这样的治疗。")
+    
+    def expand(self) -> None:
+        """Upgrade the house to increase inventory capacity."""
+        if not self.house_agency.expand(self.player):
+            raise ActionError("无法升级房子。")
+    
+    def get_end_reason(self) -> Optional[str]:
+        """
+        Get the reason the game is over.
+        
+        Returns:
+            "DAYS_OVER", "HEALTH_ZERO", or None if the game is still running
+        """
+        if self.player.days_left <= 0:
+            return "DAYS_OVER"
+        if self.player.health <= 0:
+            return "HEALTH_ZERO"
+        return None
+    
+    def is_over(self) -> bool:
+        """
+        Check if the game is over.
+        
+        Returns:
+            bool: True if the game is over, False otherwise
+        """
+        return self.get_end_reason() is not None
+    
+    def get_score(self) -> int:
+        """
+        Get the player's score.
+        
+        Returns:
+            int: Score (cash + bank_savings - debt)
+        """
+        return self.player.get_net_worth()
+    
+    def finish(self) -> Tuple[str, int]:
+        """
+        End the game: sell remaining goods if the days are over and log the result.
+        
+        Returns:
+            Tuple (end reason, final score)
+        """
+        reason = self.get_end_reason() or "QUIT"
+        if reason == "DAYS_OVER":
+            sales = self.goods_manager.liquidate(self.player)
+            if self.logger:
+                for goods_id, name, quantity, price, buy_price, _ in sales:
+                    self.logger.log_sell(self.player, goods_id, name, quantity, price, buy_price)
+        
+        final_score = self.get_score()
+        if self.logger:
+            self.logger.log_game_end(self.player, reason, final_score)
+        return reason, final_score
@@ -5,16 +5,73 @@ Events module for Beijing Life Story game.
 Handles random events that can occur during the game.
 """
 
+import copy
 import random
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 
+from .rng import copy_stream
+
+# Number of values a roll can take for commercial events (randint(0, 950))
+# and for health and money events (randint(0, 1000))
+COMMERCIAL_ROLLS = 951
+PERSONAL_ROLLS = 1001
+
+def _hit_count(rolls: int, freq: int) -> int:
+    """
+    Count the rolls in range(rolls) that trigger an event, i.e. roll % freq == 0.
+    
+    Args:
+        rolls: Number of values a roll can take
+        freq: Frequency value of the event
+        
+    Returns:
+        int: Number of triggering rolls
+    """
+    return (rolls - 1) // freq + 1
+
+@lru_cache(maxsize=1024)
+def _first_hit_table(hit_counts: Tuple[int, ...], rolls: int) -> Tuple[Tuple[int, ...], int]:
+    """
+    Build the cumulative table of which event fires first when the events
+    of a category are rolled one by one and the first hit wins.
+    
+    Event i fires with weight prod(rolls - hits[j] for j < i) * hits[i] * rolls^(n-1-i)
+    out of rolls^n, so one uniform draw in range(rolls^n) picks the outcome
+    with exactly the same distribution as rolling every event in turn.
+    
+    Args:
+        hit_counts: Number of triggering rolls of each event, in order
+        rolls: Number of values a roll can take
+        
+    Returns:
+        Tuple (cumulative weights of the events, total weight)
+    """
+    n = len(hit_counts)
+    cumulative = []
+    total = 0
+    misses = 1
+    for i, hits in enumerate(hit_counts):
+        total += misses * hits * rolls ** (n - 1 - i)
+        cumulative.append(total)
+        misses *= rolls - hits
+    return tuple(cumulative), rolls ** n
+
 class EventManager:
     """
     EventManager class to manage all random events in the game.
     """
     
-    def __init__(self):
-        """Initialize the event manager with all event types."""
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize the event manager with all event types.
+        
+        Args:
+            rng: Random stream for events (optional)
+        """
+        self.rng = rng if rng is not None else random.Random()
+        
         # Commercial events that affect goods prices and quantities
         self.commercial_events = []
         self._init_commercial_events()
@@ -27,6 +84,13 @@ class EventManager:
         self.money_events = []
         self._init_money_events()
         
+        # Precompute the roll tables, so each category needs a single draw
+        self._commercial_hits = tuple(_hit_count(COMMERCIAL_ROLLS, event["freq"]) for event in self.commercial_events)
+        self._health_table = _first_hit_table(
+            tuple(_hit_count(PERSONAL_ROLLS, event["freq"]) for event in self.health_events), PERSONAL_ROLLS)
+        self._money_table = _first_hit_table(
+            tuple(_hit_count(PERSONAL_ROLLS, event["freq"]) for event in self.money_events), PERSONAL_ROLLS)
+        
         # Locations where player can pass out
         self.pass_out_locations = [
             "建国门", "北京站", "西直门", "崇文门", "东直门",
@@ -46,6 +110,17 @@ class EventManager:
             "骗子知道的地方门口"
         ]
     
+    def copy(self) -> "EventManager":
+        """
+        Copy the event manager. The copy shares the event tables and gets its own random stream.
+        
+        Returns:
+            EventManager: Independent copy
+        """
+        clone = copy.copy(self)
+        clone.rng = copy_stream(self.rng)
+        return clone
+    
     def _init_commercial_events(self):
         """Initialize commercial events."""
         self.commercial_events = [
@@ -312,6 +387,20 @@ class EventManager:
             }
         ]
     
+    def _draw_event(self, table: Tuple[Tuple[int, ...], int]) -> Optional[int]:
+        """
+        Draw which event of a category fires, if any.
+        
+        Args:
+            table: Cumulative table from _first_hit_table
+            
+        Returns:
+            Index of the event that fires, or None if no event fires
+        """
+        cumulative, total = table
+        index = bisect_right(cumulative, self.rng.randrange(total))
+        return index if index < len(cumulative) else None
+    
     def handle_events(self, player, goods_manager) -> List[str]:
         """
         Handle all random events that can occur during the game.
@@ -356,41 +445,41 @@ class EventManager:
             player: Player object
             goods_manager: GoodsManager object
         """
-        for event in self.commercial_events:
-            if random.randint(0, 950) % event["freq"] == 0:
-                goods_id = event["goods_id"]
-                
-                # Skip if goods not available
-                if not goods_manager.available_goods.get(goods_id, False):
-                    continue
-                
-                # Get goods
-                goods = goods_manager.goods_types[goods_id]
-                
-                # Apply event effects
-                if event["multiply"] > 0:
-                    goods.multiply_price(event["multiply"])
-                
-                if event["divide"] > 0:
-                    goods.divide_price(event["divide"])
-                
-                if event["add"] > 0:
-                    # Special case for the last event (adds debt)
-                    if event == self.commercial_events[-1]:
-                        player.debt += 2500
-                    
-                    # Add goods to inventory if player has space
-                    add_count = min(event["add"], player.inventory_capacity - player.inventory_used)
-                    if add_count > 0:
-                        player.add_to_inventory(
-                            goods_id,
-                            goods.name,
-                            add_count,
-                            0  # Free goods
-                        )
-                
-                # Return the event message
-                return event["msg"]
+        # Events for goods that are not available never fire
+        hit_counts = tuple(
+            hits if goods_manager.get_market_price(event["goods_id"]) is not None else 0
+            for hits, event in zip(self._commercial_hits, self.commercial_events)
+        )
+        index = self._draw_event(_first_hit_table(hit_counts, COMMERCIAL_ROLLS))
+        if index is None:
+            return None
+        
+        event = self.commercial_events[index]
+        goods_id = event["goods_id"]
+        
+        # Apply event effects
+        if event["multiply"] > 0:
+            goods_manager.multiply_price(goods_id, event["multiply"])
+        
+        if event["divide"] > 0:
+            goods_manager.divide_price(goods_id, event["divide"])
+        
+        if event["add"] > 0:
+            # Special case for the last event (adds debt)
+            if index == len(self.commercial_events) - 1:
+                player.debt += 2500
+            
+            # Add goods to inventory if player has space
+            add_count = min(event["add"], player.inventory_capacity - player.inventory_used)
+            if add_count > 0:
+                player.add_to_inventory(
+                    goods_id,
+                    add_count,
+                    0  # Free goods
+                )
+        
+        # Return the event message
+        return event["msg"]
     
     def _handle_health_events(self, player) -> None:
         """
@@ -399,40 +488,44 @@ class EventManager:
         Args:
             player: Player object
         """
-        for event in self.health_events:
-            if random.randint(0, 1000) % event["freq"] == 0:
-                # Apply health damage
-                player.health -= event["damage"]
-                
-                # Check if player needs medical care
-                if player.health < 85 and player.days_left > 3:
-                    # Player needs medical care
-                    delay_days = 1 + random.randint(0, 1)
-                    location_index = (10 * (1 if player.city == "BEIJING" else 0) + player.current_location - 1)
-                    location = self.pass_out_locations[location_index] if 0 <= location_index < len(self.pass_out_locations) else "某地"
-                    detailed_location = random.choice(self.detailed_locations)
-                    
-                    # Calculate medical cost
-                    medical_cost = delay_days * (1000 + random.randint(0, 8500))
-                    
-                    # Add to debt
-                    player.debt += medical_cost
-                    
-                    # Increase health
-                    player.health += 10
-                    if player.health > 100:
-                        player.health = 100
-                    
-                    # Decrease days left
-                    player.days_left -= delay_days
-                    
-                    # Return the event message
-                    return f"你的身体不行了，送进了医院，医生说你需要休息{delay_days}天。\n" \
-                           f"你在昏迷中注射了葡萄糖,我被人发现躺在{location}附近的{detailed_location}里。\n" \
-                           f"医院院长为我垫付了住院费用{medical_cost}元。"
-                
-                # Return the event message
-                return f"{event['msg']}\n你的健康值减少了{event['damage']}点。"
+        index = self._draw_event(self._health_table)
+        if index is None:
+            return None
+        
+        event = self.health_events[index]
+        
+        # Apply health damage
+        player.health -= event["damage"]
+        
+        # Check if player needs medical care
+        if player.health < 85 and player.days_left > 3:
+            # Player needs medical care
+            delay_days = 1 + self.rng.randint(0, 1)
+            location_index = (10 * (1 if player.city == "BEIJING" else 0) + player.current_location - 1)
+            location = self.pass_out_locations[location_index] if 0 <= location_index < len(self.pass_out_locations) else "某地"
+            detailed_location = self.rng.choice(self.detailed_locations)
+            
+            # Calculate medical cost
+            medical_cost = delay_days * (1000 + self.rng.randint(0, 8500))
+            
+            # Add to debt
+            player.debt += medical_cost
+            
+            # Increase health
+            player.health += 10
+            if player.health > 100:
+                player.health = 100
+            
+            # Decrease days left
+            player.days_left -= delay_days
+            
+            # Return the event message
+            return f"你的身体不行了，送进了医院，医生说你需要休息{delay_days}天。\n" \
+                   f"你在昏迷中注射了葡萄糖,我被人发现躺在{location}附近的{detailed_location}里。\n" \
+                   f"医院院长为我垫付了住院费用{medical_cost}元。"
+        
+        # Return the event message
+        return f"{event['msg']}\n你的健康值减少了{event['damage']}点。"
     
     def _handle_money_events(self, player) -> None:
         """
@@ -441,18 +534,22 @@ class EventManager:
         Args:
             player: Player object
         """
-        for event in self.money_events:
-            if random.randint(0, 1000) % event["freq"] == 0:
-                # Calculate money loss
-                money_loss = (player.cash * event["ratio"]) // 100
-                
-                # Apply money loss
-                player.cash -= money_loss
-                if player.cash < 0:
-                    player.cash = 0
-                
-                # Return the event message
-                return f"{event['msg']}\n你的现金减少了{event['ratio']}%。"
+        index = self._draw_event(self._money_table)
+        if index is None:
+            return None
+        
+        event = self.money_events[index]
+        
+        # Calculate money loss
+        money_loss = (player.cash * event["ratio"]) // 100
+        
+        # Apply money loss
+        player.cash -= money_loss
+        if player.cash < 0:
+            player.cash = 0
+        
+        # Return the event message
+        return f"{event['msg']}\n你的现金减少了{event['ratio']}%。"
     
     def _handle_hacker_events(self, player) -> None:
         """
@@ -461,15 +558,15 @@ class EventManager:
         Args:
             player: Player object
         """
-        if random.randint(0, 1000) % 25 == 0:
+        if self.rng.randint(0, 1000) % 25 == 0:
             if player.bank_savings < 1000:
                 return
             
             if player.bank_savings > 100000:
                 # Large savings, can lose or gain money
-                amount = player.bank_savings // (2 + random.randint(0, 19))
+                amount = player.bank_savings // (2 + self.rng.randint(0, 19))
                 
-                if random.randint(0, 20) % 3 != 0:
+                if self.rng.randint(0, 20) % 3 != 0:
                     # Lose money
                     player.bank_savings -= amount
                     return f"在黑客入侵银行网络，试图修改数据库，我的存款减少了{amount}"
@@ -479,6 +576,6 @@ class EventManager:
                     return f"在黑客入侵银行网络，试图修改数据库，我的存款增加了{amount}"
             else:
                 # Smaller savings, always gain money
-                amount = player.bank_savings // (1 + random.randint(0, 14))
+                amount = player.bank_savings // (1 + self.rng.randint(0, 14))
                 player.bank_savings += amount
                 return f"在黑客入侵银行网络，试图修改数据库，我的存款增加了{amount}"
@@ -7,15 +7,22 @@ Handles goods and trading system.
 
 import random
 from typing import Dict, List, Optional, Tuple
-import questionary
-from colorama import Fore, Style
+
+from .rng import copy_stream
+
+# Fame lost per unit sold for goods that hurt the player's reputation
+FAME_PENALTIES: Dict[int, int] = {
+    4: 7,   # 上海小姐服务
+    3: 10   # 白酒（假冒伪劣）
+}
 
 class Goods:
     """
     Goods class representing a type of goods in the game.
     """
     
-    def __init__(self, goods_id: int, name: str, base_price: int, price_range: int):
+    def __init__(self, goods_id: int, name: str, base_price: int, price_range: int,
+                 rng: Optional[random.Random] = None):
         """
         Initialize a new goods type.
         
@@ -24,24 +31,40 @@ class Goods:
             name: Name of the goods
             base_price: Base price of the goods
             price_range: Range of price fluctuation
+            rng: Random stream to draw the initial price from (optional)
         """
         self.id = goods_id
         self.name = name
         self.base_price = base_price
         self.price_range = price_range
         self.current_price = 0
-        self.update_price()
+        self.update_price(rng)
     
-    def update_price(self) -> int:
+    def update_price(self, rng: Optional[random.Random] = None) -> int:
         """
         Update the price of the goods randomly within the price range.
         
+        Args:
+            rng: Random stream to draw the price from (optional)
+            
         Returns:
             int: New price of the goods
         """
-        self.current_price = self.base_price + random.randint(0, self.price_range)
+        rng = rng if rng is not None else random
+        self.current_price = self.base_price + rng.randint(0, self.price_range)
         return self.current_price
     
+    def copy(self) -> "Goods":
+        """
+        Copy the goods. Only the current price changes during a game.
+        
+        Returns:
+            Goods: Independent copy of the goods
+        """
+        clone = Goods.__new__(Goods)
+        clone.__dict__.update(self.__dict__)
+        return clone
+    
     def multiply_price(self, factor: int) -> int:
         """
         Multiply the price of the goods by a factor.
@@ -76,22 +99,50 @@ class GoodsManager:
     GoodsManager class to manage all goods and trading operations.
     """
     
-    def __init__(self):
-        """Initialize the goods manager with all available goods types."""
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize the goods manager with all available goods types.
+        
+        Args:
+            rng: Random stream for prices and availability (optional)
+        """
+        self.rng = rng if rng is not None else random.Random()
+        
         # Initialize all goods types
         self.goods_types: Dict[int, Goods] = {
-            0: Goods(0, "盗版软件", 100, 350),
-            1: Goods(1, "走私香烟", 15000, 15000),
-            2: Goods(2, "盗版VCD和游戏", 5, 50),
-            3: Goods(3, "白酒（假冒伪劣）", 1000, 2500),
-            4: Goods(4, "上海小姐服务（按摩服务）", 5000, 9000),
-            5: Goods(5, "进口香烟", 250, 600),
-            6: Goods(6, "水货手机", 750, 750),
-            7: Goods(7, "假冒化妆品", 65, 180)
+            0: Goods(0, "盗版软件", 100, 350, self.rng),
+            1: Goods(1, "走私香烟", 15000, 15000, self.rng),
+            2: Goods(2, "盗版VCD和游戏", 5, 50, self.rng),
+            3: Goods(3, "白酒（假冒伪劣）", 1000, 2500, self.rng),
+            4: Goods(4, "上海小姐服务（按摩服务）", 5000, 9000, self.rng),
+            5: Goods(5, "进口香烟", 250, 600, self.rng),
+            6: Goods(6, "水货手机", 750, 750, self.rng),
+            7: Goods(7, "假冒化妆品", 65, 180, self.rng)
         }
         
         # Available goods in the market (some goods may not be available)
         self.available_goods: Dict[int, bool] = {goods_id: True for goods_id in self.goods_types}
+        
+        # Market price index by goods ID (None if not available), kept in sync
+        # with prices and availability so lookups don't scan the market
+        self._market_prices: List[Optional[int]] = []
+        self._available_list: Optional[List[Tuple[int, str, int]]] = None
+        self._refresh_market_index()
+    
+    def copy(self) -> "GoodsManager":
+        """
+        Copy the goods manager, including prices, availability and its random stream.
+        
+        Returns:
+            GoodsManager: Independent copy of the goods manager
+        """
+        clone = GoodsManager.__new__(GoodsManager)
+        clone.__dict__.update(self.__dict__)
+        clone.rng = copy_stream(self.rng)
+        clone.goods_types = {goods_id: goods.copy() for goods_id, goods in self.goods_types.items()}
+        clone.available_goods = dict(self.available_goods)
+        clone._market_prices = list(self._market_prices)
+        return clone
     
     def update_prices(self, leave_out: int = 3) -> None:
         """
@@ -105,26 +156,172 @@ class GoodsManager:
         
         # Update prices
         for goods in self.goods_types.values():
-            goods.update_price()
+            goods.update_price(self.rng)
         
         # Randomly make some goods unavailable
         for _ in range(leave_out):
-            goods_id = random.choice(list(self.goods_types.keys()))
+            goods_id = self.rng.choice(list(self.goods_types.keys()))
             self.available_goods[goods_id] = False
+        
+        self._refresh_market_index()
+    
+    def _refresh_market_index(self) -> None:
+        """Rebuild the market price index from prices and availability."""
+        self._market_prices = [
+            goods.current_price if self.available_goods.get(goods_id, False) else None
+            for goods_id, goods in self.goods_types.items()
+        ]
+        self._available_list = None
+    
+    def multiply_price(self, goods_id: int, factor: int) -> int:
+        """
+        Multiply the price of a goods, keeping the market price index in sync.
+        Used for events that affect goods prices.
+        
+        Args:
+            goods_id: ID of the goods
+            factor: Multiplication factor
+            
+        Returns:
+            int: New price of the goods
+        """
+        price = self.goods_types[goods_id].multiply_price(factor)
+        self._update_market_index(goods_id, price)
+        return price
+    
+    def divide_price(self, goods_id: int, factor: int) -> int:
+        """
+        Divide the price of a goods, keeping the market price index in sync.
+        Used for events that affect goods prices.
+        
+        Args:
+            goods_id: ID of the goods
+            factor: Division factor
+            
+        Returns:
+            int: New price of the goods
+        """
+        price = self.goods_types[goods_id].divide_price(factor)
+        self._update_market_index(goods_id, price)
+        return price
+    
+    def _update_market_index(self, goods_id: int, price: int) -> None:
+        """
+        Update the market price index after the price of one goods changed.
+        
+        Args:
+            goods_id: ID of the goods
+            price: New price of the goods
+        """
+        if self._market_prices[goods_id] is not None:
+            self._market_prices[goods_id] = price
+            self._available_list = None
     
     def get_available_goods(self) -> List[Tuple[int, str, int]]:
         """
         Get list of available goods in the market.
+        The list is cached until prices change, so callers must not modify it.
         
         Returns:
             List of tuples (goods_id, name, price) for available goods
         """
-        available = []
-        for goods_id, available_flag in self.available_goods.items():
-            if available_flag:
-                goods = self.goods_types[goods_id]
-                available.append((goods_id, goods.name, goods.current_price))
-        return available
+        if self._available_list is None:
+            self._available_list = [
+                (goods_id, self.goods_types[goods_id].name, price)
+                for goods_id, price in enumerate(self._market_prices) if price is not None
+            ]
+        return self._available_list
+    
+    def get_market_price(self, goods_id: int) -> Optional[int]:
+        """
+        Get the market price of a goods type if it is available.
+        
+        Args:
+            goods_id: ID of the goods
+            
+        Returns:
+            Current price, or None if the goods is not available in the market
+        """
+        return self._market_prices[goods_id]
+    
+    def buy(self, player, goods_id: int, amount: int, price: Optional[int] = None) -> bool:
+        """
+        Buy goods for the player at the current market price.
+        
+        Args:
+            player: Player object
+            goods_id: ID of the goods
+            amount: Quantity to buy
+            price: Price to pay instead of the market price, e.g. from a shared market (optional)
+            
+        Returns:
+            bool: True if the purchase was made, False otherwise
+        """
+        market_price = self.get_market_price(goods_id)
+        if market_price is None or amount <= 0:
+            return False
+        if price is None:
+            price = market_price
+        
+        if player.cash < price * amount or not player.has_inventory_space(amount):
+            return False
+        
+        player.cash -= price * amount
+        player.add_to_inventory(goods_id, amount, price)
+        return True
+    
+    def sell(self, player, goods_id: int, amount: int, price: Optional[int] = None) -> bool:
+        """
+        Sell goods from the player's inventory at the current market price.
+        
+        Args:
+            player: Player object
+            goods_id: ID of the goods
+            amount: Quantity to sell
+            price: Price to get instead of the market price, e.g. from a shared market (optional)
+            
+        Returns:
+            bool: True if the sale was made, False otherwise
+        """
+        market_price = self.get_market_price(goods_id)
+        if market_price is None or amount <= 0:
+            return False
+        if price is None:
+            price = market_price
+        
+        if not player.remove_from_inventory(goods_id, amount):
+            return False
+        
+        player.cash += price * amount
+        
+        # Some goods hurt the player's reputation
+        if goods_id in FAME_PENALTIES:
+            player.fame = max(0, player.fame - FAME_PENALTIES[goods_id] * amount)
+        return True
+    
+    def liquidate(self, player) -> List[Tuple[int, str, int, int, int, bool]]:
+        """
+        Sell all goods in player's inventory at the end of the game.
+        Goods not available in the market are sold at their buy price.
+        
+        Args:
+            player: Player object
+            
+        Returns:
+            List of tuples (goods_id, name, quantity, price, buy_price, available)
+        """
+        sales = []
+        for goods_id, quantity, buy_price in player.get_inventory():
+            market_price = self.get_market_price(goods_id)
+            is_available = market_price is not None
+            if not is_available:
+                market_price = buy_price
+            
+            sales.append((goods_id, self.goods_types[goods_id].name, quantity, market_price, buy_price, is_available))
+            player.remove_from_inventory(goods_id, quantity)
+        
+        player.cash += sum(quantity * price for _, _, quantity, price, _, _ in sales)
+        return sales
     
     def buy_goods(self, player, ui, logger=None) -> str:
         """
@@ -145,14 +342,14 @@ class GoodsManager:
         # Create choices for the goods menu
         choices = []
         for i, (goods_id, name, price) in enumerate(available_goods, 1):
-            choices.append(questionary.Choice(
+            choices.append(ui.choice(
                 title=f"{name} - 价格: {price}",
                 value=(goods_id, name, price)
             ))
         
         # Add cancel option
-        choices.append(questionary.Separator())
-        choices.append(questionary.Choice(title='取消', value=None))
+        choices.append(ui.separator())
+        choices.append(ui.choice(title='取消', value=None))
         
         # Ask player which goods to buy
         goods_choice = ui.custom_select(
@@ -190,8 +387,8 @@ class GoodsManager:
             return "continue"
         
         # Process purchase
-        player.cash -= price * amount
-        player.add_to_inventory(goods_id, name, amount, price)
+        if not self.buy(player, goods_id, amount):
+            return "continue"
         
         # Log the purchase if logger is provided
         if logger:
@@ -210,7 +407,9 @@ class GoodsManager:
             ui: UI object for user interaction
             logger: GameLogger object for logging (optional)
         """
-        if not player.inventory:
+        from colorama import Fore, Style
+        
+        if player.inventory_used == 0:
             ui.show_message("你没有任何商品可以出售。")
             return "exit"
         
@@ -218,25 +417,22 @@ class GoodsManager:
         choices = []
         inventory_list = []
         
-        for i, (goods_id, goods_info) in enumerate(player.inventory.items(), 1):
-            inventory_list.append((goods_id, goods_info["name"], goods_info["quantity"], goods_info["price"]))
+        for i, (goods_id, quantity, buy_price) in enumerate(player.get_inventory(), 1):
+            name = self.goods_types[goods_id].name
+            inventory_list.append((goods_id, name, quantity, buy_price))
             
             # Check if goods is available in market
-            market_price = 0
-            for market_goods_id, _, price in self.get_available_goods():
-                if market_goods_id == goods_id:
-                    market_price = price
-                    break
+            market_price = self.get_market_price(goods_id) or 0
             
             # Prepare information for display
             is_available = market_price > 0
-            is_profitable = market_price > goods_info['price']
+            is_profitable = market_price > buy_price
             
-            # Create title without color codes for questionary
-            title = f"{goods_info['name']} - 数量: {goods_info['quantity']} - 购买价: {goods_info['price']}"
+            # Create title without color codes for the menu
+            title = f"{name} - 数量: {quantity} - 购买价: {buy_price}"
             if is_available:
                 title += f" - 市场价: {market_price}"
-                profit = market_price - goods_info['price']
+                profit = market_price - buy_price
                 if profit > 0:
                     title += f" (+{profit})"
                 else:
@@ -245,31 +441,31 @@ class GoodsManager:
             # Print colored version to console for reference
             status_line = ""
             if is_available:
-                status_line += f"{Fore.GREEN}{goods_info['name']}{Style.RESET_ALL} - 数量: {goods_info['quantity']} - "
+                status_line += f"{Fore.GREEN}{name}{Style.RESET_ALL} - 数量: {quantity} - "
                 if is_profitable:
-                    status_line += f"{Fore.YELLOW}购买价: {goods_info['price']}{Style.RESET_ALL}"
+                    status_line += f"{Fore.YELLOW}购买价: {buy_price}{Style.RESET_ALL}"
                 else:
-                    status_line += f"{Fore.RED}购买价: {goods_info['price']}{Style.RESET_ALL}"
+                    status_line += f"{Fore.RED}购买价: {buy_price}{Style.RESET_ALL}"
                 
                 status_line += f" - 市场价: {market_price}"
                 if is_profitable:
-                    status_line += f" ({Fore.GREEN}+{market_price - goods_info['price']}{Style.RESET_ALL})"
+                    status_line += f" ({Fore.GREEN}+{market_price - buy_price}{Style.RESET_ALL})"
                 else:
-                    status_line += f" ({Fore.RED}{market_price - goods_info['price']}{Style.RESET_ALL})"
+                    status_line += f" ({Fore.RED}{market_price - buy_price}{Style.RESET_ALL})"
             else:
-                status_line += f"{goods_info['name']} - 数量: {goods_info['quantity']} - 购买价: {goods_info['price']}"
+                status_line += f"{name} - 数量: {quantity} - 购买价: {buy_price}"
                 status_line += " (当前市场不可售)"
             
-            print(f"{i}. {status_line}")
+            ui.write(f"{i}. {status_line}")
             
-            choices.append(questionary.Choice(
+            choices.append(ui.choice(
                 title=title,
-                value=(goods_id, goods_info["name"], goods_info["quantity"], goods_info["price"])
+                value=(goods_id, name, quantity, buy_price)
             ))
         
         # Add cancel option
-        choices.append(questionary.Separator())
-        choices.append(questionary.Choice(title='取消', value=None))
+        choices.append(ui.separator())
+        choices.append(ui.choice(title='取消', value=None))
         
         # Ask player which goods to sell
         goods_choice = ui.custom_select(
@@ -288,15 +484,9 @@ class GoodsManager:
             return "exit"
         
         # Check if the goods is available in the market
-        market_price = 0
-        is_available = False
-        for market_goods_id, market_name, price in self.get_available_goods():
-            if market_goods_id == goods_id:
-                market_price = price
-                is_available = True
-                break
-        
-        if not is_available:
+        market_price = self.get_market_price(goods_id)
+        
+        if market_price is None:
             ui.show_message(f"黑市上现在没有人收购 {name}。")
             return "continue"
         
@@ -312,8 +502,8 @@ class GoodsManager:
             return "continue"
         
         # Process sale
-        player.cash += market_price * amount
-        player.remove_from_inventory(goods_id, amount)
+        if not self.sell(player, goods_id, amount):
+            return "continue"
         
         # Log the sale if logger is provided
         if logger:
@@ -322,17 +512,11 @@ class GoodsManager:
         ui.show_message(f"你出售了 {amount} 个 {name}，获得了 {market_price * amount} 元。")
         ui.clear_screen()
         
-        # Handle fame decrease for certain goods
+        # Warn about fame decrease for certain goods
         if goods_id == 4:  # 上海小姐服务
-            player.fame -= 7 * amount
-            if player.fame < 0:
-                player.fame = 0
             ui.show_message("出售这种商品降低了你的名声！")
             ui.clear_screen()
         elif goods_id == 3:  # 白酒（假冒伪劣）
-            player.fame -= 10 * amount
-            if player.fame < 0:
-                player.fame = 0
             ui.show_message("出售这种商品严重降低了你的名声！")
             ui.clear_screen()
         
@@ -347,40 +531,23 @@ class GoodsManager:
             ui: UI object for user interaction
             logger: GameLogger object for logging (optional)
         """
-        if not player.inventory:
+        if player.inventory_used == 0:
             return
         
         ui.show_message("游戏结束，系统自动出售你剩余的商品:")
         
         total_earned = 0
-        for goods_id, goods_info in list(player.inventory.items()):
-            name = goods_info["name"]
-            quantity = goods_info["quantity"]
-            
-            # Find market price
-            market_price = 0
-            is_available = False
-            for market_goods_id, market_name, price in self.get_available_goods():
-                if market_goods_id == goods_id:
-                    market_price = price
-                    is_available = True
-                    break
-            
-            # If not available in market, use buy price
+        for goods_id, name, quantity, market_price, buy_price, is_available in self.liquidate(player):
             if not is_available:
-                market_price = goods_info["price"]
                 ui.show_message(f"{name} 在黑市上没有人收购，以原价出售。")
             
-            # Sell goods
             earned = market_price * quantity
             total_earned += earned
             
             # Log the sale if logger is provided
             if logger:
-                logger.log_sell(player, goods_id, name, quantity, market_price, goods_info["price"])
+                logger.log_sell(player, goods_id, name, quantity, market_price, buy_price)
             
             ui.show_message(f"出售 {quantity} 个 {name}，获得 {earned} 元")
-            player.remove_from_inventory(goods_id, quantity)
         
-        player.cash += total_earned
         ui.show_message(f"总共获得 {total_earned} 元")
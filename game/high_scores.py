@@ -7,21 +7,74 @@ Handles tracking high scores.
 
 import os
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+
+# Number of scores on the high score list
+TOP_SCORES = 10
+
+# Advisory file locks: fcntl on Unix, msvcrt on Windows
+try:
+    import fcntl
+    
+    def _lock(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    
+    def _unlock(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+    
+    def _lock(f) -> None:
+        # LK_LOCK gives up after 10 seconds, so keep trying
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+    
+    def _unlock(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def locked(lock_file: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on a lock file, shared by all processes using it.
+    
+    Args:
+        lock_file: Path of the lock file, created if needed
+    """
+    with open(lock_file, "a+b") as f:
+        _lock(f)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
 
 class HighScores:
     """
     HighScores class to handle tracking high scores.
     """
     
-    def __init__(self, scores_file: str = "scores.json"):
+    def __init__(self, scores_file: str = "scores.json", top_k: int = TOP_SCORES):
         """
         Initialize the high scores.
         
         Args:
             scores_file: Path to the scores file
+            top_k: Number of scores kept on the list
         """
         self.scores_file = scores_file
+        self.top_k = top_k
         self.scores = self._load_scores()
     
     def _load_scores(self) -> List[Dict[str, Any]]:
@@ -43,10 +96,21 @@ class HighScores:
             return []
     
     def _save_scores(self) -> None:
-        """Save high scores to file."""
+        """
+        Save high scores to file.
+        The scores are written to a temporary file that then replaces the scores file,
+        so readers never see a partly written file.
+        """
         try:
-            with open(self.scores_file, "w", encoding="utf-8") as f:
-                json.dump(self.scores, f, ensure_ascii=False, indent=2)
+            directory = os.path.dirname(os.path.abspath(self.scores_file))
+            fd, temp_file = tempfile.mkstemp(prefix=".scores-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.scores, f, ensure_ascii=False, indent=2)
+                os.replace(temp_file, self.scores_file)
+            except BaseException:
+                os.remove(temp_file)
+                raise
         except IOError:
             # If file can't be written, just ignore
             pass
@@ -62,7 +126,7 @@ class HighScores:
             fame: Player's fame
             
         Returns:
-            bool: True if score was added to top 10, False otherwise
+            bool: True if score was added to the top scores, False otherwise
         """
         # Create new score entry
         new_score = {
@@ -72,21 +136,24 @@ class HighScores:
             "fame": fame
         }
         
-        # Add score to list
-        self.scores.append(new_score)
-        
-        # Sort scores by score (descending)
-        self.scores.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Keep only top 10 scores
-        if len(self.scores) > 10:
-            self.scores = self.scores[:10]
-            # Check if new score is in top 10
-            return any(s["name"] == name and s["score"] == score for s in self.scores)
-        else:
-            # If less than 10 scores, new score is definitely in top 10
+        # Other games may have saved scores since this list was loaded,
+        # so merge into the current file while holding its lock
+        with locked(self.scores_file + ".lock"):
+            self.scores = self._load_scores()
+            
+            # Insert after the equal scores, keeping only the top scores
+            position = len(self.scores)
+            for i, s in enumerate(self.scores):
+                if score > s["score"]:
+                    position = i
+                    break
+            if position >= self.top_k:
+                return False
+            
+            self.scores.insert(position, new_score)
+            del self.scores[self.top_k:]
             self._save_scores()
-            return True
+        return True
     
     def get_rank(self, score: int) -> int:
         """
@@ -96,17 +163,29 @@ class HighScores:
             score: Score to get rank for
             
         Returns:
-            int: Rank (1-10) or 0 if not in top 10
+            int: Rank (1-top_k) or 0 if not in the top scores
         """
         for i, s in enumerate(self.scores):
             if score >= s["score"]:
                 return i + 1
         
-        if len(self.scores) < 10:
+        if len(self.scores) < self.top_k:
             return len(self.scores) + 1
         else:
             return 0
     
+    def get_top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the best scores.
+        
+        Args:
+            limit: Number of scores (defaults to top_k)
+            
+        Returns:
+            List of score entries, best first
+        """
+        return self.scores[:limit or self.top_k]
+    
     def show(self, ui) -> None:
         """
         Show high scores.
@@ -115,18 +194,187 @@ class HighScores:
             ui: UI object for user interaction
         """
         ui.clear_screen()
-        print("=" * 80)
-        print("                                高分榜")
-        print("=" * 80)
+        ui.write("=" * 80)
+        ui.write("                                高分榜")
+        ui.write("=" * 80)
         
-        if not self.scores:
-            print("\n还没有高分记录。")
+        scores = self.get_top()
+        if not scores:
+            ui.write("\n还没有高分记录。")
         else:
-            print("\n排名  姓名                  得分      健康    名声")
-            print("-" * 80)
+            ui.write("\n排名  姓名                  得分      健康    名声")
+            ui.write("-" * 80)
+            
+            for i, score in enumerate(scores):
+                ui.write(f"{i+1:2d}.   {score['name']:<20s}  {score['score']:<8d}  {score['health']:<6d}  {score['fame']:<6d}")
+        
+        ui.write("\n" + "=" * 80)
+        ui.pause()
+
+
+class SqliteHighScores(HighScores):
+    """
+    SqliteHighScores class keeping every score in an SQLite database.
+    The database runs in WAL mode, so many game processes can add scores at
+    the same time while others read, and an index on the score keeps top
+    scores and ranks fast however long the history gets. The connection may
+    be used from any thread, one thread at a time.
+    """
+    
+    def __init__(self, scores_file: str = "scores.db", top_k: int = TOP_SCORES):
+        """
+        Initialize the high scores, creating the database if needed.
+        
+        Args:
+            scores_file: Path to the database file
+            top_k: Number of scores on the high score list
+        """
+        self.scores_file = scores_file
+        self.top_k = top_k
+        
+        # Wait for other writers instead of failing when the database is busy.
+        # The server adds scores from executor threads, so the connection isn't
+        # tied to the thread that opened it, and a lock serializes its use.
+        self.connection = sqlite3.connect(scores_file, timeout=30, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "id INTEGER PRIMARY KEY, name TEXT NOT NULL, score INTEGER NOT NULL, "
+                "health INTEGER NOT NULL, fame INTEGER NOT NULL, created REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC)")
+    
+    @property
+    def scores(self) -> List[Dict[str, Any]]:
+        """Get the high score list."""
+        return self.get_top()
+    
+    def close(self) -> None:
+        """Close the database."""
+        with self.lock:
+            self.connection.close()
+    
+    def add_score(self, name: str, score: int, health: int, fame: int) -> bool:
+        """
+        Add a new score. Every score is kept, not only the top ones.
+        
+        Args:
+            name: Player's name
+            score: Player's score
+            health: Player's health
+            fame: Player's fame
+            
+        Returns:
+            bool: True if the score made the top scores, False otherwise
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO scores (name, score, health, fame, created) VALUES (?, ?, ?, ?, ?)",
+                    (name, score, health, fame, time.time()))
+            
+            # Ties rank below the earlier scores
+            return self._count_better(score, inclusive=True) < self.top_k
+    
+    def _count_better(self, score: int, inclusive: bool = False) -> int:
+        """
+        Count the scores better than a score, stopping at top_k + 1.
+        The count walks the score index, so it costs O(log n + top_k).
+        
+        Args:
+            score: Score to compare with
+            inclusive: Count equal scores too, excluding one (the score itself)
+            
+        Returns:
+            int: Number of better scores, at most top_k + 1
+        """
+        operator = ">=" if inclusive else ">"
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM scores WHERE score {operator} ? LIMIT ?)",
+                (score, self.top_k + 1 + inclusive)).fetchone()
+        return row[0] - inclusive
+    
+    def get_rank(self, score: int) -> int:
+        """
+        Get rank for a score.
+        
+        Args:
+            score: Score to get rank for
+            
+        Returns:
+            int: Rank (1-top_k) or 0 if not in the top scores
+        """
+        rank = self._count_better(score) + 1
+        return rank if rank <= self.top_k else 0
+    
+    def get_top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the best scores.
+        
+        Args:
+            limit: Number of scores (defaults to top_k)
             
-            for i, score in enumerate(self.scores):
-                print(f"{i+1:2d}.   {score['name']:<20s}  {score['score']:<8d}  {score['health']:<6d}  {score['fame']:<6d}")
+        Returns:
+            List of score entries, best first
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name, score, health, fame FROM scores ORDER BY score DESC, id LIMIT ?",
+                (limit or self.top_k,))
+            return [dict(row) for row in rows]
+    
+    def import_json(self, json_file: str) -> int:
+        """
+        Import scores from a JSON scores file.
         
-        print("\n" + "=" * 80)
-        input("\n按回车键继续...")
+        Args:
+            json_file: Path to the JSON file
+            
+        Returns:
+            int: Number of scores imported
+        """
+        with open(json_file, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (name, score, health, fame, created) VALUES (?, ?, ?, ?, ?)",
+                [(s["name"], s["score"], s["health"], s["fame"], now) for s in entries])
+        return len(entries)
+    
+    def export_json(self, json_file: str, limit: Optional[int] = None) -> int:
+        """
+        Export the best scores to a JSON scores file.
+        
+        Args:
+            json_file: Path to the JSON file
+            limit: Number of scores (defaults to top_k)
+            
+        Returns:
+            int: Number of scores exported
+        """
+        entries = self.get_top(limit)
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        return len(entries)
+
+
+def open_high_scores(scores_file: str = "scores.json", top_k: int = TOP_SCORES) -> HighScores:
+    """
+    Open a high score list, stored in SQLite for .db files and in JSON otherwise.
+    
+    Args:
+        scores_file: Path to the scores file
+        top_k: Number of scores on the high score list
+        
+    Returns:
+        HighScores object
+    """
+    if scores_file.endswith(".db"):
+        return SqliteHighScores(scores_file, top_k)
+    return HighScores(scores_file, top_k)
@@ -16,6 +16,25 @@ class Hospital:
         """Initialize the hospital."""
         self.treatment_cost_per_point = 3500  # Cost per health point
     
+    def heal(self, player, points: int) -> bool:
+        """
+        Restore the player's health for a fee.
+        
+        Args:
+            player: Player object
+            points: Health points to restore
+            
+        Returns:
+            bool: True if the treatment was made, False otherwise
+        """
+        cost = points * self.treatment_cost_per_point
+        if points <= 0 or player.health + points > 100 or player.cash < cost:
+            return False
+        
+        player.cash -= cost
+        player.health += points
+        return True
+    
     def visit(self, player, ui) -> None:
         """
         Handle player's visit to the hospital.
@@ -41,19 +60,19 @@ class Hospital:
         
         # Show treatment options
         ui.clear_screen()
-        print(f"你的健康值: {player.health}/100")
-        print(f"你的现金: {player.cash}元")
-        print(f"治疗费用: {self.treatment_cost_per_point}元/点")
-        print("\n治疗选项:")
+        ui.write(f"你的健康值: {player.health}/100")
+        ui.write(f"你的现金: {player.cash}元")
+        ui.write(f"治疗费用: {self.treatment_cost_per_point}元/点")
+        ui.write("\n治疗选项:")
         
         options = []
         for i in range(1, min(max_treatment, max_affordable) + 1):
             if i % 5 == 0 or i == min(max_treatment, max_affordable):
                 cost = i * self.treatment_cost_per_point
                 options.append((i, cost))
-                print(f"  {len(options)}. 恢复 {i} 点健康值 - 费用: {cost}元")
+                ui.write(f"  {len(options)}. 恢复 {i} 点健康值 - 费用: {cost}元")
         
-        print("  0. 离开")
+        ui.write("  0. 离开")
         
         choice = ui.get_input("请选择治疗方案: ", input_type=int, default=0, min_value=0, max_value=len(options))
         
@@ -66,7 +85,7 @@ class Hospital:
         if not ui.ask_yes_no(f"确定要花费 {cost} 元恢复 {health_points} 点健康值吗?"):
             return
         
-        player.cash -= cost
-        player.health += health_points
+        if not self.heal(player, health_points):
+            return
         
         ui.show_message(f"治疗完成！你的健康值现在是 {player.health}/100")
@@ -18,6 +18,42 @@ class HouseAgency:
         self.upgrade_amount = 10  # Amount of capacity increase per upgrade
         self.max_capacity = 140  # Maximum inventory capacity
     
+    def get_upgrade_cost(self, player) -> Optional[int]:
+        """
+        Get the cost of upgrading the player's house.
+        
+        Args:
+            player: Player object
+            
+        Returns:
+            Cost of the upgrade, or None if the player can't upgrade
+        """
+        if player.inventory_capacity >= self.max_capacity or player.cash < self.upgrade_cost:
+            return None
+        
+        # If player is rich, charge more
+        if player.cash > self.upgrade_cost * 2:
+            return player.cash // 2
+        return self.upgrade_cost
+    
+    def expand(self, player) -> bool:
+        """
+        Upgrade the player's house to increase inventory capacity.
+        
+        Args:
+            player: Player object
+            
+        Returns:
+            bool: True if the upgrade was made, False otherwise
+        """
+        cost = self.get_upgrade_cost(player)
+        if cost is None:
+            return False
+        
+        player.cash -= cost
+        player.inventory_capacity += self.upgrade_amount
+        return True
+    
     def visit(self, player, ui) -> None:
         """
         Handle player's visit to the house agency.
@@ -38,15 +74,13 @@ class HouseAgency:
             return
         
         # Calculate upgrade cost based on player's wealth
-        actual_cost = self.upgrade_cost
-        if player.cash > self.upgrade_cost * 2:
-            actual_cost = player.cash // 2  # If player is rich, charge more
+        actual_cost = self.get_upgrade_cost(player)
         
         if not ui.ask_yes_no(f"中介说：我们可以将你的存储容量从 {player.inventory_capacity} 增加到 {player.inventory_capacity + self.upgrade_amount}，费用是 {actual_cost} 元。你要升级吗?"):
             return
         
         # Apply upgrade
-        player.cash -= actual_cost
-        player.inventory_capacity += self.upgrade_amount
+        if not self.expand(player):
+            return
         
         ui.show_message(f"升级完成！你的存储容量现在是 {player.inventory_capacity}")
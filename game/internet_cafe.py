@@ -5,16 +5,25 @@ Internet Cafe module for Beijing Life Story game.
 Handles internet cafe activities.
 """
 
+import copy
 import random
 from typing import Dict, List, Optional, Tuple, Any
 
+from .rng import copy_stream
+
 class InternetCafe:
     """
     InternetCafe class to handle internet cafe activities.
     """
     
-    def __init__(self):
-        """Initialize the internet cafe."""
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize the internet cafe.
+        
+        Args:
+            rng: Random stream for tips, news and rewards (optional)
+        """
+        self.rng = rng if rng is not None else random.Random()
         self.entry_fee = 15  # Cost to enter the internet cafe
         self.max_visits = 3  # Maximum number of visits allowed
         
@@ -56,6 +65,17 @@ class InternetCafe:
             "城市之间的交通管制加强，切换城市可能会变得更加困难。"
         ]
     
+    def copy(self) -> "InternetCafe":
+        """
+        Copy the internet cafe. The copy shares the tips and news and gets its own random stream.
+        
+        Returns:
+            InternetCafe: Independent copy
+        """
+        clone = copy.copy(self)
+        clone.rng = copy_stream(self.rng)
+        return clone
+    
     def visit(self, player, ui) -> None:
         """
         Handle player's visit to the internet cafe.
@@ -82,11 +102,11 @@ class InternetCafe:
         # Show internet cafe menu
         while True:
             ui.clear_screen()
-            print("网吧菜单:")
-            print("  1. 浏览游戏攻略")
-            print("  2. 查看最新新闻")
-            print("  3. 黑客行为")
-            print("  0. 离开")
+            ui.write("网吧菜单:")
+            ui.write("  1. 浏览游戏攻略")
+            ui.write("  2. 查看最新新闻")
+            ui.write("  3. 黑客行为")
+            ui.write("  0. 离开")
             
             choice = ui.get_input("请选择: ", input_type=int, default=0, min_value=0, max_value=3)
             
@@ -100,7 +120,7 @@ class InternetCafe:
                 self._hacker_actions(player, ui)
         
         # Give small reward for visiting
-        reward = random.randint(1, 10)
+        reward = self.rng.randint(1, 10)
         player.cash += reward
         ui.show_message(f"感谢光临！老板给了你 {reward} 元小费。")
     
@@ -113,18 +133,18 @@ class InternetCafe:
             ui: UI object for user interaction
         """
         ui.clear_screen()
-        print("游戏攻略:")
+        ui.write("游戏攻略:")
         
         # Show 3 random tips
         shown_tips = []
         for _ in range(3):
-            tip = random.choice(self.tips)
+            tip = self.rng.choice(self.tips)
             while tip in shown_tips:
-                tip = random.choice(self.tips)
+                tip = self.rng.choice(self.tips)
             shown_tips.append(tip)
-            print(f"- {tip}")
+            ui.write(f"- {tip}")
         
-        input("\n按回车键继续...")
+        ui.pause()
     
     def _show_news(self, player, ui) -> None:
         """
@@ -135,18 +155,18 @@ class InternetCafe:
             ui: UI object for user interaction
         """
         ui.clear_screen()
-        print("最新新闻:")
+        ui.write("最新新闻:")
         
         # Show 2 random news
         shown_news = []
         for _ in range(2):
-            news = random.choice(self.news)
+            news = self.rng.choice(self.news)
             while news in shown_news:
-                news = random.choice(self.news)
+                news = self.rng.choice(self.news)
             shown_news.append(news)
-            print(f"- {news}")
+            ui.write(f"- {news}")
         
-        input("\n按回车键继续...")
+        ui.pause()
     
     def _hacker_actions(self, player, ui) -> None:
         """
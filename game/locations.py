@@ -6,7 +6,6 @@ Handles locations in Beijing and Shanghai.
 """
 
 from typing import Dict, List, Optional, Tuple
-import questionary
 
 class Location:
     """
@@ -107,41 +106,56 @@ class LocationManager:
         location = self.get_location(location_id, city)
         return location.name if location else ""
     
-    def switch_city(self, player, ui) -> None:
+    def move_to_city(self, player, city: str) -> bool:
         """
-        Handle switching cities.
+        Move the player to another city, which costs one day.
+        
+        Args:
+            player: Player object
+            city: City to move to (BEIJING or SHANGHAI)
+            
+        Returns:
+            bool: True if the player moved, False otherwise
+        """
+        if city == player.city or not self.get_locations(city):
+            return False
+        
+        player.city = city
+        player.current_location = 1  # Reset to first location in new city
+        player.days_left -= 1
+        return True
+    
+    def choose_city(self, player, ui) -> Optional[str]:
+        """
+        Let the player choose another city to move to, and confirm it.
         
         Args:
             player: Player object
             ui: UI object for user interaction
+            
+        Returns:
+            The city to move to (BEIJING or SHANGHAI), or None if cancelled
         """
         ui.clear_screen()
         
         # Create choices for the city menu
         choices = [
-            questionary.Choice(title='1. 北京', value='BEIJING'),
-            questionary.Choice(title='2. 上海', value='SHANGHAI'),
-            questionary.Separator(),
-            questionary.Choice(title='0. 取消', value=None)
+            ui.choice(title='1. 北京', value='BEIJING'),
+            ui.choice(title='2. 上海', value='SHANGHAI'),
+            ui.separator(),
+            ui.choice(title='0. 取消', value=None)
         ]
         
         # Ask player which city to switch to
-        city_choice = questionary.select(
+        city_choice = ui.custom_select(
             '选择要前往的城市:',
-            choices=choices,
-            style=ui.style
-        ).ask()
+            choices=choices
+        )
         
         if not city_choice or city_choice == player.city:
-            return
+            return None
         
         # Confirm switch
         if not ui.ask_yes_no(f"确定要前往{'北京' if city_choice == 'BEIJING' else '上海'}吗? 这将消耗一天时间。"):
-            return
-        
-        # Process switch
-        player.city = city_choice
-        player.current_location = 1  # Reset to first location in new city
-        player.days_left -= 1
-        
-        ui.show_message(f"你来到了{'北京' if city_choice == 'BEIJING' else '上海'}。")
+            return None
+        return city_choice
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log format module for Beijing Life Story game.
+Encodes game log records as text, JSON lines or compact binary frames, and reads them back.
+"""
+
+import ast
+import datetime
+import gzip
+import io
+import json
+import logging
+import struct
+from typing import Any, Dict, IO, Iterator, Optional, Tuple
+
+# Fields of each record type, in encoding order, with their kind:
+# "int" for integers, "str" for optional strings, "json" for anything else
+RECORD_SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "GAME_START": (
+        ("player_name", "str"),
+    ),
+    "TRAVEL": (
+        ("player_name", "str"),
+        ("from_location", "str"),
+        ("to_location", "str"),
+        ("days_left", "int")
+    ),
+    "BUY": (
+        ("player_name", "str"),
+        ("goods_id", "int"),
+        ("goods_name", "str"),
+        ("quantity", "int"),
+        ("price", "int"),
+        ("total_cost", "int"),
+        ("cash_after", "int")
+    ),
+    "SELL": (
+        ("player_name", "str"),
+        ("goods_id", "int"),
+        ("goods_name", "str"),
+        ("quantity", "int"),
+        ("price", "int"),
+        ("buy_price", "int"),
+        ("profit", "int"),
+        ("total_revenue", "int"),
+        ("cash_after", "int")
+    ),
+    "BANK_TRANSACTION": (
+        ("player_name", "str"),
+        ("transaction_type", "str"),
+        ("amount", "int"),
+        ("cash_after", "int"),
+        ("bank_savings_after", "int"),
+        ("debt_after", "int")
+    ),
+    "RANDOM_EVENT": (
+        ("event_name", "str"),
+        ("event_description", "str"),
+        ("effects", "json")
+    ),
+    "PLAYER_STATUS": (
+        ("name", "str"),
+        ("cash", "int"),
+        ("bank_savings", "int"),
+        ("debt", "int"),
+        ("health", "int"),
+        ("fame", "int"),
+        ("days_left", "int"),
+        ("city", "str"),
+        ("current_location", "int"),
+        ("inventory_used", "int"),
+        ("inventory_capacity", "int"),
+        ("inventory", "json")
+    ),
+    "GAME_END": (
+        ("player_name", "str"),
+        ("reason", "str"),
+        ("days_played", "int"),
+        ("final_cash", "int"),
+        ("final_bank_savings", "int"),
+        ("final_debt", "int"),
+        ("final_health", "int"),
+        ("final_fame", "int"),
+        ("final_score", "int")
+    ),
+    "LOG_DROPPED": (
+        ("count", "int"),
+    )
+}
+
+# Binary type codes: 0 is a record without a schema, then the schemas in order
+RECORD_TYPES: Tuple[str, ...] = ("",) + tuple(RECORD_SCHEMAS)
+RECORD_CODES: Dict[str, int] = {event_type: code for code, event_type in enumerate(RECORD_TYPES)}
+
+# Magic bytes starting a binary log file (the last byte is the format version)
+BINARY_MAGIC = b"BJFSLOG\x01"
+
+# Format names, and the log file extension of each
+LOG_FORMATS = {
+    "text": ".log",
+    "jsonl": ".jsonl",
+    "binary": ".bin"
+}
+
+
+def is_log_name(name: str) -> bool:
+    """
+    Check whether a file name is a game log, compressed or not.
+    
+    Args:
+        name: File name
+        
+    Returns:
+        bool: True if the name has a log extension of LOG_FORMATS, maybe followed by .gz
+    """
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return name.endswith(tuple(LOG_FORMATS.values()))
+
+# Frame length prefix, and length of a string field (-1 for None)
+_FRAME_LENGTH = struct.Struct("<I")
+_STRING_LENGTH = struct.Struct("<i")
+
+class _BinarySchema:
+    """
+    Compiled binary layout of a record type: the type code, the time
+    and all integer fields in one struct, then the length-prefixed
+    UTF-8 string and JSON fields.
+    """
+    
+    def __init__(self, event_type: str, fields: Tuple[Tuple[str, str], ...]):
+        """
+        Compile the layout of a record type.
+        
+        Args:
+            event_type: Record type
+            fields: Fields of the record type from RECORD_SCHEMAS
+        """
+        self.event_type = event_type
+        self.code = RECORD_CODES[event_type]
+        self.field_names = [name for name, _ in fields]
+        self.int_fields = [name for name, kind in fields if kind == "int"]
+        self.var_fields = [(name, kind) for name, kind in fields if kind != "int"]
+        self.head = struct.Struct(f"<Bd{len(self.int_fields)}q")
+
+
+_BINARY_SCHEMAS: Dict[str, _BinarySchema] = {
+    event_type: _BinarySchema(event_type, fields) for event_type, fields in RECORD_SCHEMAS.items()
+}
+_BINARY_SCHEMAS_BY_CODE: Dict[int, _BinarySchema] = {
+    schema.code: schema for schema in _BINARY_SCHEMAS.values()
+}
+
+# Layout of a record without a schema: type name and data, both as variable fields
+_GENERIC_HEAD = struct.Struct("<Bd")
+
+
+def _encode_var(value: Any, kind: str) -> bytes:
+    """
+    Encode a string or JSON field as a length-prefixed UTF-8 string.
+    
+    Args:
+        value: Field value
+        kind: "str" or "json"
+        
+    Returns:
+        bytes: Encoded field
+    """
+    if value is None:
+        return _STRING_LENGTH.pack(-1)
+    if kind == "json":
+        value = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    data = value.encode("utf-8")
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def _decode_var(payload: bytes, offset: int, kind: str) -> Tuple[Any, int]:
+    """
+    Decode a string or JSON field.
+    
+    Args:
+        payload: Frame payload
+        offset: Offset of the field in the payload
+        kind: "str" or "json"
+        
+    Returns:
+        Tuple of (value, offset after the field)
+    """
+    length = _STRING_LENGTH.unpack_from(payload, offset)[0]
+    offset += _STRING_LENGTH.size
+    if length < 0:
+        return None, offset
+    
+    value = payload[offset:offset + length].decode("utf-8")
+    if kind == "json":
+        value = json.loads(value)
+    return value, offset + length
+
+
+def _event(record: logging.LogRecord) -> Tuple[str, Dict[str, Any]]:
+    """
+    Get the event type and data of a log record made by GameLogger.log_event.
+    
+    Args:
+        record: Log record
+        
+    Returns:
+        Tuple of (event type, data)
+    """
+    if isinstance(record.args, tuple) and len(record.args) == 2:
+        return record.args
+    return "MESSAGE", {"message": record.getMessage()}
+
+
+class TextEncoder:
+    """
+    TextEncoder class writing records as human-readable lines (the original log format).
+    """
+    
+    header = b""
+    
+    def __init__(self):
+        """Initialize the encoder."""
+        self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    
+    def encode(self, record: logging.LogRecord) -> bytes:
+        """
+        Encode a record.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            bytes: Encoded record
+        """
+        return (self.formatter.format(record) + "\n").encode("utf-8")
+
+
+class JsonlEncoder:
+    """
+    JsonlEncoder class writing records as JSON lines: {"time": ..., "type": ..., fields...}.
+    """
+    
+    header = b""
+    
+    def encode(self, record: logging.LogRecord) -> bytes:
+        """
+        Encode a record.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            bytes: Encoded record
+        """
+        event_type, data = _event(record)
+        line = {"time": record.created, "type": event_type}
+        line.update(data)
+        return (json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class BinaryEncoder:
+    """
+    BinaryEncoder class writing records as length-prefixed binary frames.
+    Records with a schema store their fields without names: integers packed
+    together, strings and JSON values length-prefixed.
+    """
+    
+    header = BINARY_MAGIC
+    
+    def encode(self, record: logging.LogRecord) -> bytes:
+        """
+        Encode a record.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            bytes: Encoded frame
+        """
+        event_type, data = _event(record)
+        schema = _BINARY_SCHEMAS.get(event_type)
+        try:
+            parts = [schema.head.pack(schema.code, record.created, *[data[name] for name in schema.int_fields])]
+            parts.extend(_encode_var(data[name], kind) for name, kind in schema.var_fields)
+        except (AttributeError, KeyError, struct.error):
+            # No schema, or data not matching it: store the type name and the data
+            parts = [_GENERIC_HEAD.pack(0, record.created),
+                     _encode_var(event_type, "str"),
+                     _encode_var(data, "json")]
+        
+        payload = b"".join(parts)
+        return _FRAME_LENGTH.pack(len(payload)) + payload
+
+
+# Encoder class of each format
+ENCODERS = {
+    "text": TextEncoder,
+    "jsonl": JsonlEncoder,
+    "binary": BinaryEncoder
+}
+
+
+def decode_frame(payload: bytes) -> Dict[str, Any]:
+    """
+    Decode the payload of a binary frame.
+    
+    Args:
+        payload: Frame payload, without the length prefix
+        
+    Returns:
+        Dict of the record: time, type and fields
+    """
+    code = payload[0]
+    if code == 0:
+        _, created = _GENERIC_HEAD.unpack_from(payload)
+        event_type, offset = _decode_var(payload, _GENERIC_HEAD.size, "str")
+        data, _ = _decode_var(payload, offset, "json")
+        record = {"time": created, "type": event_type}
+        record.update(data)
+        return record
+    
+    schema = _BINARY_SCHEMAS_BY_CODE[code]
+    values = schema.head.unpack_from(payload)
+    fields = dict(zip(schema.int_fields, values[2:]))
+    
+    offset = schema.head.size
+    for name, kind in schema.var_fields:
+        fields[name], offset = _decode_var(payload, offset, kind)
+    
+    # Fields in schema order, like the other formats
+    record = {"time": values[1], "type": schema.event_type}
+    record.update((name, fields[name]) for name in schema.field_names)
+    return record
+
+
+def _untuple(value: Any) -> Any:
+    """
+    Turn the tuples of a literal into lists, as JSON decoding gives them.
+    
+    Args:
+        value: Value decoded from a text log
+        
+    Returns:
+        The value with lists instead of tuples
+    """
+    if isinstance(value, (tuple, list)):
+        return [_untuple(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _untuple(item) for key, item in value.items()}
+    return value
+
+
+def parse_text_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a line of a text log: "<time> - <level> - <TYPE>: <repr of the data dict>".
+    
+    Args:
+        line: Log line
+        
+    Returns:
+        Dict of the record: time, type and fields, or None if the line isn't a record
+    """
+    try:
+        asctime, _, message = line.rstrip("\n").split(" - ", 2)
+        event_type, _, data = message.partition(": ")
+        fields = ast.literal_eval(data) if data else {}
+        created = datetime.datetime.strptime(asctime, "%Y-%m-%d %H:%M:%S,%f").timestamp()
+    except (ValueError, SyntaxError):
+        return None
+    
+    # Inventory items are logged as tuples; decode them as lists, like the other formats
+    record = {"time": created, "type": event_type}
+    if isinstance(fields, dict):
+        record.update(_untuple(fields))
+    return record
+
+
+def open_log(log_file: str) -> IO[bytes]:
+    """
+    Open a log file for reading, gzip compressed or not.
+    
+    Args:
+        log_file: Path of the log file
+        
+    Returns:
+        Binary file object
+    """
+    if log_file.endswith(".gz"):
+        return gzip.open(log_file, "rb")
+    return open(log_file, "rb")
+
+
+def read_records(log_file: str, bulk: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a log file in any format.
+    The format is detected from the content, and only one record is held in memory at a time.
+    
+    Args:
+        log_file: Path of the log file (.gz files are decompressed)
+        bulk: Read the whole file with one read first (faster for small files, such as game logs)
+        
+    Returns:
+        Iterator of record dicts with "time", "type" and the record fields
+    """
+    with open_log(log_file) as f:
+        if bulk:
+            f = io.BytesIO(f.read())
+        
+        start = f.read(len(BINARY_MAGIC))
+        if start == BINARY_MAGIC:
+            while True:
+                prefix = f.read(_FRAME_LENGTH.size)
+                if len(prefix) < _FRAME_LENGTH.size:
+                    return
+                length = _FRAME_LENGTH.unpack(prefix)[0]
+                payload = f.read(length)
+                if len(payload) < length:
+                    return  # Truncated last frame of an unfinished log
+                yield decode_frame(payload)
+        
+        first_line = start + f.readline()
+        is_jsonl = first_line.lstrip().startswith(b"{")
+        for line in _chain_lines(first_line, f):
+            if not line.strip():
+                continue
+            text = line.decode("utf-8")
+            if is_jsonl:
+                try:
+                    yield json.loads(text)
+                except ValueError:
+                    continue  # Truncated last line of an unfinished log
+            else:
+                record = parse_text_line(text)
+                if record is not None:
+                    yield record
+
+
+def _chain_lines(first_line: bytes, f: IO[bytes]) -> Iterator[bytes]:
+    """
+    Iterate over the lines of a file whose first line was already read.
+    
+    Args:
+        first_line: First line of the file
+        f: File object positioned after the first line
+        
+    Returns:
+        Iterator of lines
+    """
+    yield first_line
+    yield from f
@@ -6,43 +6,362 @@ Handles logging game events to a file.
 """
 
 import os
+import atexit
 import logging
 import datetime
-from typing import Dict, Any, Optional
+import gzip
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, NamedTuple, Optional
+
+from .logformat import ENCODERS, LOG_FORMATS, TextEncoder, is_log_name
+
+# Maximum number of records waiting to be written, across all game loggers
+LOG_QUEUE_SIZE = 10000
+
+# Maximum number of records written between two flushes
+LOG_BATCH_SIZE = 256
+
+# What to do with a record when the queue is full: "block" until there is room, or "drop" it
+LOG_POLICIES = ("block", "drop")
+
+class LogRotation(NamedTuple):
+    """
+    When to rotate log files, and what to do with finished ones.
+    """
+    max_bytes: int = 0  # Rotate a log file when it would grow past this size (0: never)
+    max_age: float = 0  # Rotate a log file open for longer than this many seconds (0: never)
+    compress: bool = True  # Gzip finished log files in the background
+    max_files: int = 0  # Keep at most this many finished log files, deleting the oldest (0: no limit)
+
+
+class LogWriter(threading.Thread):
+    """
+    LogWriter class writing log records to their files in a background thread.
+    One writer serves every game logger of the process, so the game never waits
+    on disk I/O. Records are formatted by the writer, and each file is flushed
+    once per batch of records rather than once per record.
+    """
+    
+    def __init__(self, queue_size: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE):
+        """
+        Initialize the writer.
+        
+        Args:
+            queue_size: Maximum number of records waiting to be written
+            batch_size: Maximum number of records written between two flushes
+        """
+        super().__init__(name="GameLogWriter", daemon=True)
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+    
+    def run(self) -> None:
+        """Write records until stopped."""
+        while True:
+            # Wait for a record, then take whatever else is already queued
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            written = []
+            for handler, record in batch:
+                if handler is None:
+                    stop = True
+                elif record is None:
+                    handler.close_stream()
+                else:
+                    handler.write_record(record)
+                    written.append(handler)
+            
+            for handler in set(written):
+                handler.flush_stream()
+            
+            for _ in batch:
+                self.queue.task_done()
+            
+            if stop:
+                return
+    
+    def stop(self) -> None:
+        """Write all queued records, then stop the thread."""
+        if self.is_alive():
+            self.queue.put((None, None))
+            self.join()
+
+
+# Writer shared by all game loggers, started on first use
+_writer: Optional[LogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> LogWriter:
+    """
+    Get the log writer of the process, starting it if needed.
+    
+    Returns:
+        LogWriter: The running writer
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = LogWriter()
+            _writer.start()
+            atexit.register(_writer.stop)
+        return _writer
+
+
+# Thread compressing finished log files, started on first use
+_compressor: Optional[ThreadPoolExecutor] = None
+
+
+def compress_log(log_file: str) -> str:
+    """
+    Gzip a log file, replacing it with log_file + ".gz".
+    
+    Args:
+        log_file: Path of the finished log file
+        
+    Returns:
+        str: Path of the compressed file
+    """
+    compressed_file = log_file + ".gz"
+    with open(log_file, "rb") as f_in, gzip.open(compressed_file + ".tmp", "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.replace(compressed_file + ".tmp", compressed_file)
+    os.remove(log_file)
+    return compressed_file
+
+
+def enforce_retention(log_dir: str, max_files: int) -> None:
+    """
+    Delete the oldest log files of a directory, keeping at most max_files.
+    Every log file counts, compressed or not, so the cap holds without
+    compression too. Logs still being written are the most recently
+    modified ones, so the oldest finished logs go first.
+    
+    Args:
+        log_dir: Log directory
+        max_files: Maximum number of log files to keep
+    """
+    with os.scandir(log_dir) as entries:
+        finished = [(entry.stat().st_mtime, entry.path) for entry in entries
+                    if entry.is_file() and is_log_name(entry.name)]
+    
+    if len(finished) > max_files:
+        finished.sort()
+        for _, path in finished[:len(finished) - max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already deleted by another process
+
+
+def finish_log(log_file: str, rotation: LogRotation) -> None:
+    """
+    Compress a finished log file and apply the retention cap to its directory.
+    
+    Args:
+        log_file: Path of the finished log file
+        rotation: Rotation settings
+    """
+    try:
+        if rotation.compress:
+            compress_log(log_file)
+        if rotation.max_files:
+            enforce_retention(os.path.dirname(log_file) or ".", rotation.max_files)
+    except OSError as e:
+        logging.getLogger(__name__).warning("Could not finish log file %s: %s", log_file, e)
+
+
+def finish_log_in_background(log_file: str, rotation: LogRotation) -> None:
+    """
+    Finish a log file in the compressor thread, or right away while the interpreter exits.
+    
+    Args:
+        log_file: Path of the finished log file
+        rotation: Rotation settings
+    """
+    global _compressor
+    if not rotation.compress and not rotation.max_files:
+        return
+    
+    with _writer_lock:
+        if _compressor is None:
+            _compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="GameLogCompressor")
+    
+    try:
+        _compressor.submit(finish_log, log_file, rotation)
+    except RuntimeError:
+        # No new threads during interpreter shutdown
+        finish_log(log_file, rotation)
+
+
+class QueuedFileHandler(logging.Handler):
+    """
+    QueuedFileHandler class passing log records to the LogWriter, which writes them to a file.
+    Records are formatted by the writer thread, not when they are logged.
+    """
+    
+    def __init__(self, filename: str, policy: str = "block", encoder: Optional[Any] = None,
+                 rotation: Optional[LogRotation] = None):
+        """
+        Initialize the handler.
+        
+        Args:
+            filename: Path of the log file
+            policy: "block" to wait when the queue is full, "drop" to drop the record
+            encoder: Record encoder from the logformat module (defaults to text lines)
+            rotation: Rotation settings (defaults to LogRotation())
+        """
+        if policy not in LOG_POLICIES:
+            raise ValueError(f"Unknown log policy: {policy}")
+        
+        super().__init__()
+        self.filename = filename
+        self.policy = policy
+        self.encoder = encoder or TextEncoder()
+        self.rotation = rotation or LogRotation()
+        self.writer = get_writer()
+        self.stream = None  # Opened by the writer on the first record
+        self.opened_at = 0.0
+        self.parts = 0  # Number of rotated parts of the log file
+        self.dropped = 0
+        self.closed = threading.Event()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Queue a record for the writer.
+        
+        Args:
+            record: Log record
+        """
+        if self.policy == "drop":
+            try:
+                self.writer.queue.put_nowait((self, record))
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.writer.queue.put((self, record))
+    
+    def write_record(self, record: logging.LogRecord) -> None:
+        """
+        Format and write a record (called by the writer thread).
+        
+        Args:
+            record: Log record
+        """
+        try:
+            data = self.encoder.encode(record)
+            if self.stream is not None and self.should_rotate(len(data)):
+                self.rotate()
+            if self.stream is None:
+                self.stream = open(self.filename, "ab")
+                self.opened_at = time.time()
+                if self.stream.tell() == 0:
+                    self.stream.write(self.encoder.header)
+            self.stream.write(data)
+        except Exception:
+            self.handleError(record)
+    
+    def should_rotate(self, size: int) -> bool:
+        """
+        Check whether the log file must be rotated before writing more data.
+        
+        Args:
+            size: Size of the data to write
+            
+        Returns:
+            bool: True if the file is too big or too old
+        """
+        rotation = self.rotation
+        if rotation.max_bytes and self.stream.tell() + size > rotation.max_bytes:
+            return True
+        return bool(rotation.max_age) and time.time() - self.opened_at > rotation.max_age
+    
+    def rotate(self) -> None:
+        """Close the log file, rename it to its next part number and finish it in the background."""
+        self.stream.close()
+        self.stream = None
+        
+        self.parts += 1
+        base, ext = os.path.splitext(self.filename)
+        part_file = f"{base}.{self.parts}{ext}"
+        os.replace(self.filename, part_file)
+        finish_log_in_background(part_file, self.rotation)
+    
+    def flush_stream(self) -> None:
+        """Flush the log file (called by the writer thread)."""
+        if self.stream is not None:
+            self.stream.flush()
+    
+    def close_stream(self) -> None:
+        """Close the log file and finish it in the background (called by the writer thread)."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+            finish_log_in_background(self.filename, self.rotation)
+        self.closed.set()
+    
+    def close(self) -> None:
+        """Wait until all records of the handler are written, then close the file."""
+        if not self.closed.is_set():
+            if self.writer.is_alive():
+                self.writer.queue.put((self, None))
+                self.closed.wait()
+            else:
+                self.close_stream()
+        super().close()
+
 
 class GameLogger:
     """
     GameLogger class to handle logging game events.
     """
     
-    def __init__(self, player_name: str = "Unknown"):
+    def __init__(self, player_name: str = "Unknown", level: int = logging.INFO, policy: str = "block",
+                 log_format: str = "text", rotation: Optional[LogRotation] = None):
         """
         Initialize the logger.
         
         Args:
             player_name: Name of the player for the log file name
+            level: Logging level, events below it are not logged
+            policy: What to do when the log queue is full, "block" or "drop"
+            log_format: Log file format, "text", "jsonl" or "binary" (see logformat.LOG_FORMATS)
+            rotation: Rotation, compression and retention of log files (defaults to LogRotation())
         """
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {log_format}")
+        
         # Create logs directory if it doesn't exist
         os.makedirs("logs", exist_ok=True)
         
         # Generate timestamp for log file name
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = f"logs/{timestamp}_{player_name}.log"
-        
-        # Configure logger
-        self.logger = logging.getLogger("beijing_fushengji")
-        self.logger.setLevel(logging.INFO)
+        log_file = f"logs/{timestamp}_{player_name}{LOG_FORMATS[log_format]}"
         
-        # Create file handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
+        # Configure logger; each game gets its own logger, outside the logging registry,
+        # so it only ever has its own handler and is freed with the game
+        self.logger = logging.Logger(f"beijing_fushengji.{player_name}")
+        self.logger.setLevel(level)
+        self.logger.propagate = False
         
-        # Create formatter
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
+        # Create file handler, written by the background log writer
+        self.rotation = rotation or LogRotation()
+        file_handler = QueuedFileHandler(log_file, policy=policy, encoder=ENCODERS[log_format](),
+                                         rotation=self.rotation)
+        file_handler.setLevel(level)
         
         # Add handler to logger
         self.logger.addHandler(file_handler)
+        self.handler = file_handler
         
         # Store the log file path
         self.log_file = log_file
@@ -58,14 +377,23 @@ class GameLogger:
             event_type: Type of event (e.g., "TRAVEL", "BUY", "SELL")
             data: Dictionary of event data
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         if data is None:
             data = {}
         
-        # Format the log message
-        message = f"{event_type}: {data}"
+        # Log the event; the message is formatted later by the log writer
+        self.logger.info("%s: %s", event_type, data)
+    
+    def close(self) -> None:
+        """Write all pending events to the log file and close it."""
+        if self.handler.dropped:
+            self.handler.policy = "block"
+            self.log_event("LOG_DROPPED", {"count": self.handler.dropped})
         
-        # Log the event
-        self.logger.info(message)
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
     
     def log_player_status(self, player) -> None:
         """
@@ -74,6 +402,10 @@ class GameLogger:
         Args:
             player: Player object
         """
+        # Skip building the snapshot when it wouldn't be logged
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         # Extract player data
         player_data = {
             "name": player.name,
@@ -87,7 +419,7 @@ class GameLogger:
             "current_location": player.current_location,
             "inventory_used": player.inventory_used,
             "inventory_capacity": player.inventory_capacity,
-            "inventory": player.inventory
+            "inventory": player.get_inventory()
         }
         
         # Log the player status
@@ -221,5 +553,6 @@ class GameLogger:
         
         self.log_event("GAME_END", end_data)
         
-        # Log the log file path
-        print(f"\n游戏日志已保存到: {self.log_file}")
+        # Log the log file path (compressed once the game is closed)
+        log_file = self.log_file + ".gz" if self.rotation.compress else self.log_file
+        print(f"\n游戏日志已保存到: {log_file}")
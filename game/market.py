@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Market module for Beijing Life Story game.
+Shared city markets where the trades of all players move prices.
+"""
+
+import math
+import random
+from typing import Any, List, Optional
+
+from .goods import GoodsManager
+
+# Net units bought (or sold) in a goods that move its price by a factor of e
+MARKET_DEPTH = 500
+
+# Seconds for the price impact of trades to fade by half
+IMPACT_HALF_LIFE = 60.0
+
+# Largest price impact, as a factor either way
+MAX_IMPACT = 10.0
+
+# Seconds between draws of new base prices (a market day)
+MARKET_DAY = 30.0
+
+class Order:
+    """
+    Order of a player in a shared market, filled at the next match.
+    """
+    
+    __slots__ = ("engine", "goods_id", "quantity", "filled", "price", "error", "waiter")
+    
+    def __init__(self, engine, goods_id: int, quantity: int):
+        """
+        Initialize an order.
+        
+        Args:
+            engine: GameEngine object of the player
+            goods_id: ID of the goods
+            quantity: Quantity to buy, negative to sell
+        """
+        self.engine = engine
+        self.goods_id = goods_id
+        self.quantity = quantity
+        self.filled = 0  # Quantity traded, negative for sales
+        self.price: Optional[int] = None  # Price the order traded at
+        self.error: Optional[Exception] = None  # Error that kept the order from trading
+        self.waiter: Any = None  # Free for the caller, e.g. a future to resolve
+
+
+class SharedMarket:
+    """
+    SharedMarket class holding the prices of one city for all its players.
+    
+    Orders are queued and matched together once per tick: all orders of the
+    tick trade at the same price, then the net quantity they filled of each
+    goods moves its price, so no lock is needed per trade and every player
+    sees the same prices. Base prices are drawn again every market day, and the
+    price impact fades back towards them over time.
+    """
+    
+    def __init__(self, city: str, rng: Optional[random.Random] = None, depth: int = MARKET_DEPTH,
+                 half_life: float = IMPACT_HALF_LIFE, day_length: float = MARKET_DAY):
+        """
+        Initialize the market.
+        
+        Args:
+            city: City of the market (BEIJING or SHANGHAI)
+            rng: Random stream for base prices (optional)
+            depth: Net units traded that move a price by a factor of e
+            half_life: Seconds for the price impact to fade by half
+            day_length: Seconds between draws of new base prices
+        """
+        self.city = city
+        self.depth = depth
+        self.half_life = half_life
+        self.day_length = day_length
+        
+        self.goods_manager = GoodsManager(rng=rng)
+        num_goods = len(self.goods_manager.goods_types)
+        self.impact = [0.0] * num_goods  # Log of the price impact factor of each goods
+        self.prices: List[int] = []
+        self._refresh_prices()
+        
+        self.pending: List[Order] = []
+        self.day_time = 0.0
+        self.trades = 0
+    
+    def _refresh_prices(self) -> None:
+        """Compute the prices from the base prices and the price impact."""
+        limit = math.log(MAX_IMPACT)
+        self.prices = [
+            max(1, int(goods.current_price * math.exp(max(-limit, min(limit, impact)))))
+            for goods, impact in zip(self.goods_manager.goods_types.values(), self.impact)
+        ]
+    
+    def get_price(self, goods_id: int) -> int:
+        """
+        Get the current price of a goods.
+        
+        Args:
+            goods_id: ID of the goods
+            
+        Returns:
+            int: Price of the goods
+        """
+        return self.prices[goods_id]
+    
+    def submit(self, engine, goods_id: int, quantity: int) -> Order:
+        """
+        Queue an order for the next match.
+        
+        Args:
+            engine: GameEngine object of the player
+            goods_id: ID of the goods
+            quantity: Quantity to buy, negative to sell
+            
+        Returns:
+            Order: The queued order
+        """
+        order = Order(engine, goods_id, quantity)
+        self.pending.append(order)
+        return order
+    
+    def match(self, elapsed: float) -> List[Order]:
+        """
+        Match the queued orders: trade them all at the current prices, then
+        move prices by the net quantities filled. Buys are cut to what the
+        player can afford and store, sells to what the player holds, so an
+        order that can't fill doesn't move the price. An order whose trade
+        fails keeps the error, and the other orders still trade.
+        
+        Args:
+            elapsed: Seconds since the last match
+            
+        Returns:
+            List of the matched orders, with their filled quantity and price
+        """
+        orders, self.pending = self.pending, []
+        
+        self.day_time += elapsed
+        if self.day_time >= self.day_length:
+            self.day_time = 0.0
+            for goods in self.goods_manager.goods_types.values():
+                goods.update_price(self.goods_manager.rng)
+        
+        # Fade the old price impact
+        decay = 0.5 ** (elapsed / self.half_life)
+        self.impact = [impact * decay for impact in self.impact]
+        self._refresh_prices()
+        
+        net = [0] * len(self.impact)
+        for order in orders:
+            engine = order.engine
+            price = self.prices[order.goods_id]
+            order.price = price
+            try:
+                if order.quantity > 0:
+                    quantity = min(order.quantity, engine.max_buy(order.goods_id, price))
+                    if quantity > 0:
+                        engine.buy(order.goods_id, quantity, price)
+                        order.filled = quantity
+                else:
+                    quantity = min(-order.quantity, engine.player.get_quantity(order.goods_id))
+                    if quantity > 0 and engine.goods_manager.get_market_price(order.goods_id) is not None:
+                        engine.sell(order.goods_id, quantity, price)
+                        order.filled = -quantity
+            except Exception as e:
+                order.error = e
+                continue
+            if order.filled:
+                net[order.goods_id] += order.filled
+                self.trades += 1
+        
+        # Add the net quantity filled this tick to the price impact
+        if any(net):
+            self.impact = [impact + quantity / self.depth for impact, quantity in zip(self.impact, net)]
+            self._refresh_prices()
+        return orders
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel module for Beijing Life Story game.
+Runs a function over chunks of many items across a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def chunks(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """
+    Split items into lists of at most chunk_size items.
+    
+    Args:
+        items: Items to split
+        chunk_size: Maximum number of items per chunk
+        
+    Returns:
+        Iterator of item lists
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_chunks(function: Callable[..., R], items: Iterable[T], chunk_size: int, workers: int,
+               *args: Any) -> Iterator[R]:
+    """
+    Call a function on chunks of items across a process pool.
+    A few chunks per worker are kept in flight, so workers never wait, while
+    neither the items nor the results pile up in memory. Results are streamed
+    back as chunks finish, so they are not in item order.
+    
+    Args:
+        function: Picklable function called as function(chunk, *args)
+        items: Items to split into chunks
+        chunk_size: Number of items sent to a worker at a time
+        workers: Number of worker processes
+        *args: Extra arguments of the function
+        
+    Returns:
+        Iterator of the function results, one per chunk
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_pending = 4 * workers
+        pending = set()
+        for chunk in chunks(items, chunk_size):
+            pending.add(pool.submit(function, chunk, *args))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -5,7 +5,8 @@ Player module for Beijing Life Story game.
 Handles player stats, inventory, and other attributes.
 """
 
-from typing import Dict, List, Optional
+from array import array
+from typing import Dict, List, Optional, Tuple
 
 class Player:
     """
@@ -13,12 +14,13 @@ class Player:
     Manages player stats, inventory, and other attributes.
     """
     
-    def __init__(self, name: str = "小浮生"):
+    def __init__(self, name: str = "小浮生", num_goods: int = 8):
         """
         Initialize a new player.
         
         Args:
             name: Player's name, defaults to "小浮生"
+            num_goods: Number of goods types, i.e. inventory slots
         """
         # Basic player info
         self.name = name
@@ -31,8 +33,9 @@ class Player:
         self.health = 100  # Initial health
         self.fame = 100  # Initial fame
         
-        # Inventory
-        self.inventory: Dict[int, Dict[str, any]] = {}  # Goods in inventory
+        # Inventory: quantity and average buy price of each goods, indexed by goods ID
+        self.inventory_quantities = array("q", bytes(8 * num_goods))
+        self.inventory_prices = array("q", bytes(8 * num_goods))
         self.inventory_capacity = 100  # Max goods capacity
         self.inventory_used = 0  # Current used capacity
         
@@ -45,6 +48,21 @@ class Player:
         self.sound_enabled = True  # Sound enabled flag
         self.hacker_actions_enabled = False  # Hacker actions enabled flag
     
+    def copy(self) -> "Player":
+        """
+        Copy the player, including its inventory.
+        All other attributes are immutable, so a shallow copy of them is enough.
+        
+        Returns:
+            Player: Independent copy of the player
+        """
+        # Skip __init__ and copy.copy, which cost more than the copy itself
+        clone = Player.__new__(Player)
+        clone.__dict__.update(self.__dict__)
+        clone.inventory_quantities = self.inventory_quantities[:]
+        clone.inventory_prices = self.inventory_prices[:]
+        return clone
+    
     def get_net_worth(self) -> int:
         """
         Calculate player's net worth.
@@ -66,40 +84,63 @@ class Player:
         """
         return self.inventory_used + amount <= self.inventory_capacity
     
-    def add_to_inventory(self, goods_id: int, name: str, quantity: int, price: int) -> bool:
+    def get_quantity(self, goods_id: int) -> int:
+        """
+        Get the quantity of a goods in player's inventory.
+        
+        Args:
+            goods_id: ID of the goods
+            
+        Returns:
+            int: Quantity held, 0 if the player has none
+        """
+        return self.inventory_quantities[goods_id]
+    
+    def get_buy_price(self, goods_id: int) -> int:
+        """
+        Get the average buy price of a goods in player's inventory.
+        
+        Args:
+            goods_id: ID of the goods
+            
+        Returns:
+            int: Average buy price, 0 if the player has none
+        """
+        return self.inventory_prices[goods_id]
+    
+    def get_inventory(self) -> List[Tuple[int, int, int]]:
+        """
+        Get the goods in player's inventory.
+        Names are resolved from GoodsManager.goods_types by goods ID.
+        
+        Returns:
+            List of tuples (goods_id, quantity, price) for goods the player holds
+        """
+        if self.inventory_used == 0:
+            return []
+        return [(goods_id, quantity, self.inventory_prices[goods_id])
+                for goods_id, quantity in enumerate(self.inventory_quantities) if quantity]
+    
+    def add_to_inventory(self, goods_id: int, quantity: int, price: int) -> bool:
         """
         Add goods to player's inventory.
         
         Args:
             goods_id: ID of the goods
-            name: Name of the goods
             quantity: Quantity to add
             price: Price per unit
             
         Returns:
             bool: True if goods were added successfully, False otherwise
         """
-        if not self.has_inventory_space(quantity):
+        if quantity <= 0 or not self.has_inventory_space(quantity):
             return False
         
-        # If goods already in inventory, update quantity and average price
-        if goods_id in self.inventory:
-            old_quantity = self.inventory[goods_id]["quantity"]
-            old_price = self.inventory[goods_id]["price"]
-            
-            # Calculate new average price
-            new_price = int((old_price * old_quantity + price * quantity) / (old_quantity + quantity))
-            
-            # Update inventory
-            self.inventory[goods_id]["quantity"] += quantity
-            self.inventory[goods_id]["price"] = new_price
-        else:
-            # Add new goods to inventory
-            self.inventory[goods_id] = {
-                "name": name,
-                "quantity": quantity,
-                "price": price
-            }
+        # Update quantity and average price, rounded down
+        old_quantity = self.inventory_quantities[goods_id]
+        new_quantity = old_quantity + quantity
+        self.inventory_prices[goods_id] = (self.inventory_prices[goods_id] * old_quantity + price * quantity) // new_quantity
+        self.inventory_quantities[goods_id] = new_quantity
         
         # Update inventory used
         self.inventory_used += quantity
@@ -116,20 +157,32 @@ class Player:
         Returns:
             bool: True if goods were removed successfully, False otherwise
         """
-        if goods_id not in self.inventory or self.inventory[goods_id]["quantity"] < quantity:
+        old_quantity = self.inventory_quantities[goods_id]
+        if old_quantity == 0 or old_quantity < quantity:
             return False
         
         # Update inventory
-        self.inventory[goods_id]["quantity"] -= quantity
+        self.inventory_quantities[goods_id] = old_quantity - quantity
         
-        # If quantity is 0, remove goods from inventory
-        if self.inventory[goods_id]["quantity"] == 0:
-            del self.inventory[goods_id]
+        # If quantity is 0, forget the buy price
+        if old_quantity == quantity:
+            self.inventory_prices[goods_id] = 0
         
         # Update inventory used
         self.inventory_used -= quantity
         return True
     
+    def state_key(self) -> Tuple:
+        """
+        Get a hashable snapshot of the player's state, for comparing and searching states.
+        
+        Returns:
+            Tuple of the player's stats, location and inventory
+        """
+        return (self.cash, self.debt, self.bank_savings, self.health, self.fame, self.days_left,
+                self.city, self.current_location, self.inventory_capacity,
+                self.inventory_quantities.tobytes(), self.inventory_prices.tobytes())
+    
     def switch_city(self):
         """Switch between Beijing and Shanghai."""
         if self.city == "BEIJING":
@@ -43,8 +43,8 @@ class PostOffice:
         
         # Player has debt, show debt repayment options
         ui.clear_screen()
-        print(f"你的债务: {player.debt}元")
-        print(f"你的现金: {player.cash}元")
+        ui.write(f"你的债务: {player.debt}元")
+        ui.write(f"你的现金: {player.cash}元")
         
         if player.cash <= 0:
             ui.show_message("局长拿着看着雪茄，笑着说：你还想还债?你还是先去赚点钱吧！")
@@ -54,12 +54,12 @@ class PostOffice:
         max_repay = min(player.cash, player.debt)
         
         # Show repayment options
-        print("\n还款选项:")
-        print(f"  1. 还清所有债务 ({player.debt}元)")
-        print(f"  2. 还一半债务 ({player.debt // 2}元)")
-        print(f"  3. 还四分之一债务 ({player.debt // 4}元)")
-        print(f"  4. 自定义还款金额 (最多 {max_repay}元)")
-        print("  0. 离开")
+        ui.write("\n还款选项:")
+        ui.write(f"  1. 还清所有债务 ({player.debt}元)")
+        ui.write(f"  2. 还一半债务 ({player.debt // 2}元)")
+        ui.write(f"  3. 还四分之一债务 ({player.debt // 4}元)")
+        ui.write(f"  4. 自定义还款金额 (最多 {max_repay}元)")
+        ui.write("  0. 离开")
         
         choice = ui.get_input("请选择: ", input_type=int, default=0, min_value=0, max_value=4)
         
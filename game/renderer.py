@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Renderer module for Beijing Life Story game.
+Draws screens to the terminal, redrawing only the lines that changed.
+"""
+
+import shutil
+import sys
+from typing import List, Optional, TextIO
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_LINE_END = "\x1b[K"
+CLEAR_SCREEN_END = "\x1b[J"
+
+def move_cursor(row: int) -> str:
+    """
+    Get the ANSI sequence moving the cursor to the start of a row.
+    
+    Args:
+        row: Row number, starting from 0
+        
+    Returns:
+        str: ANSI escape sequence
+    """
+    return f"\x1b[{row + 1};1H"
+
+
+class Renderer:
+    """
+    Renderer class keeping a frame buffer of the screen.
+    
+    Lines are collected into the current frame and written out on flush(),
+    where only the lines that differ from what is already on screen are
+    redrawn, with one write to the terminal per flush. When the output is
+    not a terminal, lines are written as plain text.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize the renderer.
+        
+        Args:
+            stream: Output stream, defaults to sys.stdout
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.is_terminal = hasattr(self.stream, "isatty") and self.stream.isatty()
+        
+        # Lines of the current frame, and lines known to be on screen
+        self.frame: List[str] = []
+        self.screen: List[str] = []
+        
+        # Number of frame lines already written, for plain text output
+        self.written = 0
+        
+        # Rows used below the frame by prompts since the last flush
+        self.prompt_rows = 0
+        
+        # Whether the screen must be cleared and redrawn on the next flush
+        self.needs_redraw = True
+    
+    def new_frame(self) -> None:
+        """Start a new, empty frame (replaces clearing the screen)."""
+        self.frame = []
+        self.written = 0
+    
+    def write(self, text: str = "") -> None:
+        """
+        Add text to the current frame, one frame line per text line.
+        
+        Args:
+            text: Text to add
+        """
+        self.frame.extend(text.split("\n"))
+    
+    def reserve_rows(self, rows: int) -> None:
+        """
+        Record that a prompt is about to use rows below the frame.
+        If the prompt makes the terminal scroll, the next flush redraws everything.
+        
+        Args:
+            rows: Number of rows the prompt uses
+        """
+        self.prompt_rows += rows
+        if len(self.frame) + self.prompt_rows >= shutil.get_terminal_size().lines:
+            self.needs_redraw = True
+    
+    def flush(self) -> None:
+        """Write the changes of the current frame to the output in one go."""
+        if not self.is_terminal:
+            self._flush_plain()
+            return
+        
+        height = shutil.get_terminal_size().lines
+        out = []
+        if self.needs_redraw or len(self.frame) >= height:
+            # Full redraw; a frame taller than the terminal scrolls,
+            # so rows can't be addressed and the screen is drawn top to bottom
+            out.append(CLEAR_SCREEN)
+            out.append("\n".join(line + CLEAR_LINE_END for line in self.frame))
+            out.append("\n")
+            self.needs_redraw = len(self.frame) >= height
+        else:
+            for row, line in enumerate(self.frame):
+                if row >= len(self.screen) or self.screen[row] != line:
+                    out.append(move_cursor(row) + line + CLEAR_LINE_END)
+            
+            # Park the cursor below the frame and wipe leftovers of older frames and prompts
+            out.append(move_cursor(len(self.frame)) + CLEAR_SCREEN_END)
+        
+        self.stream.write("".join(out))
+        self.stream.flush()
+        
+        self.screen = list(self.frame)
+        self.written = len(self.frame)
+        self.prompt_rows = 0
+    
+    def _flush_plain(self) -> None:
+        """Write the frame lines not written yet as plain text."""
+        if self.written < len(self.frame):
+            self.stream.write("\n".join(self.frame[self.written:]) + "\n")
+            self.stream.flush()
+        self.written = len(self.frame)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RNG module for Beijing Life Story game.
+Derives independent, reproducible random streams from a game seed.
+"""
+
+import hashlib
+import os
+import random
+from typing import List, Optional, Tuple
+
+class SeedSequence:
+    """
+    SeedSequence class deriving random streams from a seed.
+    Children spawned from a sequence get their own independent streams,
+    so every game and every manager in a game can have its own RNG.
+    """
+    
+    def __init__(self, entropy: Optional[int] = None, spawn_key: Tuple[int, ...] = ()):
+        """
+        Initialize the seed sequence.
+        
+        Args:
+            entropy: Seed of the sequence, random if not given
+            spawn_key: Position of this sequence in the spawn tree of the root seed
+        """
+        if entropy is None:
+            entropy = int.from_bytes(os.urandom(16), "little")
+        
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+    
+    def spawn(self, n: int) -> List["SeedSequence"]:
+        """
+        Spawn child seed sequences.
+        
+        Args:
+            n: Number of children to spawn
+            
+        Returns:
+            List of new SeedSequence objects
+        """
+        children = [SeedSequence(self.entropy, self.spawn_key + (i,))
+                    for i in range(self.n_children_spawned, self.n_children_spawned + n)]
+        self.n_children_spawned += n
+        return children
+    
+    def generate_state(self) -> int:
+        """
+        Generate the seed of this sequence's random stream.
+        Only depends on the root entropy and the spawn key, never on process state.
+        
+        Returns:
+            int: 256-bit seed
+        """
+        key = f"{self.entropy}:{','.join(str(i) for i in self.spawn_key)}"
+        return int.from_bytes(hashlib.blake2b(key.encode("ascii"), digest_size=32).digest(), "little")
+    
+    def stream(self) -> random.Random:
+        """
+        Create the random stream of this sequence.
+        
+        Returns:
+            random.Random: New random number generator
+        """
+        return random.Random(self.generate_state())
+
+
+def copy_stream(rng: random.Random) -> random.Random:
+    """
+    Copy a random stream, so the copy draws the same numbers from now on.
+    
+    Args:
+        rng: Random stream to copy
+        
+    Returns:
+        random.Random: Independent copy of the stream
+    """
+    # Skip __init__, which would seed the new stream from the OS first
+    clone = random.Random.__new__(type(rng))
+    clone.setstate(rng.getstate())
+    return clone
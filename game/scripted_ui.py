@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scripted UI module for Beijing Life Story game.
+Plays the interactive game from a script of answers instead of the keyboard.
+"""
+
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Union
+
+from .renderer import Renderer
+from .ui import UI
+
+# Answers accepted by ask_yes_no
+YES_ANSWERS = ("y", "yes", "是", "true", "1")
+NO_ANSWERS = ("n", "no", "否", "false", "0")
+
+# Answer that cancels a menu
+CANCEL_ANSWER = "-"
+
+class ScriptError(ValueError):
+    """
+    Raised when a script answer doesn't fit the prompt it was given to.
+    """
+    pass
+
+
+class ScriptChoice(NamedTuple):
+    """
+    Menu choice of a scripted UI.
+    """
+    title: str
+    value: Any
+    disabled: Optional[str]
+
+
+class ScriptedUI(UI):
+    """
+    ScriptedUI class answering prompts from a script.
+    
+    Each prompt takes the next answer of the script:
+    - custom_select: a choice title, a string value, a number counting the
+      selectable choices from 1, or "-" to cancel
+    - get_input: the input text, empty for the default
+    - ask_yes_no: y/yes/是 or n/no/否
+    Pauses return immediately. Screens are still rendered, as plain text,
+    so a script runs exactly the code players run. When the script runs out,
+    the next prompt raises EOFError.
+    """
+    
+    def __init__(self, answers: Iterable[str], output: Optional[TextIO] = None):
+        """
+        Initialize the scripted UI.
+        
+        Args:
+            answers: Answers to the prompts, in order
+            output: Stream the screens are written to (defaults to sys.stdout)
+        """
+        super().__init__()
+        self.answers: Iterator[str] = iter(answers)
+        self.renderer = Renderer(output)
+        self.answers_used = 0
+    
+    @classmethod
+    def from_file(cls, script_file: str, output: Optional[TextIO] = None) -> "ScriptedUI":
+        """
+        Create a scripted UI from a script file, one answer per line.
+        Lines starting with "#" are comments.
+        
+        Args:
+            script_file: Path to the script file
+            output: Stream the screens are written to (defaults to sys.stdout)
+            
+        Returns:
+            ScriptedUI object
+        """
+        with open(script_file, "r", encoding="utf-8") as f:
+            lines = [line.rstrip("\r\n") for line in f]
+        return cls((line for line in lines if not line.startswith("#")), output)
+    
+    def next_answer(self, prompt: str) -> str:
+        """
+        Take the next answer of the script and echo it after its prompt.
+        
+        Args:
+            prompt: Prompt being answered
+            
+        Returns:
+            str: The answer
+        """
+        try:
+            answer = next(self.answers)
+        except StopIteration:
+            raise EOFError(f"Script ended at prompt: {prompt}")
+        
+        self.answers_used += 1
+        self.write(f"{prompt} {answer}")
+        return answer.strip()
+    
+    def pause(self) -> None:
+        """Pauses don't wait for a scripted player."""
+        self.renderer.flush()
+    
+    def choice(self, title: str, value: Any = None, disabled: Optional[str] = None) -> ScriptChoice:
+        """
+        Create a menu choice for custom_select.
+        
+        Args:
+            title: Text of the choice
+            value: Value returned when the choice is selected
+            disabled: Reason the choice can't be selected (optional)
+            
+        Returns:
+            ScriptChoice object
+        """
+        return ScriptChoice(title, value, disabled)
+    
+    def separator(self) -> None:
+        """
+        Create a menu separator for custom_select.
+        
+        Returns:
+            None, separators are skipped
+        """
+        return None
+    
+    def custom_select(self, message, choices, style=None, is_main_menu=False, parent_menu_result=None):
+        """
+        Select a menu choice with the next script answer.
+        
+        Args:
+            message: The message to display
+            choices: List of choices from choice() and separator()
+            style: Unused
+            is_main_menu: Whether this is the main menu
+            parent_menu_result: The result to return when the menu is cancelled
+            
+        Returns:
+            The selected value, or parent_menu_result if cancelled
+        """
+        if is_main_menu:
+            self.menu_level = 0
+            self.parent_menu_result = None
+        
+        selectable: List[ScriptChoice] = [choice for choice in choices
+                                          if choice is not None and not choice.disabled]
+        answer = self.next_answer(message or "选择:")
+        if answer == CANCEL_ANSWER:
+            return parent_menu_result
+        
+        for choice in selectable:
+            if answer == choice.title or (isinstance(choice.value, str) and answer == choice.value):
+                return choice.value
+        
+        if answer.isdigit() and 1 <= int(answer) <= len(selectable):
+            return selectable[int(answer) - 1].value
+        
+        raise ScriptError(f"Script answer {self.answers_used}: no choice {answer!r} in menu "
+                          f"{[choice.title for choice in selectable]}")
+    
+    def get_input(self, prompt: str, input_type: Callable = str, default: Any = None,
+                  min_value: Optional[Union[int, float]] = None,
+                  max_value: Optional[Union[int, float]] = None) -> Any:
+        """
+        Get input from the next script answer, with the same validation as the keyboard.
+        
+        Args:
+            prompt: Prompt to show
+            input_type: Type to convert input to
+            default: Default value if input is empty
+            min_value: Minimum value for numeric input
+            max_value: Maximum value for numeric input
+            
+        Returns:
+            Validated input value
+        """
+        answer = self.next_answer(prompt)
+        if not answer and default is not None:
+            return default
+        
+        try:
+            value = input_type(answer)
+        except ValueError:
+            raise ScriptError(f"Script answer {self.answers_used}: {answer!r} is not a valid {input_type.__name__}")
+        
+        if (min_value is not None and value < min_value) or (max_value is not None and value > max_value):
+            raise ScriptError(f"Script answer {self.answers_used}: {answer!r} is out of range "
+                              f"({min_value}-{max_value})")
+        return value
+    
+    def ask_yes_no(self, prompt: str) -> bool:
+        """
+        Answer a yes/no question with the next script answer.
+        
+        Args:
+            prompt: Question to ask
+            
+        Returns:
+            bool: True if yes, False if no
+        """
+        answer = self.next_answer(prompt).lower()
+        if answer in YES_ANSWERS:
+            return True
+        if answer in NO_ANSWERS:
+            return False
+        raise ScriptError(f"Script answer {self.answers_used}: {answer!r} is not a yes/no answer")
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server module for Beijing Life Story game.
+Hosts many games in one process over a line protocol on TCP.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .engine import ActionError, GameEngine
+from .market import SharedMarket
+
+# Longest line a client may send, in bytes
+MAX_LINE = 1024
+
+# Seconds a session may wait for an answer before it is closed
+IDLE_TIMEOUT = 600
+
+# Answer that cancels a menu
+CANCEL_ANSWER = "-"
+
+# Seconds between matches of the shared market orders
+MARKET_TICK = 0.05
+
+# Cities with a shared market
+CITIES = ("BEIJING", "SHANGHAI")
+
+class GameSession:
+    """
+    GameSession class playing one game with one client.
+    
+    The server sends one JSON message per line. Prompts ask for an answer:
+    - {"type": "select", "prompt": ..., "choices": [{"value": ..., "title": ...}]}:
+      answer the number of a choice, counting from 1, or "-" to cancel
+    - {"type": "number", "prompt": ..., "min": ..., "max": ...}: answer an integer,
+      or "-" to cancel
+    - {"type": "input", "prompt": ...}: answer any text
+    Other messages only inform: "status", "news", "message", "error" and "end".
+    The client answers each prompt with one line of text.
+    
+    With shared markets, goods are traded at the price of the player's city
+    market instead of the game's own prices. Which goods are on sale still
+    depends on the player's location.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 engine: GameEngine, idle_timeout: Optional[float] = IDLE_TIMEOUT,
+                 markets: Optional[Dict[str, SharedMarket]] = None):
+        """
+        Initialize the session.
+        
+        Args:
+            reader: Stream of the client answers
+            writer: Stream of the messages to the client
+            engine: GameEngine object of the session's game
+            idle_timeout: Seconds to wait for an answer (None: forever)
+            markets: Shared market of each city (optional)
+        """
+        self.reader = reader
+        self.writer = writer
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.markets = markets
+    
+    async def send(self, message: Dict[str, Any]) -> None:
+        """
+        Send a message to the client.
+        
+        Args:
+            message: Message with its "type" and fields
+        """
+        self.writer.write((json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+        await self.writer.drain()
+    
+    async def ask(self, message: Dict[str, Any]) -> str:
+        """
+        Send a prompt and wait for the answer.
+        
+        Args:
+            message: Prompt message
+            
+        Returns:
+            str: The answer, stripped
+        """
+        await self.send(message)
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        except ValueError:
+            raise ConnectionError("Answer line too long")
+        if not line:
+            raise ConnectionError("Client closed the connection")
+        return line.decode("utf-8", "replace").strip()
+    
+    async def select(self, prompt: str, choices: List[Tuple[Any, str]]) -> Any:
+        """
+        Let the client select a choice, asking again until the answer is valid.
+        The answer is the number of the choice, counting from 1, never its value.
+        
+        Args:
+            prompt: Prompt to show
+            choices: List of (value, title) tuples
+            
+        Returns:
+            The selected value, or None if cancelled
+        """
+        message = {"type": "select", "prompt": prompt,
+                   "choices": [{"value": value, "title": title} for value, title in choices]}
+        while True:
+            answer = await self.ask(message)
+            if answer == CANCEL_ANSWER:
+                return None
+            if answer.isdigit() and 1 <= int(answer) <= len(choices):
+                return choices[int(answer) - 1][0]
+            await self.send({"type": "error", "message": f"没有这个选项: {answer}"})
+    
+    async def number(self, prompt: str, min_value: int, max_value: int) -> Optional[int]:
+        """
+        Let the client enter an integer, asking again until the answer is valid.
+        
+        Args:
+            prompt: Prompt to show
+            min_value: Minimum value
+            max_value: Maximum value
+            
+        Returns:
+            The number, or None if cancelled
+        """
+        message = {"type": "number", "prompt": prompt, "min": min_value, "max": max_value}
+        while True:
+            answer = await self.ask(message)
+            if answer == CANCEL_ANSWER or not answer:
+                return None
+            try:
+                value = int(answer)
+            except ValueError:
+                value = None
+            if value is not None and min_value <= value <= max_value:
+                return value
+            await self.send({"type": "error", "message": f"请输入{min_value}到{max_value}之间的整数。"})
+    
+    def get_market(self) -> List[Tuple[int, str, int]]:
+        """
+        Get the goods on sale at the player's location, with their trading prices.
+        
+        Returns:
+            List of tuples (goods_id, name, price)
+        """
+        available = self.engine.goods_manager.get_available_goods()
+        if self.markets is None:
+            return available
+        market = self.markets[self.engine.player.city]
+        return [(goods_id, name, market.get_price(goods_id)) for goods_id, name, _ in available]
+    
+    async def trade(self, goods_id: int, quantity: int) -> None:
+        """
+        Trade in the shared market of the player's city, waiting for the next match.
+        
+        Args:
+            goods_id: ID of the goods
+            quantity: Quantity to buy, negative to sell
+        """
+        order = self.markets[self.engine.player.city].submit(self.engine, goods_id, quantity)
+        order.waiter = asyncio.get_running_loop().create_future()
+        try:
+            await order.waiter
+        except Exception:
+            # Logged by the market task
+            raise ActionError("交易失败，请稍后再试。")
+        if not order.filled:
+            raise ActionError("交易没有成交。")
+        await self.send({"type": "message", "message": f"成交{abs(order.filled)}件，价格{order.price}元。"})
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the status message of the game: player, location and market.
+        
+        Returns:
+            Status message
+        """
+        engine = self.engine
+        player = engine.player
+        return {
+            "type": "status",
+            "name": player.name,
+            "days_left": player.days_left,
+            "cash": player.cash,
+            "bank_savings": player.bank_savings,
+            "debt": player.debt,
+            "health": player.health,
+            "fame": player.fame,
+            "city": player.city,
+            "location": engine.location_manager.get_location_name(player.current_location, player.city),
+            "inventory_used": player.inventory_used,
+            "inventory_capacity": player.inventory_capacity,
+            "inventory": [{"goods_id": goods_id, "name": engine.goods_manager.goods_types[goods_id].name,
+                           "quantity": quantity, "buy_price": buy_price}
+                          for goods_id, quantity, buy_price in player.get_inventory()],
+            "market": [{"goods_id": goods_id, "name": name, "price": price}
+                       for goods_id, name, price in self.get_market()]
+        }
+    
+    async def run(self) -> Tuple[str, int]:
+        """
+        Play the game until it ends or the player quits.
+        
+        Returns:
+            Tuple (end reason, final score)
+        """
+        engine = self.engine
+        actions = [("travel", "去其他地方"), ("buy", "买进货物"), ("sell", "卖出货物"),
+                   ("bank", "去银行"), ("hospital", "去医院"), ("house_agency", "去房屋中介"),
+                   ("switch_city", "换城市"), ("quit", "退出游戏")]
+        
+        while not engine.is_over():
+            await self.send(self.status())
+            action = await self.select("你想做什么?", actions)
+            try:
+                if action == "quit":
+                    break
+                elif action is not None:
+                    await getattr(self, "_" + action)()
+            except ActionError as e:
+                await self.send({"type": "error", "message": str(e)})
+        
+        reason, final_score = engine.finish()
+        await self.send(self.status())
+        await self.send({"type": "end", "reason": reason, "score": final_score})
+        return reason, final_score
+    
+    async def _travel(self) -> None:
+        """Travel to a location of the current city."""
+        player = self.engine.player
+        locations = self.engine.location_manager.get_locations(player.city)
+        location_id = await self.select("你想去哪里?", [(location.id, location.name) for location in locations.values()
+                                                       if location.id != player.current_location])
+        if location_id is not None:
+            news_reports = self.engine.travel(location_id)
+            if news_reports:
+                await self.send({"type": "news", "reports": news_reports})
+    
+    async def _buy(self) -> None:
+        """Buy goods at the market."""
+        engine = self.engine
+        market = self.get_market()
+        prices = {goods_id: price for goods_id, _, price in market}
+        goods_id = await self.select("你想买什么?", [(goods_id, f"{name} ({price}元)") for goods_id, name, price in market])
+        if goods_id is None:
+            return
+        max_buy = engine.max_buy(goods_id, prices[goods_id])
+        if max_buy <= 0:
+            raise ActionError("你买不起或者房子放不下了。")
+        quantity = await self.number("买多少?", 1, max_buy)
+        if quantity is None:
+            return
+        if self.markets is not None:
+            await self.trade(goods_id, quantity)
+        else:
+            engine.buy(goods_id, quantity)
+    
+    async def _sell(self) -> None:
+        """Sell goods at the market."""
+        engine = self.engine
+        held = {goods_id for goods_id, _, _ in engine.player.get_inventory()}
+        choices = [(goods_id, f"{name} ({price}元)") for goods_id, name, price in self.get_market() if goods_id in held]
+        if not choices:
+            raise ActionError("这里没人收你的货。")
+        
+        goods_id = await self.select("你想卖什么?", choices)
+        if goods_id is None:
+            return
+        quantity = await self.number("卖多少?", 1, engine.player.get_quantity(goods_id))
+        if quantity is None:
+            return
+        if self.markets is not None:
+            await self.trade(goods_id, -quantity)
+        else:
+            engine.sell(goods_id, quantity)
+    
+    async def _bank(self) -> None:
+        """Deposit, withdraw or repay debt."""
+        engine = self.engine
+        player = engine.player
+        transaction = await self.select("你想办理什么业务?", [("deposit", "存钱"), ("withdraw", "取钱"), ("repay", "还债")])
+        if transaction is None:
+            return
+        
+        max_amount = {"deposit": player.cash, "withdraw": player.bank_savings,
+                      "repay": min(player.cash, player.debt)}[transaction]
+        if max_amount <= 0:
+            raise ActionError("无法办理这项业务。")
+        amount = await self.number("多少钱?", 1, max_amount)
+        if amount is not None:
+            getattr(engine, transaction)(amount)
+    
+    async def _hospital(self) -> None:
+        """Restore health at the hospital."""
+        engine = self.engine
+        max_points = min(100 - engine.player.health, engine.player.cash // engine.hospital.treatment_cost_per_point)
+        if max_points <= 0:
+            raise ActionError("无法进行治疗。")
+        points = await self.number(f"治疗多少点? (每点{engine.hospital.treatment_cost_per_point}元)", 1, max_points)
+        if points is not None:
+            engine.heal(points)
+    
+    async def _house_agency(self) -> None:
+        """Upgrade the house."""
+        cost = self.engine.house_agency.get_upgrade_cost(self.engine.player)
+        if cost is None:
+            raise ActionError("无法升级房子。")
+        if await self.select(f"花{cost}元升级房子?", [("yes", "是"), ("no", "否")]) == "yes":
+            self.engine.expand()
+    
+    async def _switch_city(self) -> None:
+        """Move to the other city."""
+        city = await self.select("你想去哪个城市?", [(city, name) for city, name in
+                                                    (("BEIJING", "北京"), ("SHANGHAI", "上海"))
+                                                    if city != self.engine.player.city])
+        if city is not None:
+            self.engine.switch_city(city)
+
+
+class GameServer:
+    """
+    GameServer class hosting a game session for every connection.
+    Sessions only hold their game and two streams, and all run in one
+    event loop, so one process serves many idle and playing clients.
+    """
+    
+    def __init__(self, high_scores=None, idle_timeout: Optional[float] = IDLE_TIMEOUT, max_sessions: int = 1000,
+                 shared_market: bool = False, market_tick: float = MARKET_TICK):
+        """
+        Initialize the server.
+        
+        Args:
+            high_scores: HighScores object the final scores are added to (optional)
+            idle_timeout: Seconds a session may wait for an answer (None: forever)
+            max_sessions: Maximum number of simultaneous sessions
+            shared_market: Trade in a market per city shared by all players, where trades move prices
+            market_tick: Seconds between matches of the shared market orders
+        """
+        self.high_scores = high_scores
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = 0
+        
+        self.markets: Optional[Dict[str, SharedMarket]] = None
+        if shared_market:
+            self.markets = {city: SharedMarket(city) for city in CITIES}
+        self.market_tick = market_tick
+        self._market_task: Optional[asyncio.Task] = None
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Play a game with a new client.
+        
+        Args:
+            reader: Stream of the client answers
+            writer: Stream of the messages to the client
+        """
+        session = None
+        try:
+            if self.sessions >= self.max_sessions:
+                writer.write('{"type":"error","message":"服务器已满，请稍后再来。"}\n'.encode("utf-8"))
+                await writer.drain()
+                return
+            
+            self.sessions += 1
+            try:
+                session = GameSession(reader, writer, GameEngine(), self.idle_timeout, self.markets)
+                await session.send({"type": "message", "message": "欢迎来到北京浮生记!"})
+                name = await session.ask({"type": "input", "prompt": "请输入你的名字:"})
+                session.engine.player.name = name[:20] or "小浮生"
+                
+                reason, final_score = await session.run()
+                # Only finished games make the high score list, as in the local game
+                if self.high_scores is not None and reason == "DAYS_OVER":
+                    await self.add_score(session.engine.player, final_score)
+            finally:
+                self.sessions -= 1
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def add_score(self, player, final_score: int) -> None:
+        """
+        Add the final score of a game to the high scores.
+        Adding a score reads and writes the scores file, so it runs off the
+        event loop, and a failure is logged instead of ending the session.
+        
+        Args:
+            player: Player object of the finished game
+            final_score: Final score of the game
+        """
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.high_scores.add_score, player.name, final_score, player.health, player.fame)
+        except Exception:
+            logging.getLogger(__name__).exception("Could not add the score %d of %s", final_score, player.name)
+    
+    async def run_markets(self) -> None:
+        """
+        Match the orders of the shared markets every tick, until cancelled.
+        A failed match or trade is logged and raised in the waiting sessions,
+        and the markets keep running.
+        """
+        loop = asyncio.get_running_loop()
+        last_time = loop.time()
+        while True:
+            await asyncio.sleep(self.market_tick)
+            now = loop.time()
+            for market in self.markets.values():
+                orders = market.pending  # The orders the match takes
+                try:
+                    market.match(now - last_time)
+                except Exception as e:
+                    logging.getLogger(__name__).exception("Could not match the orders of the %s market", market.city)
+                    if market.pending is orders:
+                        market.pending = []
+                    for order in orders:
+                        order.error = order.error or e
+                else:
+                    for order in orders:
+                        if order.error is not None:
+                            logging.getLogger(__name__).error("Could not trade an order in the %s market", market.city,
+                                                              exc_info=order.error)
+                
+                for order in orders:
+                    if order.waiter is None or order.waiter.done():
+                        continue
+                    if order.error is not None:
+                        order.waiter.set_exception(order.error)
+                    else:
+                        order.waiter.set_result(order)
+            last_time = now
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 8023) -> asyncio.AbstractServer:
+        """
+        Start accepting connections, and matching orders if markets are shared.
+        
+        Args:
+            host: Address to listen on
+            port: Port to listen on
+            
+        Returns:
+            asyncio server object
+        """
+        if self.markets is not None and self._market_task is None:
+            self._market_task = asyncio.get_running_loop().create_task(self.run_markets())
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+    
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8023) -> None:
+        """
+        Accept connections until cancelled.
+        
+        Args:
+            host: Address to listen on
+            port: Port to listen on
+        """
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
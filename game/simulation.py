@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulation module for Beijing Life Story game.
+Runs many complete games with bots across a process pool.
+"""
+
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from .engine import GameEngine
+from .parallel import map_chunks
+from .strategies import STRATEGIES
+
+class GameRecord(NamedTuple):
+    """
+    Result of one simulated game.
+    """
+    seed: int
+    score: int
+    reason: str
+    days_played: int
+    health: int
+    fame: int
+    
+    def to_line(self) -> str:
+        """
+        Format the record as a compact tab-separated line.
+        
+        Returns:
+            str: Tab-separated record fields
+        """
+        return "\t".join(str(field) for field in self)
+
+
+def play_game(seed: int, strategy: str = "greedy") -> GameRecord:
+    """
+    Play one complete game with a bot.
+    
+    Args:
+        seed: Seed of the game
+        strategy: Name of the strategy in STRATEGIES
+        
+    Returns:
+        GameRecord: Result of the game
+    """
+    engine = GameEngine(seed=seed)
+    bot = STRATEGIES[strategy](seed)
+    
+    while not engine.is_over():
+        bot.trade(engine)
+        engine.travel(bot.choose_location(engine))
+    
+    reason, final_score = engine.finish()
+    player = engine.player
+    return GameRecord(seed, final_score, reason, 40 - player.days_left, player.health, player.fame)
+
+
+def play_games(seeds: List[int], strategy: str = "greedy") -> List[GameRecord]:
+    """
+    Play a chunk of games in one worker.
+    
+    Args:
+        seeds: Seeds of the games
+        strategy: Name of the strategy in STRATEGIES
+        
+    Returns:
+        List of GameRecord for the games, in seed order
+    """
+    return [play_game(seed, strategy) for seed in seeds]
+
+
+def run_tournament(seeds: Iterable[int], strategy: str = "greedy", workers: Optional[int] = None,
+                   chunk_size: int = 200) -> Iterator[GameRecord]:
+    """
+    Play games for all seeds across a process pool.
+    Records are streamed back as chunks finish, so they are not in seed order.
+    
+    Args:
+        seeds: Seeds of the games to play
+        strategy: Name of the strategy in STRATEGIES
+        workers: Number of worker processes (defaults to the number of CPUs)
+        chunk_size: Number of games sent to a worker at a time
+        
+    Returns:
+        Iterator of GameRecord
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    
+    workers = workers or os.cpu_count() or 1
+    for records in map_chunks(play_games, seeds, chunk_size, workers, strategy):
+        yield from records
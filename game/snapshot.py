@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot module for Beijing Life Story game.
+Saves the whole state of a game in a compact binary snapshot, and restores it.
+"""
+
+import os
+import random
+import struct
+import tempfile
+from typing import List, Optional, Tuple
+
+from .rng import SeedSequence
+
+# Magic bytes starting a snapshot, then the format version
+SNAPSHOT_MAGIC = b"BJFS"
+SNAPSHOT_VERSION = 1
+
+# Number of random streams of a game: goods, events and internet cafe
+NUM_STREAMS = 3
+
+# Words in the state of a Mersenne Twister stream
+MT_WORDS = 624
+
+# Most state regenerations searched to find the position of a stream
+MAX_TWISTS = 64
+
+_HEADER = struct.Struct("<4sB")
+_PLAYER = struct.Struct("<iqqqiiiiiiB")
+_LENGTH = struct.Struct("<H")
+_COUNT = struct.Struct("<H")
+_INVENTORY_ITEM = struct.Struct("<Hqq")
+_PRICE = struct.Struct("<q")
+_STREAM_KIND = struct.Struct("<B")
+_STREAM_POSITION = struct.Struct("<Q")
+_STREAM_STATE = struct.Struct(f"<{MT_WORDS + 1}I")
+_GAUSS = struct.Struct("<?d")
+
+# Stream kinds: a position in the stream of the game seed, or the full state
+_STREAM_SEEDED = 0
+_STREAM_FULL = 1
+
+class SnapshotError(ValueError):
+    """
+    Raised when a snapshot can't be read.
+    """
+    pass
+
+
+def _pack_str(value: str) -> bytes:
+    """
+    Encode a string as length-prefixed UTF-8.
+    
+    Args:
+        value: String to encode
+        
+    Returns:
+        bytes: Encoded string
+    """
+    data = value.encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_str(data: bytes, offset: int) -> Tuple[str, int]:
+    """
+    Decode a length-prefixed UTF-8 string.
+    
+    Args:
+        data: Snapshot data
+        offset: Offset of the string
+        
+    Returns:
+        Tuple of (string, offset after the string)
+    """
+    length = _LENGTH.unpack_from(data, offset)[0]
+    offset += _LENGTH.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _mask_size(num_goods: int) -> int:
+    """
+    Get the number of bytes of the mask of available goods.
+    
+    Args:
+        num_goods: Number of goods types
+        
+    Returns:
+        int: One bit per goods, rounded up to whole bytes
+    """
+    return (num_goods + 7) // 8
+
+
+def stream_position(rng: random.Random, seed: int) -> Optional[int]:
+    """
+    Find how many 32-bit words a stream has drawn since it was seeded.
+    
+    The Mersenne Twister state holds its position within the current block
+    of 624 words, so only the number of blocks has to be searched, one block
+    regeneration at a time.
+    
+    Args:
+        rng: Random stream
+        seed: Seed the stream was created with
+        
+    Returns:
+        Number of words drawn, or None if the stream doesn't come from the seed
+        (or has drawn more than MAX_TWISTS blocks)
+    """
+    internal = rng.getstate()[1]
+    words, index = internal[:MT_WORDS], internal[MT_WORDS]
+    
+    clone = random.Random(seed)
+    if index == MT_WORDS and clone.getstate()[1][:MT_WORDS] == words:
+        return 0
+    
+    for twists in range(1, MAX_TWISTS + 1):
+        clone.getrandbits(32 * MT_WORDS)
+        if clone.getstate()[1][:MT_WORDS] == words:
+            return (twists - 1) * MT_WORDS + index
+    return None
+
+
+def seeded_stream(seed: int, position: int) -> random.Random:
+    """
+    Create a stream from its seed and move it to a position.
+    
+    Args:
+        seed: Seed of the stream
+        position: Number of 32-bit words drawn from the stream
+        
+    Returns:
+        random.Random: Stream at the position
+    """
+    rng = random.Random(seed)
+    if position:
+        rng.getrandbits(32 * position)
+    return rng
+
+
+def _pack_stream(rng: random.Random, seed: int) -> bytes:
+    """
+    Encode a random stream: its position if it comes from the seed, else its full state.
+    
+    Args:
+        rng: Random stream
+        seed: Seed the stream was created with
+        
+    Returns:
+        bytes: Encoded stream
+    """
+    gauss_next = rng.gauss_next
+    gauss = _GAUSS.pack(gauss_next is not None, gauss_next or 0.0)
+    
+    position = stream_position(rng, seed)
+    if position is not None:
+        return _STREAM_KIND.pack(_STREAM_SEEDED) + _STREAM_POSITION.pack(position) + gauss
+    return _STREAM_KIND.pack(_STREAM_FULL) + _STREAM_STATE.pack(*rng.getstate()[1]) + gauss
+
+
+def _unpack_stream(data: bytes, offset: int, seed: int) -> Tuple[random.Random, int]:
+    """
+    Decode a random stream.
+    
+    Args:
+        data: Snapshot data
+        offset: Offset of the stream
+        seed: Seed the stream was created with
+        
+    Returns:
+        Tuple of (stream, offset after the stream)
+    """
+    kind = _STREAM_KIND.unpack_from(data, offset)[0]
+    offset += _STREAM_KIND.size
+    if kind == _STREAM_SEEDED:
+        rng = seeded_stream(seed, _STREAM_POSITION.unpack_from(data, offset)[0])
+        offset += _STREAM_POSITION.size
+    elif kind == _STREAM_FULL:
+        rng = random.Random.__new__(random.Random)
+        rng.setstate((3, _STREAM_STATE.unpack_from(data, offset), None))
+        offset += _STREAM_STATE.size
+    else:
+        raise SnapshotError(f"Unknown random stream kind {kind}")
+    
+    has_gauss, gauss_next = _GAUSS.unpack_from(data, offset)
+    rng.gauss_next = gauss_next if has_gauss else None
+    return rng, offset + _GAUSS.size
+
+
+def _stream_seeds(entropy: int) -> List[int]:
+    """
+    Get the seeds of the random streams of a game, as GameEngine spawns them.
+    
+    Args:
+        entropy: Seed of the game
+        
+    Returns:
+        List of stream seeds
+    """
+    return [SeedSequence(entropy, (i,)).generate_state() for i in range(NUM_STREAMS)]
+
+
+def dumps(engine) -> bytes:
+    """
+    Save the state of a game.
+    
+    Args:
+        engine: GameEngine object
+        
+    Returns:
+        bytes: Snapshot, a few hundred bytes
+    """
+    player = engine.player
+    goods_manager = engine.goods_manager
+    
+    parts = [
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION),
+        _pack_str(str(engine.seed_sequence.entropy)),
+        _pack_str(player.name),
+        _pack_str(player.city),
+        _PLAYER.pack(player.days_left, player.cash, player.debt, player.bank_savings,
+                     player.health, player.fame, player.inventory_capacity, player.inventory_used,
+                     player.current_location, player.wangba_visits,
+                     player.sound_enabled | player.hacker_actions_enabled << 1)
+    ]
+    
+    inventory = player.get_inventory()
+    parts.append(_COUNT.pack(len(inventory)))
+    parts.extend(_INVENTORY_ITEM.pack(*item) for item in inventory)
+    
+    num_goods = len(goods_manager.goods_types)
+    parts.append(_COUNT.pack(num_goods))
+    parts.extend(_PRICE.pack(goods.current_price) for goods in goods_manager.goods_types.values())
+    available = sum(1 << goods_id for goods_id, available in goods_manager.available_goods.items() if available)
+    parts.append(available.to_bytes(_mask_size(num_goods), "little"))
+    
+    seeds = _stream_seeds(engine.seed_sequence.entropy)
+    for rng, seed in zip((goods_manager.rng, engine.event_manager.rng, engine.internet_cafe.rng), seeds):
+        parts.append(_pack_stream(rng, seed))
+    return b"".join(parts)
+
+
+def loads(data: bytes, logger=None):
+    """
+    Restore a game from a snapshot.
+    
+    Args:
+        data: Snapshot from dumps
+        logger: GameLogger object for the restored game (optional)
+        
+    Returns:
+        GameEngine: The restored game
+    """
+    from .engine import GameEngine
+    
+    try:
+        magic, version = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Not a game snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+        
+        entropy, offset = _unpack_str(data, _HEADER.size)
+        name, offset = _unpack_str(data, offset)
+        city, offset = _unpack_str(data, offset)
+        
+        engine = GameEngine(name, logger=logger, seed=int(entropy))
+        player = engine.player
+        player.city = city
+        (player.days_left, player.cash, player.debt, player.bank_savings,
+         player.health, player.fame, player.inventory_capacity, player.inventory_used,
+         player.current_location, player.wangba_visits, flags) = _PLAYER.unpack_from(data, offset)
+        player.sound_enabled = bool(flags & 1)
+        player.hacker_actions_enabled = bool(flags & 2)
+        offset += _PLAYER.size
+        
+        count = _COUNT.unpack_from(data, offset)[0]
+        offset += _COUNT.size
+        for _ in range(count):
+            goods_id, quantity, price = _INVENTORY_ITEM.unpack_from(data, offset)
+            player.inventory_quantities[goods_id] = quantity
+            player.inventory_prices[goods_id] = price
+            offset += _INVENTORY_ITEM.size
+        
+        goods_manager = engine.goods_manager
+        count = _COUNT.unpack_from(data, offset)[0]
+        offset += _COUNT.size
+        for goods_id in range(count):
+            goods_manager.goods_types[goods_id].current_price = _PRICE.unpack_from(data, offset)[0]
+            offset += _PRICE.size
+        size = _mask_size(count)
+        if len(data) < offset + size:
+            raise SnapshotError("Corrupted snapshot: truncated goods mask")
+        available = int.from_bytes(data[offset:offset + size], "little")
+        offset += size
+        goods_manager.available_goods = {goods_id: bool(available >> goods_id & 1)
+                                         for goods_id in goods_manager.goods_types}
+        goods_manager._refresh_market_index()
+        
+        seeds = _stream_seeds(engine.seed_sequence.entropy)
+        goods_manager.rng, offset = _unpack_stream(data, offset, seeds[0])
+        engine.event_manager.rng, offset = _unpack_stream(data, offset, seeds[1])
+        engine.internet_cafe.rng, offset = _unpack_stream(data, offset, seeds[2])
+    except (struct.error, UnicodeDecodeError, IndexError, KeyError) as e:
+        raise SnapshotError(f"Corrupted snapshot: {e}")
+    return engine
+
+
+def save(engine, snapshot_file: str) -> None:
+    """
+    Save the state of a game to a file.
+    The snapshot is written to a temporary file that then replaces the file,
+    so a crash never leaves a partly written snapshot.
+    
+    Args:
+        engine: GameEngine object
+        snapshot_file: Path to the snapshot file
+    """
+    data = dumps(engine)
+    directory = os.path.dirname(os.path.abspath(snapshot_file))
+    fd, temp_file = tempfile.mkstemp(prefix=".snapshot-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_file, snapshot_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+
+def load(snapshot_file: str, logger=None):
+    """
+    Restore a game from a snapshot file.
+    
+    Args:
+        snapshot_file: Path to the snapshot file
+        logger: GameLogger object for the restored game (optional)
+        
+    Returns:
+        GameEngine: The restored game
+    """
+    with open(snapshot_file, "rb") as f:
+        return loads(f.read(), logger)
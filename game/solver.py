@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Solver module for Beijing Life Story game.
+Searches for the best score reachable from a game seed.
+"""
+
+import random
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
+
+from .engine import ActionError, GameEngine
+
+# An action is an engine method name and its arguments, e.g. ("buy", (3, 10))
+Action = Tuple[str, Tuple[int, ...]]
+
+class SolverResult(NamedTuple):
+    """
+    Best game found by the solver.
+    """
+    seed: int
+    score: int
+    reason: str
+    actions: List[List[Action]]  # Actions taken on each day, before traveling
+    nodes: int  # Number of game states expanded
+    timed_out: bool
+
+
+class _Node:
+    """
+    Search node: a game state and the way it was reached.
+    """
+    __slots__ = ("engine", "parent", "actions", "value")
+    
+    def __init__(self, engine: GameEngine, parent: Optional["_Node"], actions: List[Action], value: int):
+        self.engine = engine
+        self.parent = parent
+        self.actions = actions
+        self.value = value
+    
+    def history(self) -> List[List[Action]]:
+        """
+        Get the actions of every day from the start of the game to this node.
+        
+        Returns:
+            List of action lists, one per day
+        """
+        days = []
+        node = self
+        while node.parent is not None:
+            days.append(node.actions)
+            node = node.parent
+        days.reverse()
+        return days
+
+
+class Solver:
+    """
+    Solver class running a beam search over the 40-day horizon.
+    
+    Every day, each state in the beam is expanded with a set of trade plans
+    (what to sell, which goods to buy, whether to heal or to repay debt),
+    then the game travels to the next day. States are deduplicated with a
+    transposition table keyed on the player and market state, and only the
+    beam_width most valuable states are kept.
+    """
+    
+    def __init__(self, beam_width: int = 64, buy_choices: int = 3, time_budget: float = 5.0):
+        """
+        Initialize the solver.
+        
+        Args:
+            beam_width: Number of states kept per day
+            buy_choices: Number of goods considered for buying each day (best discounts first)
+            time_budget: Seconds allowed per solve; once spent, the beam narrows to one state
+        """
+        self.beam_width = beam_width
+        self.buy_choices = buy_choices
+        self.time_budget = time_budget
+    
+    def solve(self, seed: int) -> SolverResult:
+        """
+        Search for the best score of a game seed.
+        
+        Args:
+            seed: Seed of the game
+            
+        Returns:
+            SolverResult: Best game found
+        """
+        deadline = time.monotonic() + self.time_budget
+        timed_out = False
+        nodes = 0
+        
+        start = GameEngine(seed=seed)
+        beam = [_Node(start, None, [], self._evaluate(start))]
+        finished: List[_Node] = []
+        
+        # Transposition table of this solve: state key -> best value seen
+        transpositions: Dict[Tuple[Any, ...], int] = {}
+        
+        while beam:
+            last = beam[0]
+            if not timed_out and time.monotonic() > deadline:
+                timed_out = True
+            
+            width = 1 if timed_out else self.beam_width
+            children: List[_Node] = []
+            for node in beam:
+                nodes += 1
+                for child in self._expand(node):
+                    if child.engine.is_over():
+                        child.engine.finish()
+                        child.value = child.engine.get_score()
+                        finished.append(child)
+                    elif self._is_new(child, transpositions):
+                        children.append(child)
+            
+            children.sort(key=lambda child: child.value, reverse=True)
+            beam = children[:width]
+        
+        if finished:
+            best = max(finished, key=lambda node: node.value)
+            reason = best.engine.get_end_reason() or "DAYS_OVER"
+        else:
+            # No state reached the end of the game: end it at the best state left
+            best = last
+            reason, best.value = best.engine.finish()
+        return SolverResult(seed, best.value, reason, best.history(), nodes, timed_out)
+    
+    def _expand(self, node: _Node) -> List[_Node]:
+        """
+        Apply every trade plan to a state, then travel to the next day.
+        
+        Args:
+            node: Node to expand
+            
+        Returns:
+            List of child nodes
+        """
+        children = []
+        for plan in self._plans(node.engine):
+            engine = node.engine.fork()
+            try:
+                actions = self._execute(engine, plan)
+            except ActionError:
+                continue
+            
+            # Where to go doesn't change the market, so just alternate locations
+            engine.travel(2 if engine.player.current_location == 1 else 1)
+            children.append(_Node(engine, node, actions, self._evaluate(engine)))
+        return children
+    
+    def _plans(self, engine: GameEngine) -> List[List[Tuple[Any, ...]]]:
+        """
+        Build the trade plans to try in a state.
+        A plan is a list of steps: ("sell", only_profitable), ("heal",),
+        ("buy", goods_id) and ("repay",).
+        
+        Args:
+            engine: Game state
+            
+        Returns:
+            List of plans
+        """
+        player = engine.player
+        goods_manager = engine.goods_manager
+        
+        # Selling options: only at a profit, or everything the market takes
+        sell_options = [[("sell", True)]]
+        if any(goods_manager.get_market_price(goods_id) is not None for goods_id, _, _ in player.get_inventory()):
+            sell_options.append([("sell", False)])
+        
+        # Heal before health gets low enough for a hospital stay
+        heal_options = [[]]
+        if player.health < 90:
+            heal_options.append([("heal",)])
+        
+        # Buying options: nothing, or as much as possible of a well-priced goods
+        deals = []
+        for goods_id, _, price in goods_manager.get_available_goods():
+            goods = goods_manager.goods_types[goods_id]
+            deals.append((price / (goods.base_price + goods.price_range / 2), goods_id))
+        deals.sort()
+        buy_options = [[]] + [[("buy", goods_id)] for _, goods_id in deals[:self.buy_choices]]
+        
+        # Leftover cash either repays debt or goes to the bank
+        repay_options = [[]]
+        if player.debt > 0:
+            repay_options.append([("repay",)])
+        
+        return [sells + heal + buy + repay
+                for sells in sell_options
+                for heal in heal_options
+                for buy in buy_options
+                for repay in repay_options]
+    
+    @staticmethod
+    def _execute(engine: GameEngine, plan: List[Tuple[Any, ...]]) -> List[Action]:
+        """
+        Execute a trade plan on a game.
+        Savings are withdrawn first and leftover cash is deposited last,
+        which earns interest and keeps it safe from money events. Steps with
+        nothing to do, such as buying with no cash left, are skipped.
+        
+        Args:
+            engine: Game state
+            plan: Plan from _plans
+            
+        Returns:
+            List of the engine actions taken
+        """
+        player = engine.player
+        goods_manager = engine.goods_manager
+        actions: List[Action] = []
+        
+        def act(name: str, *args: int) -> None:
+            getattr(engine, name)(*args)
+            actions.append((name, args))
+        
+        if player.bank_savings > 0:
+            act("withdraw", player.bank_savings)
+        
+        for step in plan:
+            if step[0] == "sell":
+                for goods_id, quantity, buy_price in player.get_inventory():
+                    price = goods_manager.get_market_price(goods_id)
+                    if price is not None and (price > buy_price or not step[1]):
+                        act("sell", goods_id, quantity)
+            elif step[0] == "heal":
+                points = min(100 - player.health, player.cash // engine.hospital.treatment_cost_per_point)
+                if points > 0:
+                    act("heal", points)
+            elif step[0] == "buy":
+                quantity = engine.max_buy(step[1])
+                if quantity > 0:
+                    act("buy", step[1], quantity)
+            elif step[0] == "repay":
+                amount = min(player.cash, player.debt)
+                if amount > 0:
+                    act("repay", amount)
+        
+        if player.cash > 0:
+            act("deposit", player.cash)
+        return actions
+    
+    def _is_new(self, node: _Node, transpositions: Dict[Tuple[Any, ...], int]) -> bool:
+        """
+        Check the transposition table, so states reached twice are only searched once.
+        
+        Args:
+            node: Node to check
+            transpositions: Transposition table of the solve, updated with the node
+            
+        Returns:
+            bool: True if the state is new or was reached with a better value
+        """
+        key = self._state_key(node.engine)
+        best = transpositions.get(key)
+        if best is not None and best >= node.value:
+            return False
+        transpositions[key] = node.value
+        return True
+    
+    @staticmethod
+    def _state_key(engine: GameEngine) -> Tuple[Any, ...]:
+        """
+        Canonicalize the player, market and random stream state of a game.
+        Branches can draw different numbers of random values (a hospital stay
+        skips days), so equal player and market states only match if their
+        streams are at the same position too.
+        
+        Args:
+            engine: Game state
+            
+        Returns:
+            Hashable key of the state
+        """
+        goods_manager = engine.goods_manager
+        market = tuple(goods_manager.get_market_price(goods_id) for goods_id in goods_manager.goods_types)
+        streams = (Solver._stream_key(goods_manager.rng), Solver._stream_key(engine.event_manager.rng))
+        return (engine.player.state_key(), market, streams)
+    
+    @staticmethod
+    def _stream_key(rng: random.Random) -> Tuple[Any, ...]:
+        """
+        Get a key of the position of a random stream.
+        Positions of one seeded stream differ in the current block of words or
+        in the index within it, so the first word and the index tell them apart.
+        
+        Args:
+            rng: Random stream
+            
+        Returns:
+            Hashable key of the stream position
+        """
+        internal = rng.getstate()[1]
+        return (internal[0], internal[-1], rng.gauss_next)
+    
+    @staticmethod
+    def _evaluate(engine: GameEngine) -> int:
+        """
+        Estimate the value of a state: net worth plus goods at market or buy price.
+        
+        Args:
+            engine: Game state
+            
+        Returns:
+            int: Estimated value
+        """
+        player = engine.player
+        value = player.get_net_worth()
+        for goods_id, quantity, buy_price in player.get_inventory():
+            price = engine.goods_manager.get_market_price(goods_id)
+            value += quantity * (price if price is not None else buy_price)
+        return value
+
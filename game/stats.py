@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stats module for Beijing Life Story game.
+Aggregates game logs into trading, event and score statistics across a process pool.
+"""
+
+import os
+import re
+import struct
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .logformat import is_log_name, read_records
+from .parallel import chunks, map_chunks
+
+# Number of days in a game, and so of points on the daily cash curve
+GAME_DAYS = 40
+
+# Errors of a corrupt, truncated or unreadable log file
+LOG_ERRORS = (OSError, EOFError, ValueError, KeyError, TypeError, struct.error, zlib.error)
+
+# Amounts and quantities in event descriptions, replaced to group events by kind.
+# Digits attached to Latin letters, dots or other digits are part of names
+# ("163.com", "3G", "1.5"), so they are kept.
+NUMBER_PATTERN = re.compile(r"(?<![A-Za-z0-9.])\d+(?![A-Za-z0-9.])")
+
+class LogStats:
+    """
+    LogStats class holding aggregates of game logs.
+    Every aggregate is a count or a sum, so memory doesn't grow with the number
+    of logs, and stats of different logs merge by adding them up.
+    """
+    
+    def __init__(self):
+        """Initialize empty stats."""
+        self.files = 0
+        self.skipped = 0  # Files that couldn't be read
+        self.games = 0
+        
+        # Realized trading results per goods name: [sales, quantity sold, profit]
+        self.goods: Dict[str, List[int]] = {}
+        
+        # Number of times each random event happened
+        self.events: Counter = Counter()
+        
+        # Number of games per end reason, and final score aggregates
+        self.end_reasons: Counter = Counter()
+        self.scores = 0
+        self.score_total = 0
+        self.score_min: Optional[int] = None
+        self.score_max: Optional[int] = None
+        self.score_buckets: Counter = Counter()  # Games per number of digits of the score
+        
+        # Cash per day of the game: sum over status snapshots, and number of snapshots
+        self.cash_total = [0] * (GAME_DAYS + 1)
+        self.cash_count = [0] * (GAME_DAYS + 1)
+    
+    def add_record(self, record: Dict) -> None:
+        """
+        Add a log record to the stats.
+        
+        Args:
+            record: Record from logformat.read_records
+        """
+        event_type = record["type"]
+        if event_type == "SELL":
+            goods = self.goods.get(record["goods_name"])
+            if goods is None:
+                goods = self.goods[record["goods_name"]] = [0, 0, 0]
+            goods[0] += 1
+            goods[1] += record["quantity"]
+            goods[2] += record["profit"]
+        elif event_type == "PLAYER_STATUS":
+            day = GAME_DAYS - record["days_left"]
+            if 0 <= day <= GAME_DAYS:
+                self.cash_total[day] += record["cash"]
+                self.cash_count[day] += 1
+        elif event_type == "RANDOM_EVENT":
+            # The first line names the event, the next ones describe its effects.
+            # Money and hacker events put amounts in it, so numbers are masked.
+            self.events[NUMBER_PATTERN.sub("#", record["event_description"].split("\n", 1)[0])] += 1
+        elif event_type == "GAME_START":
+            self.games += 1
+        elif event_type == "GAME_END":
+            self.add_score(record["reason"], record["final_score"])
+    
+    def add_score(self, reason: str, score: int) -> None:
+        """
+        Add the end of a game to the stats.
+        
+        Args:
+            reason: Reason the game ended
+            score: Final score
+        """
+        self.end_reasons[reason] += 1
+        self.scores += 1
+        self.score_total += score
+        self.score_min = score if self.score_min is None else min(self.score_min, score)
+        self.score_max = score if self.score_max is None else max(self.score_max, score)
+        self.score_buckets[len(str(score)) if score > 0 else 0] += 1
+    
+    def merge(self, other: "LogStats") -> None:
+        """
+        Add the stats of other logs to these stats.
+        
+        Args:
+            other: Stats to add
+        """
+        self.files += other.files
+        self.skipped += other.skipped
+        self.games += other.games
+        
+        for name, (sales, quantity, profit) in other.goods.items():
+            goods = self.goods.setdefault(name, [0, 0, 0])
+            goods[0] += sales
+            goods[1] += quantity
+            goods[2] += profit
+        
+        self.events.update(other.events)
+        self.end_reasons.update(other.end_reasons)
+        self.scores += other.scores
+        self.score_total += other.score_total
+        for score in (other.score_min, other.score_max):
+            if score is not None:
+                self.score_min = score if self.score_min is None else min(self.score_min, score)
+                self.score_max = score if self.score_max is None else max(self.score_max, score)
+        self.score_buckets.update(other.score_buckets)
+        
+        for day in range(GAME_DAYS + 1):
+            self.cash_total[day] += other.cash_total[day]
+            self.cash_count[day] += other.cash_count[day]
+    
+    def report(self, top_events: int = 20) -> Iterator[str]:
+        """
+        Format the stats as tab-separated report lines.
+        
+        Args:
+            top_events: Number of most frequent events listed
+            
+        Returns:
+            Iterator of report lines
+        """
+        yield f"files\t{self.files}"
+        yield f"skipped\t{self.skipped}"
+        yield f"games\t{self.games}"
+        
+        yield ""
+        yield "end_reason\tgames"
+        for reason, count in self.end_reasons.most_common():
+            yield f"{reason}\t{count}"
+        
+        if self.scores:
+            yield ""
+            yield "score_mean\tscore_min\tscore_max"
+            yield f"{self.score_total / self.scores:.0f}\t{self.score_min}\t{self.score_max}"
+            yield "score_range\tgames"
+            for digits in sorted(self.score_buckets):
+                label = "<=0" if digits == 0 else f"{10 ** (digits - 1)}-{10 ** digits - 1}"
+                yield f"{label}\t{self.score_buckets[digits]}"
+        
+        yield ""
+        yield "goods\tsales\tquantity\tprofit\tprofit_per_unit"
+        for name, (sales, quantity, profit) in sorted(self.goods.items(), key=lambda item: item[1][2], reverse=True):
+            yield f"{name}\t{sales}\t{quantity}\t{profit}\t{profit / quantity if quantity else 0:.1f}"
+        
+        yield ""
+        yield "event\tcount"
+        for description, count in self.events.most_common(top_events):
+            yield f"{description}\t{count}"
+        
+        yield ""
+        yield "day\tsnapshots\tmean_cash"
+        for day in range(GAME_DAYS + 1):
+            if self.cash_count[day]:
+                yield f"{day}\t{self.cash_count[day]}\t{self.cash_total[day] / self.cash_count[day]:.0f}"
+
+
+def find_logs(log_dir: str = "logs") -> Iterator[str]:
+    """
+    Find the game logs of a directory, compressed or not.
+    
+    Args:
+        log_dir: Log directory
+        
+    Returns:
+        Iterator of log file paths
+    """
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and is_log_name(entry.name):
+                yield entry.path
+
+
+def analyze_files(log_files: List[str]) -> LogStats:
+    """
+    Aggregate a chunk of log files in one worker.
+    A corrupt or truncated file is skipped and counted, without its records.
+    
+    Args:
+        log_files: Paths of the log files
+        
+    Returns:
+        LogStats: Stats of the files
+    """
+    stats = LogStats()
+    for log_file in log_files:
+        file_stats = LogStats()
+        try:
+            for record in read_records(log_file, bulk=True):
+                file_stats.add_record(record)
+        except LOG_ERRORS:
+            stats.skipped += 1
+            continue
+        file_stats.files = 1
+        stats.merge(file_stats)
+    return stats
+
+
+def analyze_logs(log_files: Iterable[str], workers: Optional[int] = None, chunk_size: int = 64) -> LogStats:
+    """
+    Aggregate log files across a process pool.
+    
+    Args:
+        log_files: Paths of the log files
+        workers: Number of worker processes (defaults to the number of CPUs)
+        chunk_size: Number of files sent to a worker at a time
+        
+    Returns:
+        LogStats: Stats of all files
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = LogStats()
+    
+    if workers == 1:
+        for chunk in chunks(log_files, chunk_size):
+            stats.merge(analyze_files(chunk))
+        return stats
+    
+    # Merge results as they come, so they don't pile up in memory
+    for chunk_stats in map_chunks(analyze_files, log_files, chunk_size, workers):
+        stats.merge(chunk_stats)
+    return stats
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Strategies module for Beijing Life Story game.
+Bots that play the game through the GameEngine for simulations.
+"""
+
+import random
+from typing import Dict, List, Optional, Type
+
+from .engine import GameEngine
+
+class Strategy:
+    """
+    Strategy base class. A strategy trades at the current location,
+    then picks the next location to travel to.
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize the strategy.
+        
+        Args:
+            seed: Seed for the strategy's own random choices (optional)
+        """
+        self.rng = random.Random(seed)
+    
+    def trade(self, engine: GameEngine) -> None:
+        """
+        Make trades at the current location.
+        
+        Args:
+            engine: GameEngine object
+        """
+        pass
+    
+    def choose_location(self, engine: GameEngine) -> int:
+        """
+        Choose the next location to travel to.
+        
+        Args:
+            engine: GameEngine object
+            
+        Returns:
+            int: ID of a location in the current city
+        """
+        player = engine.player
+        location_ids = [location_id for location_id in engine.location_manager.get_locations(player.city)
+                        if location_id != player.current_location]
+        return self.rng.choice(location_ids)
+
+
+class RandomStrategy(Strategy):
+    """
+    RandomStrategy class making random trades.
+    """
+    
+    def trade(self, engine: GameEngine) -> None:
+        """
+        Sell a random held goods and buy a random quantity of a random goods.
+        
+        Args:
+            engine: GameEngine object
+        """
+        player = engine.player
+        goods_manager = engine.goods_manager
+        
+        sellable = [(goods_id, quantity) for goods_id, quantity, _ in player.get_inventory()
+                    if goods_manager.get_market_price(goods_id) is not None]
+        if sellable:
+            goods_id, quantity = self.rng.choice(sellable)
+            engine.sell(goods_id, self.rng.randint(1, quantity))
+        
+        available = goods_manager.get_available_goods()
+        if available:
+            goods_id = self.rng.choice(available)[0]
+            max_buy = engine.max_buy(goods_id)
+            if max_buy > 0:
+                engine.buy(goods_id, self.rng.randint(1, max_buy))
+
+
+class GreedyStrategy(Strategy):
+    """
+    GreedyStrategy class selling at a profit and buying the cheapest goods
+    relative to its usual price.
+    """
+    
+    def __init__(self, seed: Optional[int] = None, min_discount: float = 0.8):
+        """
+        Initialize the strategy.
+        
+        Args:
+            seed: Seed for the strategy's own random choices (optional)
+            min_discount: Only buy goods priced below this fraction of their average price
+        """
+        super().__init__(seed)
+        self.min_discount = min_discount
+    
+    def trade(self, engine: GameEngine) -> None:
+        """
+        Sell profitable goods, repay debt when rich enough, then buy the best deal.
+        
+        Args:
+            engine: GameEngine object
+        """
+        player = engine.player
+        goods_manager = engine.goods_manager
+        
+        # Sell everything that makes a profit
+        for goods_id, quantity, buy_price in player.get_inventory():
+            price = goods_manager.get_market_price(goods_id)
+            if price is not None and price > buy_price:
+                engine.sell(goods_id, quantity)
+        
+        # Debt grows 10% a day, so pay it off as soon as trading money is left over
+        if 0 < player.debt and player.cash > 2 * player.debt:
+            engine.repay(player.debt)
+        
+        # Buy the goods with the biggest discount on its average price
+        best_goods_id = None
+        best_ratio = self.min_discount
+        for goods_id, name, price in goods_manager.get_available_goods():
+            goods = goods_manager.goods_types[goods_id]
+            ratio = price / (goods.base_price + goods.price_range / 2)
+            if ratio < best_ratio:
+                best_goods_id = goods_id
+                best_ratio = ratio
+        
+        if best_goods_id is not None:
+            max_buy = engine.max_buy(best_goods_id)
+            if max_buy > 0:
+                engine.buy(best_goods_id, max_buy)
+
+
+# Strategies available to simulations, by name
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    "random": RandomStrategy,
+    "greedy": GreedyStrategy
+}
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text width module for Beijing Life Story game.
+Measures the terminal display width of text, with wide East Asian characters counting as 2.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Any ANSI escape sequence (colors, cursor moves)
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
+
+# Number of display widths cached, enough for goods, locations and box text
+CACHE_SIZE = 2048
+
+# Display width of every character of the Basic Multilingual Plane, built on first use
+_bmp_widths: Optional[bytes] = None
+
+
+def char_width(char: str) -> int:
+    """
+    Get the display width of one character.
+    
+    Args:
+        char: Character to measure
+        
+    Returns:
+        int: 0 for combining marks, 2 for wide East Asian characters, 1 otherwise
+    """
+    if unicodedata.category(char) in ("Mn", "Me"):
+        return 0
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 2
+    return 1
+
+
+def _width_table() -> bytes:
+    """
+    Get the lookup table of character widths for the Basic Multilingual Plane.
+    
+    Returns:
+        bytes: Display width of each character, indexed by code point
+    """
+    global _bmp_widths
+    if _bmp_widths is None:
+        _bmp_widths = bytes(char_width(chr(code)) for code in range(0x10000))
+    return _bmp_widths
+
+
+def strip_ansi(text: str) -> str:
+    """
+    Remove ANSI escape sequences from text.
+    
+    Args:
+        text: Text to clean
+        
+    Returns:
+        str: Text without escape sequences
+    """
+    return ANSI_PATTERN.sub("", text)
+
+
+def _text_width(text: str) -> int:
+    """
+    Calculate the display width of text without escape sequences, uncached.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        int: Number of terminal columns the text takes
+    """
+    if text.isascii():
+        return len(text)
+    
+    table = _width_table()
+    width = 0
+    for char in text:
+        code = ord(char)
+        width += table[code] if code < 0x10000 else char_width(char)
+    return width
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def display_width(text: str) -> int:
+    """
+    Calculate the display width of text, ignoring ANSI escape sequences.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        int: Number of terminal columns the text takes
+    """
+    if "\x1b" in text:
+        text = strip_ansi(text)
+    return _text_width(text)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def wrap(text: str, width: int) -> Tuple[str, ...]:
+    """
+    Wrap text into lines of at most width display columns.
+    Lines break between any two characters, so Chinese text without spaces wraps too;
+    words of Latin text are kept whole when there is a space to break at.
+    Newlines in the text always start a new line. The text must not contain escape sequences.
+    
+    Args:
+        text: Text to wrap
+        width: Maximum display width of a line
+        
+    Returns:
+        Tuple of wrapped lines
+    """
+    # Measure characters and partial lines without the display_width cache,
+    # which would fill up with them and drop the whole lines it is for
+    table = _width_table()
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        line_width = 0
+        for char in paragraph:
+            code = ord(char)
+            char_columns = table[code] if code < 0x10000 else char_width(char)
+            if line_width + char_columns > width and line:
+                # Move a partial Latin word to the next line if possible
+                head, space, tail = line.rpartition(" ")
+                if space and char.isascii() and not char.isspace() and tail.isascii():
+                    lines.append(head.rstrip(" "))
+                    line = tail
+                else:
+                    lines.append(line.rstrip(" "))
+                    line = ""
+                line = line.lstrip(" ")
+                line_width = _text_width(line)
+            if char == " " and not line:
+                continue
+            line += char
+            line_width += char_columns
+        lines.append(line.rstrip(" "))
+    return tuple(lines)
@@ -5,15 +5,18 @@ UI module for Beijing Life Story game.
 Handles the command-line interface for the game.
 """
 
-import os
 import sys
 import time
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any, Union, Callable
-import questionary
 from colorama import Fore, Style, init
 
-# Initialize colorama
-init(autoreset=True)
+from .renderer import Renderer
+from .textwidth import display_width, wrap
+
+# colorama is initialized by the first UI rather than on import,
+# so importing the game never touches the terminal
+_colorama_initialized = False
 
 class UI:
     """
@@ -22,19 +25,65 @@ class UI:
     
     def __init__(self):
         """Initialize the UI."""
-        # Define styles for questionary (can be customized)
-        self.style = questionary.Style([
-            ('question', 'bold'),
-            ('answer', ''), # Hide the answer text
-            ('pointer', 'fg:cyan bold'),
-            ('highlighted', 'fg:cyan bold'),
-            ('selected', 'fg:cyan bold'),
-        ])
+        global _colorama_initialized
+        if not _colorama_initialized:
+            init(autoreset=True)
+            _colorama_initialized = True
+        
+        # Styles for questionary, created on first prompt (can be customized)
+        self._style = None
         
         # Store the current menu level for navigation
         self.menu_level = 0
         # Store the parent menu result for back navigation
         self.parent_menu_result = None
+        
+        # Frame buffer for screen output
+        self.renderer = Renderer()
+    
+    @property
+    def style(self):
+        """Get the questionary style, importing questionary on first use."""
+        if self._style is None:
+            import questionary
+            self._style = questionary.Style([
+                ('question', 'bold'),
+                ('answer', ''), # Hide the answer text
+                ('pointer', 'fg:cyan bold'),
+                ('highlighted', 'fg:cyan bold'),
+                ('selected', 'fg:cyan bold'),
+            ])
+        return self._style
+    
+    @style.setter
+    def style(self, style) -> None:
+        """Set the questionary style."""
+        self._style = style
+    
+    def choice(self, title: str, value: Any = None, disabled: Optional[str] = None) -> Any:
+        """
+        Create a menu choice for custom_select.
+        
+        Args:
+            title: Text of the choice
+            value: Value returned when the choice is selected
+            disabled: Reason the choice can't be selected (optional)
+            
+        Returns:
+            questionary.Choice object
+        """
+        import questionary
+        return questionary.Choice(title=title, value=value, disabled=disabled)
+    
+    def separator(self) -> Any:
+        """
+        Create a menu separator for custom_select.
+        
+        Returns:
+            questionary.Separator object
+        """
+        import questionary
+        return questionary.Separator()
     
     def display_width(self, s):
         """
@@ -46,89 +95,97 @@ class UI:
         Returns:
             int: Display width of the string
         """
-        width = 0
-        # Remove ANSI color codes for width calculation
-        clean_s = s.replace(f"{Fore.GREEN}", "").replace(f"{Fore.YELLOW}", "").replace(f"{Fore.RED}", "").replace(f"{Style.RESET_ALL}", "")
-        for char in clean_s:
-            if '\u4e00' <= char <= '\u9fff' or '\u3000' <= char <= '\u303f' or '\uff00' <= char <= '\uffef':  # Chinese character ranges
-                width += 2
-            else:
-                width += 1
-        return width
+        return display_width(s)
     
     def clear_screen(self) -> None:
-        """Clear the terminal screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Clear the terminal screen (starts a new frame, drawn at the next prompt)."""
+        self.renderer.new_frame()
+    
+    def write(self, text: str = "") -> None:
+        """
+        Write text to the screen.
+        
+        Args:
+            text: Text to write
+        """
+        self.renderer.write(text)
+    
+    def pause(self) -> None:
+        """Wait for the player to press Enter."""
+        self.write()
+        self.renderer.flush()
+        self.renderer.reserve_rows(1)
+        input("按回车键继续...")
     
     def show_welcome(self) -> None:
         """Show the welcome message."""
         self.clear_screen()
         
         # MSDOS-style UI with box drawing characters
-        print("╔" + "═" * 78 + "╗")
-        print("║" + " " * 25 + "北京浮生记 (Beijing Life Story)" + " " * 25 + "║")
-        print("╠" + "═" * 78 + "╣")
-        print("║" + " " * 78 + "║")
-        print("║ 欢迎来到北京浮生记！这是一个关于在北京生活和交易的游戏。" + " " * 20 + "║")
-        print("║" + " " * 78 + "║")
-        print("║ 你有40天的时间在北京各地买卖商品，赚取尽可能多的钱。" + " " * 24 + "║")
-        print("║ 小心健康和名声，它们会影响你的游戏体验。" + " " * 36 + "║")
-        print("║" + " " * 78 + "║")
-        print("║ 祝你好运！" + " " * 68 + "║")
-        print("║" + " " * 78 + "║")
-        print("╚" + "═" * 78 + "╝")
-        input("\n按回车键继续...")
+        self.write("╔" + "═" * 78 + "╗")
+        self.write(box_center("北京浮生记 (Beijing Life Story)", 78))
+        self.write("╠" + "═" * 78 + "╣")
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 欢迎来到北京浮生记！这是一个关于在北京生活和交易的游戏。", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 你有40天的时间在北京各地买卖商品，赚取尽可能多的钱。", 78))
+        self.write(box_line(" 小心健康和名声，它们会影响你的游戏体验。", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 祝你好运！", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write("╚" + "═" * 78 + "╝")
+        self.pause()
     
     def show_story(self) -> None:
         """Show the game story."""
         self.clear_screen()
         
         # MSDOS-style UI with box drawing characters
-        print("╔" + "═" * 78 + "╗")
-        print("║" + " " * 34 + "游戏背景" + " " * 34 + "║")
-        print("╠" + "═" * 78 + "╣")
-        print("║" + " " * 78 + "║")
-        print("║ 你是一个刚到北京的年轻人，只有2000元现金和5000元债务。" + " " * 24 + "║")
-        print("║ 你决定通过买卖各种商品来赚钱，希望在40天内还清债务并赚取尽可能多的钱。" + " " * 8 + "║")
-        print("║ 你将在北京的各个地点之间旅行，寻找最佳的交易机会。" + " " * 28 + "║")
-        print("║ 但要小心，城市生活充满了危险和意外事件，可能会影响你的健康和财富。" + " " * 14 + "║")
-        print("║" + " " * 78 + "║")
-        print("║ 你能在这个城市中生存并成功吗？" + " " * 48 + "║")
-        print("║" + " " * 78 + "║")
-        print("╚" + "═" * 78 + "╝")
-        input("\n按回车键继续...")
+        self.write("╔" + "═" * 78 + "╗")
+        self.write(box_center("游戏背景", 78))
+        self.write("╠" + "═" * 78 + "╣")
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 你是一个刚到北京的年轻人，只有2000元现金和5000元债务。", 78))
+        self.write(box_line(" 你决定通过买卖各种商品来赚钱，希望在40天内还清债务并赚取尽可能多的钱。", 78))
+        self.write(box_line(" 你将在北京的各个地点之间旅行，寻找最佳的交易机会。", 78))
+        self.write(box_line(" 但要小心，城市生活充满了危险和意外事件，可能会影响你的健康和财富。", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 你能在这个城市中生存并成功吗？", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write("╚" + "═" * 78 + "╝")
+        self.pause()
     
     def show_help(self) -> None:
         """Show the help information."""
         self.clear_screen()
         
         # MSDOS-style UI with box drawing characters
-        print("╔" + "═" * 78 + "╗")
-        print("║" + " " * 34 + "游戏帮助" + " " * 34 + "║")
-        print("╠" + "═" * 78 + "╣")
-        print("║" + " " * 78 + "║")
-        print("║ 游戏目标:" + " " * 69 + "║")
-        print("║   在40天内赚取尽可能多的钱，同时保持健康和名声。" + " " * 34 + "║")
-        print("║" + " " * 78 + "║")
-        print("║ 游戏机制:" + " " * 69 + "║")
-        print("║   1. 每次移动到新位置消耗一天时间" + " " * 49 + "║")
-        print("║   2. 你可以在黑市上买卖商品" + " " * 55 + "║")
-        print("║   3. 商品价格会随机波动" + " " * 59 + "║")
-        print("║   4. 随机事件可能会影响你的健康、名声和财富" + " " * 41 + "║")
-        print("║   5. 你可以在银行存取钱和还债" + " " * 53 + "║")
-        print("║   6. 你可以在医院恢复健康" + " " * 55 + "║")
-        print("║   7. 你可以在房屋中介增加存储容量" + " " * 49 + "║")
-        print("║   8. 你可以在网吧获取信息和小额现金" + " " * 47 + "║")
-        print("║   9. 你可以在邮局还债" + " " * 59 + "║")
-        print("║" + " " * 78 + "║")
-        print("║ 游戏结束条件:" + " " * 65 + "║")
-        print("║   1. 40天结束" + " " * 65 + "║")
-        print("║   2. 健康值降到0" + " " * 63 + "║")
-        print("║" + " " * 78 + "║")
-        print("║ 祝你好运！" + " " * 68 + "║")
-        print("║" + " " * 78 + "║")
-        print("╚" + "═" * 78 + "╝")
-        input("\n按回车键继续...")
+        self.write("╔" + "═" * 78 + "╗")
+        self.write(box_center("游戏帮助", 78))
+        self.write("╠" + "═" * 78 + "╣")
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 游戏目标:", 78))
+        self.write(box_line("   在40天内赚取尽可能多的钱，同时保持健康和名声。", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 游戏机制:", 78))
+        self.write(box_line("   1. 每次移动到新位置消耗一天时间", 78))
+        self.write(box_line("   2. 你可以在黑市上买卖商品", 78))
+        self.write(box_line("   3. 商品价格会随机波动", 78))
+        self.write(box_line("   4. 随机事件可能会影响你的健康、名声和财富", 78))
+        self.write(box_line("   5. 你可以在银行存取钱和还债", 78))
+        self.write(box_line("   6. 你可以在医院恢复健康", 78))
+        self.write(box_line("   7. 你可以在房屋中介增加存储容量", 78))
+        self.write(box_line("   8. 你可以在网吧获取信息和小额现金", 78))
+        self.write(box_line("   9. 你可以在邮局还债", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 游戏结束条件:", 78))
+        self.write(box_line("   1. 40天结束", 78))
+        self.write(box_line("   2. 健康值降到0", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write(box_line(" 祝你好运！", 78))
+        self.write("║" + " " * 78 + "║")
+        self.write("╚" + "═" * 78 + "╝")
+        self.pause()
     
     def show_status(self, player, goods_manager, location_manager=None) -> None:
         """
@@ -148,55 +205,53 @@ class UI:
         
         
         # MSDOS-style UI with box drawing characters
-        print("╔" + "═" * 78 + "╗")
+        self.write("╔" + "═" * 78 + "╗")
         
         # Status line 1
         status1 = f"║ 玩家: {player.name}   剩余天数: {player.days_left}/40   城市: {'北京' if player.city == 'BEIJING' else '上海'}{current_location}"
         padding1 = 78 - self.display_width(status1)
-        print(status1 + " " * padding1 + "║")
+        self.write(status1 + " " * padding1 + "║")
         
         # Status line 2
         status2 = f"║ 现金: {player.cash}元   银行存款: {player.bank_savings}元   债务: {player.debt}元"
         padding2 = 78 - self.display_width(status2)
-        print(status2 + " " * padding2 + "║")
+        self.write(status2 + " " * padding2 + "║")
         
         # Status line 3
         status3 = f"║ 健康: {player.health}/100   名声: {player.fame}/100   库存: {player.inventory_used}/{player.inventory_capacity}"
         padding3 = 78 - self.display_width(status3)
-        print(status3 + " " * padding3 + "║")
+        self.write(status3 + " " * padding3 + "║")
         
-        if player.inventory:
-            print("║" + " " * 78 + "║")
-            print("║ 库存商品:" + " " * 68 + "║")
-            for goods_id, goods_info in player.inventory.items():
+        if player.inventory_used > 0:
+            self.write("║" + " " * 78 + "║")
+            self.write(box_line(" 库存商品:", 78))
+            for goods_id, quantity, buy_price in player.get_inventory():
+                name = goods_manager.goods_types[goods_id].name
+                
                 # Check if goods is available in market
-                market_price = 0
-                for market_goods_id, _, price in goods_manager.get_available_goods():
-                    if market_goods_id == goods_id:
-                        market_price = price
-                        break
+                market_price = goods_manager.get_market_price(goods_id) or 0
                 
                 # Color goods name based on availability
                 if market_price > 0:
-                    goods_name = f"{Fore.GREEN}{goods_info['name']}{Style.RESET_ALL}"
+                    goods_name = f"{Fore.GREEN}{name}{Style.RESET_ALL}"
                 else:
-                    goods_name = goods_info['name']
+                    goods_name = name
                 
                 # Color price based on profitability
-                if market_price > goods_info['price']:
-                    price_str = f"{Fore.YELLOW}购买价: {goods_info['price']}{Style.RESET_ALL}"
+                if market_price > buy_price:
+                    price_str = f"{Fore.YELLOW}购买价: {buy_price}{Style.RESET_ALL}"
                 elif market_price > 0:
-                    price_str = f"{Fore.RED}购买价: {goods_info['price']}{Style.RESET_ALL}"
+                    price_str = f"{Fore.RED}购买价: {buy_price}{Style.RESET_ALL}"
                 else:
-                    price_str = f"购买价: {goods_info['price']}"
+                    price_str = f"购买价: {buy_price}"
                 
                 # Calculate padding for right alignment
-                item_text = f"  {goods_name} - 数量: {goods_info['quantity']} - {price_str}"
+                item_text = f"  {goods_name} - 数量: {quantity} - {price_str}"
                 padding = 78 - self.display_width(item_text)
                 
-                print(f"║ {item_text}" + " " * padding + "║")
+                self.write(f"║ {item_text}" + " " * padding + "║")
         
-        print("╚" + "═" * 78 + "╝")
+        self.write("╚" + "═" * 78 + "╝")
     
     def show_available_goods(self, goods_manager) -> None:
         """
@@ -208,20 +263,20 @@ class UI:
         available_goods = goods_manager.get_available_goods()
         
         # MSDOS-style UI with box drawing characters
-        print("\n╔" + "═" * 78 + "╗")
-        print("║ 当前位置可用商品:" + " " * 61 + "║")
-        print("╠" + "═" * 78 + "╣")
+        self.write("\n╔" + "═" * 78 + "╗")
+        self.write(box_line(" 当前位置可用商品:", 78))
+        self.write("╠" + "═" * 78 + "╣")
         
         if not available_goods:
-            print("║ 当前位置没有可用商品。" + " " * 57 + "║")
+            self.write(box_line(" 当前位置没有可用商品。", 78))
         else:
             for i, (goods_id, name, price) in enumerate(available_goods, 1):
                 item_text = f" {i}. {name} - 价格: {price}"
                 padding = 78 - self.display_width(item_text)
-                print(f"║{item_text}" + " " * padding + "║")
+                self.write(f"║{item_text}" + " " * padding + "║")
         
-        print("╚" + "═" * 78 + "╝")
-        input("\n按回车键继续...")
+        self.write("╚" + "═" * 78 + "╝")
+        self.pause()
     
     def show_news_reports(self, news_reports: List[str]) -> None:
         """
@@ -234,40 +289,18 @@ class UI:
             return
         
         # MSDOS-style UI with box drawing characters
-        print("\n╔" + "═" * 78 + "╗")
-        print("║" + " " * 34 + "新闻报道" + " " * 34 + "║")
-        print("╠" + "═" * 78 + "╣")
-        
-        for report in news_reports:
-            # Split long reports into multiple lines
-            words = report.split()
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                if len(current_line) + len(word) + 1 <= 76:  # +1 for space
-                    if current_line:
-                        current_line += " " + word
-                    else:
-                        current_line = word
-                else:
-                    lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-            
-            # Print each line with proper padding
-            for line in lines:
-                padding = 78 - self.display_width(line) - 2  # -2 for the "║ " prefix
-                print(f"║ {line}" + " " * padding + "║")
-            
+        self.write("\n╔" + "═" * 78 + "╗")
+        self.write(box_center("新闻报道", 78))
+        self.write("╠" + "═" * 78 + "╣")
+        
+        for i, report in enumerate(news_reports):
             # Add a blank line between reports
-            if report != news_reports[-1]:
-                print("║" + " " * 78 + "║")
+            if i > 0:
+                self.write("║" + " " * 78 + "║")
+            self.write(box_lines(report, 78))
         
-        print("╚" + "═" * 78 + "╝")
-        input("\n按回车键继续...")
+        self.write("╚" + "═" * 78 + "╝")
+        self.pause()
     
     def custom_select(self, message, choices, style=None, is_main_menu=False, parent_menu_result=None):
         """
@@ -275,7 +308,7 @@ class UI:
         
         Args:
             message: The message to display
-            choices: List of questionary.Choice objects
+            choices: List of choices from choice() and separator()
             style: The questionary style to use
             is_main_menu: Whether this is the main menu
             parent_menu_result: The result to return when left arrow is pressed
@@ -317,7 +350,9 @@ class UI:
         if hasattr(select, '_question') and hasattr(select._question, 'application'):
             select._question.application.style = custom_style
         
-        # Run the select prompt
+        # Draw the screen, then run the select prompt below it
+        self.renderer.flush()
+        self.renderer.reserve_rows(len(choices) + 1)
         result = select.ask()
         
         return result
@@ -333,19 +368,19 @@ class UI:
             str: Player's choice
         """
         choices = [
-            questionary.Choice(title='移动到新位置', value='travel'),
-            questionary.Choice(title='购买商品', value='buy'),
-            questionary.Choice(title='出售商品', value='sell'),
-            questionary.Choice(title='访问银行', value='bank'),
-            questionary.Choice(title='访问医院', value='hospital'),
-            questionary.Choice(title='访问邮局', value='post_office'),
-            questionary.Choice(title='访问房屋中介', value='house_agency'),
-            questionary.Choice(title='访问网吧', value='internet_cafe'),
-            questionary.Choice(title='查看高分榜', value='high_scores'),
-            questionary.Choice(title='切换城市', value='switch_city'),
-            questionary.Choice(title='帮助', value='help'),
-            questionary.Separator(),
-            questionary.Choice(title='退出游戏', value='quit')
+            self.choice(title='移动到新位置', value='travel'),
+            self.choice(title='购买商品', value='buy'),
+            self.choice(title='出售商品', value='sell'),
+            self.choice(title='访问银行', value='bank'),
+            self.choice(title='访问医院', value='hospital'),
+            self.choice(title='访问邮局', value='post_office'),
+            self.choice(title='访问房屋中介', value='house_agency'),
+            self.choice(title='访问网吧', value='internet_cafe'),
+            self.choice(title='查看高分榜', value='high_scores'),
+            self.choice(title='切换城市', value='switch_city'),
+            self.choice(title='帮助', value='help'),
+            self.separator(),
+            self.choice(title='退出游戏', value='quit')
         ]
         
         result = self.custom_select(
@@ -379,22 +414,22 @@ class UI:
             if location_id == current_location_id:
                 # For questionary, we need to use plain text without color codes
                 title = f"{location.name} (当前位置)"
-                choices.append(questionary.Choice(title=title, value=None, disabled="已在此位置"))
+                choices.append(self.choice(title=title, value=None, disabled="已在此位置"))
                 # Print the colored version directly to console for reference
-                print(f"{Fore.RED}{location.name} (当前位置){Style.RESET_ALL} - 已在此位置")
+                self.write(f"{Fore.RED}{location.name} (当前位置){Style.RESET_ALL} - 已在此位置")
             else:
-                choices.append(questionary.Choice(title=f"{location.name}", value=location))
+                choices.append(self.choice(title=f"{location.name}", value=location))
         
         # Add return option
-        choices.append(questionary.Separator())
-        choices.append(questionary.Choice(title='0. 返回', value=None))
+        choices.append(self.separator())
+        choices.append(self.choice(title='0. 返回', value=None))
         
         # MSDOS-style UI for the menu header
-        print("╔" + "═" * 78 + "╗")
+        self.write("╔" + "═" * 78 + "╗")
         location_text = f"║ {'北京' if city == 'BEIJING' else '上海'}的位置:"
         padding = 78 - self.display_width(location_text)
-        print(location_text + " " * padding + "║")
-        print("╚" + "═" * 78 + "╝")
+        self.write(location_text + " " * padding + "║")
+        self.write("╚" + "═" * 78 + "╝")
         
         # Store the parent menu result (None for returning to main menu)
         self.parent_menu_result = None
@@ -415,33 +450,11 @@ class UI:
             message: Message to show
         """
         # MSDOS-style UI with box drawing characters
-        print("\n╔" + "═" * 78 + "╗")
-        
-        # Split long messages into multiple lines
-        words = message.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 <= 76:  # +1 for space
-                if current_line:
-                    current_line += " " + word
-                else:
-                    current_line = word
-            else:
-                lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
+        self.write("\n╔" + "═" * 78 + "╗")
         
-        # Print each line with proper padding
-        for line in lines:
-            padding = 78 - self.display_width(line) - 2  # -2 for the "║ " prefix
-            print(f"║ {line}" + " " * padding + "║")
-        
-        print("╚" + "═" * 78 + "╝")
-        input("\n按回车键继续...")
+        self.write(box_lines(message, 78))
+        self.write("╚" + "═" * 78 + "╝")
+        self.pause()
     
     def get_input(self, prompt: str, input_type: Callable = str, default: Any = None, 
                  min_value: Optional[Union[int, float]] = None, 
@@ -459,6 +472,8 @@ class UI:
         Returns:
             Validated input value
         """
+        import questionary
+        
         # For numeric input with min/max values
         if input_type in (int, float):
             # Create validation message
@@ -485,10 +500,12 @@ class UI:
                         return f"输入必须小于或等于 {max_value}"
                     
                     return True
-                
+                    
                 except ValueError:
                     return f"请输入一个有效的{input_type.__name__}"
             
+            self.renderer.flush()
+            self.renderer.reserve_rows(2)
             result = questionary.text(
                 f"{prompt}{validate_message}",
                 default=str(default) if default is not None else "",
@@ -505,6 +522,8 @@ class UI:
             return default
         
         # For string or other input types
+        self.renderer.flush()
+        self.renderer.reserve_rows(2)
         result = questionary.text(
             prompt,
             default=default if default is not None else "",
@@ -530,6 +549,10 @@ class UI:
         Returns:
             bool: True if yes, False if no
         """
+        import questionary
+        
+        self.renderer.flush()
+        self.renderer.reserve_rows(1)
         result = questionary.confirm(
             prompt,
             default=False,
@@ -537,3 +560,52 @@ class UI:
         ).ask()
         
         return result if result is not None else False
+
+
+@lru_cache(maxsize=512)
+def box_line(text: str, width: int) -> str:
+    """
+    Render one line of text inside a box, padded to the right border by display width.
+    
+    Args:
+        text: Text of the line, with its own leading spaces
+        width: Inner width of the box, between the borders
+        
+    Returns:
+        str: Box line
+    """
+    return "║" + text + " " * (width - display_width(text)) + "║"
+
+
+def box_center(text: str, width: int) -> str:
+    """
+    Render a title centered inside a box by display width.
+    
+    Args:
+        text: Title text
+        width: Inner width of the box, between the borders
+        
+    Returns:
+        str: Box line
+    """
+    padding = width - display_width(text)
+    return "║" + " " * (padding // 2) + text + " " * (padding - padding // 2) + "║"
+
+
+def box_lines(text: str, width: int) -> str:
+    """
+    Render text as the inside of a box: wrapped by display width and padded to the borders.
+    Rendered boxes are cached, so repeated messages are laid out once.
+    
+    Args:
+        text: Text to render
+        width: Inner width of the box, between the borders
+        
+    Returns:
+        str: Box lines joined by newlines
+    """
+    lines = []
+    for line in wrap(text, width - 2):
+        padding = width - 1 - display_width(line)  # -1 for the space after "║"
+        lines.append(f"║ {line}" + " " * padding + "║")
+    return "\n".join(lines)
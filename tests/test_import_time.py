@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import time tests for Beijing Life Story game.
+Checks that the engine modules load fast and without the interactive UI stack.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Root of the repository, where the game package is
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds the engine modules may take to import in a fresh interpreter
+IMPORT_BUDGET = 0.5
+
+# Modules of the interactive UI stack, loaded on the first prompt only
+UI_MODULES = ("questionary", "prompt_toolkit", "colorama")
+
+# Measures the import in a fresh interpreter and reports the UI modules loaded
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import game.engine, game.player, game.goods, game.events, game.bank, game.locations
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+def _probe() -> dict:
+    """
+    Import the engine modules in a fresh interpreter.
+    
+    Returns:
+        Dict with the import time in seconds and the UI modules loaded
+    """
+    output = subprocess.run([sys.executable, "-c", _PROBE % (UI_MODULES,)], cwd=ROOT,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+class ImportTimeTest(unittest.TestCase):
+    """
+    Tests of the import of the engine modules.
+    """
+    
+    def test_engine_imports_without_ui(self):
+        self.assertEqual(_probe()["loaded"], [])
+    
+    def test_engine_imports_within_budget(self):
+        # Take the best of a few runs, so a busy machine doesn't fail the test
+        elapsed = min(_probe()["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
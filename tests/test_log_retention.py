@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log retention tests for Beijing Life Story game.
+Checks that the cap on finished log files holds with and without compression.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.logger import LogRotation, finish_log
+
+
+def _write_logs(log_dir: str, names) -> list:
+    """
+    Write small log files, each one second newer than the previous one.
+    
+    Args:
+        log_dir: Log directory
+        names: File names, oldest first
+        
+    Returns:
+        List of the file paths
+    """
+    paths = []
+    for i, name in enumerate(names):
+        path = os.path.join(log_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("2025-02-28 16:13:16,000 - INFO - GAME_START: {}\n")
+        os.utime(path, (1000 + i, 1000 + i))
+        paths.append(path)
+    return paths
+
+
+class LogRetentionTest(unittest.TestCase):
+    """
+    Tests of the retention cap of finished log files.
+    """
+    
+    def test_uncompressed_logs_are_capped(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            paths = _write_logs(log_dir, [f"2025022{i}_p.log" for i in range(5)] + ["notes.txt"])
+            finish_log(paths[4], LogRotation(compress=False, max_files=2))
+            self.assertEqual(sorted(os.listdir(log_dir)), ["20250223_p.log", "20250224_p.log", "notes.txt"])
+    
+    def test_compressed_and_uncompressed_logs_count_together(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            paths = _write_logs(log_dir, ["20250220_p.jsonl.gz", "20250221_p.bin", "20250222_p.log"])
+            finish_log(paths[2], LogRotation(compress=True, max_files=2))
+            self.assertEqual(sorted(os.listdir(log_dir)), ["20250221_p.bin", "20250222_p.log.gz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
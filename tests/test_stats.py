@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log stats tests for Beijing Life Story game.
+Checks how random events are grouped by kind.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.stats import LogStats
+
+
+def _event_kinds(*descriptions) -> dict:
+    """
+    Add random events to empty stats.
+    
+    Args:
+        *descriptions: Event descriptions
+        
+    Returns:
+        Dict of the number of events per kind
+    """
+    stats = LogStats()
+    for description in descriptions:
+        stats.add_record({"type": "RANDOM_EVENT", "event_description": description})
+    return dict(stats.events)
+
+
+class EventKindTest(unittest.TestCase):
+    """
+    Tests of the masking of amounts in event descriptions.
+    """
+    
+    def test_amounts_are_masked(self):
+        kinds = _event_kinds("你被罚款40元!唉...", "你被罚款300元!唉...\n你的现金减少了300元。",
+                             "在黑客入侵银行网络，试图修改数据库，我的存款增加了1234")
+        self.assertEqual(kinds, {"你被罚款#元!唉...": 2, "在黑客入侵银行网络，试图修改数据库，我的存款增加了#": 1})
+    
+    def test_names_keep_their_digits(self):
+        kinds = _event_kinds("有人在163.com上卖3G手机，只要99元")
+        self.assertEqual(kinds, {"有人在163.com上卖3G手机，只要#元": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()